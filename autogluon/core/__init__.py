@@ -1,4 +1,5 @@
 from .space import *
+from .compiled_space import *
 from .task import *
 from .decorator import *
 
@@ -0,0 +1,183 @@
+import numpy as np
+import ConfigSpace as CS
+import ConfigSpace.hyperparameters as CSH
+
+from .space import NestedSpace, SimpleSpace
+
+__all__ = ['CompiledSpace']
+
+
+class CompiledSpace(object):
+    """Search space compiled once into a flat representation, from which many configurations are sampled at a time.
+
+    Samples are stored in a float array of shape (num_samples, num_hyperparameters), with one column per
+    hyperparameter of the ConfigSpace representation of the search space: numeric hyperparameters hold their value,
+    categorical and ordinal hyperparameters the index of their value, and inactive hyperparameters (of conditional
+    spaces) hold NaN. Samples are only converted to configuration dicts when needed.
+
+    Parameters
+    ----------
+    space : :class:`autogluon.space.Space` or ConfigSpace.ConfigurationSpace
+        The search space to sample from. Nested spaces are compiled from their `cs` representation.
+
+    Examples
+    --------
+    >>> space = ag.space.Dict(
+    >>>     lr=ag.space.Real(1e-4, 1e-1, log=True),
+    >>>     model=ag.space.Categorical('resnet18', 'resnet50'))
+    >>> compiled = CompiledSpace(space)
+    >>> samples = compiled.sample(1000, random_state=np.random.RandomState(0))
+    >>> compiled.to_config(samples[0])
+    {'lr': 0.0015, 'model▁choice': 1}
+    >>> space.sample(**compiled.to_config(samples[0]))
+    {'lr': 0.0015, 'model': 'resnet50'}
+    """
+    def __init__(self, space):
+        if isinstance(space, NestedSpace):
+            configspace = space.cs
+        elif isinstance(space, SimpleSpace):
+            configspace = CS.ConfigurationSpace()
+            configspace.add_hyperparameter(space.hp)
+        else:
+            assert isinstance(space, CS.ConfigurationSpace), \
+                f'Cannot compile search space of type {type(space)}'
+            configspace = space
+        if configspace.get_forbiddens():
+            raise NotImplementedError('Search spaces with forbidden clauses are not supported')
+        self.configspace = configspace
+        # Hyperparameters are in topological order, so that parents of conditions are sampled first
+        self._hps = configspace.get_hyperparameters()
+        self._names = [hp.name for hp in self._hps]
+        self._index = {name: i for i, name in enumerate(self._names)}
+        self._conditions = []
+        for i, hp in enumerate(self._hps):
+            for condition in configspace.get_parent_conditions_of(hp.name):
+                self._conditions.append((i, condition))
+
+    @property
+    def names(self):
+        """Names of the hyperparameters, in the order of the columns of the samples.
+        """
+        return self._names
+
+    def __len__(self):
+        return len(self._hps)
+
+    def sample(self, num_samples, random_state=None):
+        """Samples configurations uniformly at random (or on a log scale, or with the weights of categorical
+        hyperparameters), as `configspace.sample_configuration()`.
+
+        Parameters
+        ----------
+        num_samples : int
+            Number of configurations to sample.
+        random_state : np.random.RandomState, default None
+            Random state to sample with, the global random state of NumPy if None.
+
+        Returns
+        -------
+        np.ndarray of shape (num_samples, num_hyperparameters), with NaN for inactive hyperparameters.
+        """
+        if random_state is None:
+            random_state = np.random
+        samples = np.empty((num_samples, len(self._hps)), dtype=np.float64)
+        for i, hp in enumerate(self._hps):
+            samples[:, i] = _sample_hp(hp, num_samples, random_state)
+        for i, condition in self._conditions:
+            samples[~self._evaluate_condition(condition, samples), i] = np.nan
+        return samples
+
+    def _evaluate_condition(self, condition, samples):
+        # Returns the boolean mask of the samples satisfying condition, which are never satisfied by inactive parents
+        if isinstance(condition, (CS.AndConjunction, CS.OrConjunction)):
+            masks = [self._evaluate_condition(component, samples) for component in condition.components]
+            reduce_fn = np.logical_and if isinstance(condition, CS.AndConjunction) else np.logical_or
+            return reduce_fn.reduce(masks)
+        parent = condition.parent
+        column = samples[:, self._index[parent.name]]
+        active = ~np.isnan(column)
+        if isinstance(condition, CS.EqualsCondition):
+            return active & (column == _encode_value(parent, condition.value))
+        if isinstance(condition, CS.NotEqualsCondition):
+            return active & (column != _encode_value(parent, condition.value))
+        if isinstance(condition, CS.InCondition):
+            return active & np.isin(column, [_encode_value(parent, value) for value in condition.values])
+        if isinstance(condition, CS.GreaterThanCondition):
+            return active & (column > _encode_value(parent, condition.value))
+        if isinstance(condition, CS.LessThanCondition):
+            return active & (column < _encode_value(parent, condition.value))
+        raise NotImplementedError(f'Unsupported condition: {condition}')
+
+    def to_config(self, sample):
+        """Converts one row of the samples to a configuration dict, as `sample_configuration().get_dictionary()`.
+        Inactive hyperparameters are left out.
+        """
+        config = {}
+        for hp, value in zip(self._hps, sample):
+            if not np.isnan(value):
+                config[hp.name] = _decode_value(hp, value)
+        return config
+
+    def to_configs(self, samples):
+        """Lazily converts the rows of the samples to configuration dicts.
+        """
+        for sample in samples:
+            yield self.to_config(sample)
+
+
+def _sample_hp(hp, num_samples, random_state):
+    if isinstance(hp, CSH.Constant):
+        return np.zeros(num_samples)
+    if isinstance(hp, (CSH.CategoricalHyperparameter, CSH.OrdinalHyperparameter)):
+        num_values = len(hp.choices) if isinstance(hp, CSH.CategoricalHyperparameter) else len(hp.sequence)
+        probabilities = getattr(hp, 'probabilities', None)
+        if probabilities is not None:
+            return random_state.choice(num_values, size=num_samples, p=probabilities)
+        return random_state.randint(num_values, size=num_samples)
+    if isinstance(hp, CSH.UniformIntegerHyperparameter):
+        # Values are rounded from a continuous range extended by half a step on both sides, as in ConfigSpace
+        lower, upper = hp.lower - 0.49999, hp.upper + 0.49999
+        if hp.log:
+            lower = max(lower, 0.5)
+        values = np.round(_sample_uniform(lower, upper, hp.log, num_samples, random_state))
+        return np.clip(_quantize(values, hp), hp.lower, hp.upper)
+    if isinstance(hp, CSH.UniformFloatHyperparameter):
+        values = _sample_uniform(hp.lower, hp.upper, hp.log, num_samples, random_state)
+        return np.clip(_quantize(values, hp), hp.lower, hp.upper)
+    raise NotImplementedError(f'Unsupported hyperparameter: {hp}')
+
+
+def _sample_uniform(lower, upper, log, num_samples, random_state):
+    if log:
+        return np.exp(random_state.uniform(np.log(lower), np.log(upper), size=num_samples))
+    return random_state.uniform(lower, upper, size=num_samples)
+
+
+def _quantize(values, hp):
+    q = getattr(hp, 'q', None)
+    if q is None:
+        return values
+    return np.round(values / q) * q
+
+
+def _encode_value(hp, value):
+    # Value of hp as stored in the samples
+    if isinstance(hp, CSH.CategoricalHyperparameter):
+        return list(hp.choices).index(value)
+    if isinstance(hp, CSH.OrdinalHyperparameter):
+        return list(hp.sequence).index(value)
+    if isinstance(hp, CSH.Constant):
+        return 0
+    return value
+
+
+def _decode_value(hp, value):
+    if isinstance(hp, CSH.CategoricalHyperparameter):
+        return hp.choices[int(value)]
+    if isinstance(hp, CSH.OrdinalHyperparameter):
+        return hp.sequence[int(value)]
+    if isinstance(hp, CSH.Constant):
+        return hp.value
+    if isinstance(hp, CSH.UniformIntegerHyperparameter):
+        return int(value)
+    return float(value)
@@ -14,6 +14,7 @@ from ..utils import (save, load, mkdir, try_import_mxboard, tqdm)
 from ..core import Task
 from ..core.decorator import _autogluon_method
 from ..searcher import RLSearcher
+from ..searcher.config_keys import config_to_key
 from .fifo import FIFOScheduler
 from .reporter import DistStatusReporter
 from ..utils.default_arguments import check_and_merge_defaults, \
@@ -294,7 +295,7 @@ class RLScheduler(FIFOScheduler):
             if last_result is not None:
                 self.searcher.update(config, **last_result)
                 with self.lock:
-                    results[pickle.dumps(config)] = \
+                    results[config_to_key(config)] = \
                         last_result[self._reward_attr]
 
         # launch the tasks
@@ -328,7 +329,7 @@ class RLScheduler(FIFOScheduler):
             self.save()
 
         for config in configs:
-            rewards.append(results[pickle.dumps(config)])
+            rewards.append(results[config_to_key(config)])
 
         return rewards
 
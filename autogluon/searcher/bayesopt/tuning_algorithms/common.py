@@ -1,7 +1,9 @@
 from typing import Iterator, Set, List
 import numpy as np
 import logging
+import ConfigSpace as CS
 
+from autogluon.searcher.config_keys import config_to_key
 from autogluon.searcher.bayesopt.datatypes.common import Candidate
 from autogluon.searcher.bayesopt.datatypes.tuning_job_state import \
     TuningJobState
@@ -56,20 +58,27 @@ def compute_blacklisted_candidates(state: TuningJobState) -> Set[Candidate]:
 MAX_RETRIES_ON_DUPLICATES = 10000
 
 
-# ATTENTION: If this is used with Candidate = CS.Configuration, the overhead
-# for filtering out duplicates and blacklisted configs becomes large
+def _candidate_key(candidate: Candidate):
+    # Hashing CS.Configuration is expensive (it hashes the string
+    # representation), so configs are compared by their keys
+    if isinstance(candidate, CS.Configuration):
+        return config_to_key(candidate)
+    return candidate
+
+
 def generate_unique_candidates(
         candidates_generator: CandidateGenerator, num_candidates: int,
         blacklisted_candidates: Set[Candidate]) -> List[Candidate]:
-    blacklisted = set(blacklisted_candidates)  # copy
+    blacklisted = set(_candidate_key(cand) for cand in blacklisted_candidates)
     result = []
     num_results = 0
     retries = 0
     for i, cand in enumerate(candidates_generator.generate_candidates()):
-        if cand not in blacklisted:
+        cand_key = _candidate_key(cand)
+        if cand_key not in blacklisted:
             result.append(cand)
             num_results += 1
-            blacklisted.add(cand)
+            blacklisted.add(cand_key)
             retries = 0
         else:
             # found a duplicate; retry
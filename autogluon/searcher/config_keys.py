@@ -0,0 +1,95 @@
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+import ConfigSpace as CS
+import ConfigSpace.hyperparameters as CSH
+
+__all__ = ['config_to_key',
+           'key_to_config',
+           'keys_from_legacy_results',
+           'num_configurations']
+
+
+def _canonical_value(value):
+    # NumPy scalars (e.g., returned by skopt) compare and hash like the
+    # corresponding Python values, but are converted so that keys do not
+    # depend on where a config came from
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def config_to_key(config):
+    """Maps a configuration to a hashable key identifying it.
+
+    The key is a tuple of (name, value) pairs sorted by name, so it does not
+    depend on the order of entries in the config dict, and values are Python
+    scalars. Keys are much cheaper to compute, hash and compare than pickled
+    configs, which are sensitive to both.
+
+    :param config: Configuration, either dict or CS.Configuration
+    :return: Hashable key, see key_to_config for the inverse
+    """
+    if isinstance(config, CS.Configuration):
+        config = config.get_dictionary()
+    return tuple(sorted(
+        (name, _canonical_value(value)) for name, value in config.items()))
+
+
+def key_to_config(config_key):
+    """Inverse of config_to_key
+
+    :param config_key: Key returned by config_to_key
+    :return: Configuration as dict
+    """
+    return dict(config_key)
+
+
+def keys_from_legacy_results(results):
+    """Converts results of searchers saved by older versions, which are keyed
+    by pickled configs, to be keyed by config_to_key. Entries which are
+    already keyed by config keys are kept as they are.
+
+    :param results: Dictionary of config key (or pickled config) -> reward
+    :return: OrderedDict of config key -> reward, in the same order
+    """
+    return OrderedDict(
+        (config_to_key(pickle.loads(k)) if isinstance(k, bytes) else k, v)
+        for k, v in results.items())
+
+
+def _num_values(hp):
+    if isinstance(hp, CSH.CategoricalHyperparameter):
+        return len(hp.choices)
+    if isinstance(hp, CSH.OrdinalHyperparameter):
+        return len(hp.sequence)
+    if isinstance(hp, CSH.Constant):
+        return 1
+    if isinstance(hp, CSH.UniformIntegerHyperparameter) \
+            and getattr(hp, 'q', None) is None:
+        return int(hp.upper) - int(hp.lower) + 1
+    return None
+
+
+def num_configurations(configspace):
+    """Upper bound on the number of distinct configurations of a finite
+    configuration space, or None if the space is infinite (or contains
+    hyperparameter types whose values are not counted here).
+
+    For spaces with conditional hyperparameters, the bound is not tight, since
+    inactive hyperparameters do not multiply the number of configurations.
+    Once this many distinct configs have been seen, the space is exhausted.
+
+    :param configspace: CS.ConfigurationSpace
+    :return: Number of configurations, or None
+    """
+    if configspace is None:
+        return None
+    num_configs = 1
+    for hp in configspace.get_hyperparameters():
+        num_values = _num_values(hp)
+        if num_values is None:
+            return None
+        num_configs *= num_values
+    return num_configs
@@ -7,6 +7,7 @@ from multiprocessing.pool import ThreadPool
 
 from ..core.space import *
 from .searcher import BaseSearcher
+from .config_keys import keys_from_legacy_results
 from ..utils import keydefaultdict, update_params
 from collections import OrderedDict
 
@@ -76,7 +77,7 @@ class RLSearcher(BaseSearcher):
         return destination
 
     def load_state_dict(self, state_dict):
-        self._results=pickle.loads(state_dict['results'])
+        self._results = keys_from_legacy_results(pickle.loads(state_dict['results']))
         update_params(self.controller, pickle.loads(state_dict['controller_params']))
 
 
@@ -1,9 +1,9 @@
 import logging
 import multiprocessing as mp
-import pickle
 from collections import OrderedDict
 import numpy as np
 
+from .config_keys import config_to_key, key_to_config, keys_from_legacy_results, num_configurations
 from ..utils import DeprecationHelper
 from autogluon.searcher.bayesopt.autogluon.debug_log import DebugLogPrinter
 
@@ -24,6 +24,7 @@ class BaseSearcher(object):
         specification of the Hyperparameters with their priors
     """
     LOCK = mp.Lock()
+    MAX_RETRIES = 100
 
     def __init__(self, configspace, reward_attribute=None):
         """
@@ -33,7 +34,10 @@ class BaseSearcher(object):
 
         """
         self.configspace = configspace
+        # Maps config keys (see config_to_key) of all configs seen so far
+        # (pending or reported) to their best reward
         self._results = OrderedDict()
+        self._num_configurations = num_configurations(configspace)
         if reward_attribute is None:
             reward_attribute = 'accuracy'
         self._reward_attribute = reward_attribute
@@ -105,9 +109,37 @@ class BaseSearcher(object):
             # This is the correct behaviour for multi-fidelity schedulers,
             # where update is called multiple times for a config, with
             # different resource levels.
-            config_pkl = pickle.dumps(config)
-            old_reward = self._results.get(config_pkl, reward)
-            self._results[config_pkl] = max(reward, old_reward)
+            config_key = config_to_key(config)
+            old_reward = self._results.get(config_key, reward)
+            self._results[config_key] = max(reward, old_reward)
+
+    def _is_new_config(self, config):
+        """
+        :return: True if config has not been seen so far (pending or
+            reported)
+        """
+        return config_to_key(config) not in self._results
+
+    def _register_new_config(self, config):
+        """
+        Registers config as pending in _results, unless it has been seen
+        already.
+
+        :return: True if config is new and has been registered
+        """
+        config_key = config_to_key(config)
+        if config_key in self._results:
+            return False
+        self._results[config_key] = self._reward_while_pending()
+        return True
+
+    def _search_space_exhausted(self):
+        """
+        :return: True if all configurations of a finite configuration space
+            have been seen already
+        """
+        return (self._num_configurations is not None) and \
+            len(self._results) >= self._num_configurations
 
     def register_pending(self, config, milestone=None):
         """
@@ -172,7 +204,7 @@ class BaseSearcher(object):
     def get_reward(self, config):
         """Calculates the reward (i.e. validation performance) produced by training with the given configuration.
         """
-        k = pickle.dumps(config)
+        k = config_to_key(config)
         with self.LOCK:
             assert k in self._results
             return self._results[k]
@@ -182,8 +214,8 @@ class BaseSearcher(object):
         """
         with self.LOCK:
             if self._results:
-                config_pkl = max(self._results, key=self._results.get)
-                return pickle.loads(config_pkl)
+                config_key = max(self._results, key=self._results.get)
+                return key_to_config(config_key)
             else:
                 return {}
 
@@ -193,8 +225,8 @@ class BaseSearcher(object):
         with self.LOCK:
             if not self._results:
                 return {}, self._reward_while_pending()
-            config_pkl = max(self._results, key=self._results.get)
-            return pickle.loads(config_pkl), self._results[config_pkl]
+            config_key = max(self._results, key=self._results.get)
+            return key_to_config(config_key), self._results[config_key]
 
     def get_state(self):
         """
@@ -225,6 +257,8 @@ class BaseSearcher(object):
         :param state: See above
         :return: New searcher object
         """
+        if isinstance(state, BaseSearcher):
+            state._results = keys_from_legacy_results(state._results)
         return state
 
     @property
@@ -284,8 +318,6 @@ class RandomSearcher(BaseSearcher):
     >>> searcher = RandomSearcher(cs)
     >>> searcher.get_config()
     """
-    MAX_RETRIES = 100
-
     def __init__(self, configspace, **kwargs):
         super().__init__(
             configspace, reward_attribute=kwargs.get('reward_attribute'))
@@ -341,13 +373,14 @@ class RandomSearcher(BaseSearcher):
         else:
             new_config = self.configspace.sample_configuration().get_dictionary()
         with self.LOCK:
+            assert not self._search_space_exhausted(), \
+                f"All {self._num_configurations} configs of the search space have been tried already"
             num_tries = 1
-            while pickle.dumps(new_config) in self._results:
+            while not self._register_new_config(new_config):
                 assert num_tries <= self.MAX_RETRIES, \
                         f"Cannot find new config in BaseSearcher, even after {self.MAX_RETRIES} trials"
                 new_config = self.configspace.sample_configuration().get_dictionary()
                 num_tries += 1
-            self._results[pickle.dumps(new_config)] = self._reward_while_pending()
         if self._debug_log is not None:
             self._debug_log.set_final_config(new_config)
             # All get_config debug log info is only written here
@@ -380,7 +413,7 @@ class RandomSearcher(BaseSearcher):
             first_is_default=self._first_is_default,
             debug_log=self._debug_log)
         new_searcher.random_state = state['random_state']
-        new_searcher._results = state['results']
+        new_searcher._results = keys_from_legacy_results(state['results'])
         if self._debug_log and 'debug_log' in state:
             new_searcher._debug_log.set_mutable_state(state['debug_log'])
         return new_searcher
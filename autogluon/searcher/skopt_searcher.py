@@ -1,9 +1,10 @@
-import pickle
 import logging
+import numpy as np
 
 from ..utils import warning_filter
 with warning_filter():
     from skopt import Optimizer
+    from skopt.acquisition import _gaussian_acquisition
     from skopt.space import Integer, Real, Categorical
 
 from .searcher import BaseSearcher
@@ -24,6 +25,8 @@ class SKoptSearcher(BaseSearcher):
         specification of the Hyperparameters with their priors
     kwargs: Optional arguments passed to skopt.optimizer.Optimizer class. 
         Please see documentation at this link: `skopt.optimizer.Optimizer <http://scikit-optimize.github.io/optimizer/index.html#skopt.optimizer.Optimizer>`_
+        The searcher itself also accepts `num_proposals` (default 16), the number of configs proposed at once from
+        a single fit of the surrogate model, which are handed out by subsequent calls to `get_config()`.
         These kwargs be used to specify which surrogate model Bayesian optimization should rely on,
         which acquisition function to use, how to optimize the acquisition function, etc.
         The skopt library provides comprehensive Bayesian optimization functionality,
@@ -75,9 +78,10 @@ class SKoptSearcher(BaseSearcher):
         does not contain this functionality as it is not integrated with ConfigSpace. 
         If invalid config is produced, `SKoptSearcher.get_config()` will catch these Exceptions and revert to `random_config()` instead.
         
-        - get_config(max_tries) uses skopt's batch BayesOpt functionality to query at most 
-        max_tries number of configs to try out.
-        If all of these have configs have already been scheduled to try (might happen in asynchronous setting), 
+        - get_config(max_tries) proposes configs in batches of `num_proposals`: skopt's next point, followed by
+        the best candidates under the acquisition function of the current surrogate model, which is not refit.
+        Batches are dropped whenever a new result updates the surrogate model.
+        If max_tries proposed configs have all been scheduled to try already (might happen in asynchronous setting),
         then get_config simply reverts to random search via random_config().
     """
     errors_tohandle = (ValueError, TypeError, RuntimeError)
@@ -111,6 +115,8 @@ class SKoptSearcher(BaseSearcher):
         skopt_kwargs = self._filter_skopt_kwargs(kwargs, skopt_keys)
         self.bayes_optimizer = Optimizer(
             dimensions=skopt_hpspace, **skopt_kwargs)
+        self._num_proposals = kwargs.get('num_proposals', 16)
+        self._proposals = []  # skopt points proposed by the current surrogate model, not handed out yet
 
     @staticmethod
     def _filter_skopt_kwargs(kwargs, keys):
@@ -126,48 +132,58 @@ class SKoptSearcher(BaseSearcher):
     def get_config(self, **kwargs):
         """Function to sample a new configuration
         This function is called to query a new configuration that has not yet been tried.
-        Asks for one point at a time from skopt, up to max_tries. 
+        Hands out the points proposed by skopt in batches (see `_propose_points()`), trying up to max_tries of them.
         If an invalid hyperparameter configuration is proposed by skopt, then reverts to random search
         (since skopt configurations cannot handle conditional spaces like ConfigSpace can).
-        TODO: may loop indefinitely due to no termination condition (like RandomSearcher.get_config() ) 
         
         Parameters
         ----------
         max_tries: int, default = 1e2
             The maximum number of tries to ask for a unique config from skopt before reverting to random search.
         """
-        max_tries = kwargs.get('max_tries', 1e2)
+        max_tries = int(kwargs.get('max_tries', 1e2))
         if len(self._results) == 0: # no hyperparams have been tried yet, first try default config
             return self.default_config()
-        try:
-            new_points = self.bayes_optimizer.ask(n_points=1) # initially ask for one new config
-            new_config_cs = self.skopt2config(new_points[0]) # hyperparameter-config to evaluate
+        num_tries = 0
+        while num_tries < max_tries:
+            if not self._proposals:
+                try:
+                    self._proposals = self._propose_points(min(self._num_proposals, max_tries - num_tries))
+                except self.errors_tohandle:
+                    break
+            point = self._proposals.pop(0)
+            num_tries += 1
             try:
+                new_config_cs = self.skopt2config(point) # hyperparameter-config to evaluate
                 new_config_cs.is_valid_configuration()
                 new_config = new_config_cs.get_dictionary()
-                if pickle.dumps(new_config) not in self._results.keys(): # have not encountered this config
-                    self._results[pickle.dumps(new_config)] = self._reward_while_pending()
-                    return new_config
             except self.errors_tohandle:
-                pass
-            new_points = self.bayes_optimizer.ask(n_points=max_tries) # ask skopt for many configs since first one was not new
-            i = 1 # which new point to return as new_config, we already tried the first point above
-            while i < max_tries:
-                new_config_cs = self.skopt2config(new_points[i]) # hyperparameter-config to evaluate
-                try:
-                    new_config_cs.is_valid_configuration()
-                    new_config = new_config_cs.get_dictionary()
-                    if (pickle.dumps(new_config) not in self._results.keys()): # have not encountered this config
-                        self._results[pickle.dumps(new_config)] = self._reward_while_pending()
-                        return new_config
-                except self.errors_tohandle:
-                    pass
-                i += 1
-        except self.errors_tohandle:
-            pass
+                continue
+            if self._register_new_config(new_config): # have not encountered this config
+                return new_config
         logger.info("used random search instead of skopt to produce new hyperparameter configuration in this trial")
         return self.random_config()
-    
+
+    def _propose_points(self, n_points):
+        """Proposes n_points skopt points from the current surrogate model without refitting it:
+        the next point of skopt, followed by the sampled candidates with the best acquisition values.
+        Before the surrogate model is fit (during the initial random points), the points are sampled at random.
+        """
+        optimizer = self.bayes_optimizer
+        points = [optimizer.ask()]
+        if n_points <= 1:
+            return points
+        if not optimizer.models or optimizer._n_initial_points > 0:
+            return points + optimizer.space.rvs(n_samples=n_points - 1, random_state=optimizer.rng)
+        candidates = optimizer.space.rvs(n_samples=max(optimizer.n_points, n_points), random_state=optimizer.rng)
+        acq_func = optimizer.acq_func
+        if acq_func == 'gp_hedge': # use the acquisition function with the largest gain so far
+            acq_func = ['LCB', 'EI', 'PI'][int(np.argmax(optimizer.gains_))]
+        values = _gaussian_acquisition(
+            X=optimizer.space.transform(candidates), model=optimizer.models[-1], y_opt=np.min(optimizer.yi),
+            acq_func=acq_func, acq_func_kwargs=optimizer.acq_func_kwargs)
+        return points + [candidates[i] for i in np.argsort(values)[:n_points - 1]]
+
     def default_config(self):
         """ Function to return the default configuration that should be tried first.
         
@@ -177,17 +193,21 @@ class SKoptSearcher(BaseSearcher):
         """
         new_config_cs = self.configspace.get_default_configuration()
         new_config = new_config_cs.get_dictionary()
-        self._results[pickle.dumps(new_config)] = self._reward_while_pending()
+        self._register_new_config(new_config)
         return new_config
         
     def random_config(self):
         """Function to randomly sample a new configuration (which is ensured to be valid in the case of conditional hyperparameter spaces).
         """
-        # TODO: may loop indefinitely due to no termination condition (like RandomSearcher.get_config() ) 
+        assert not self._search_space_exhausted(), \
+            f"All {self._num_configurations} configs of the search space have been tried already"
         new_config = self.configspace.sample_configuration().get_dictionary()
-        while pickle.dumps(new_config) in self._results.keys():
+        num_tries = 1
+        while not self._register_new_config(new_config):
+            assert num_tries <= self.MAX_RETRIES, \
+                f"Cannot find new config in SKoptSearcher, even after {self.MAX_RETRIES} trials"
             new_config = self.configspace.sample_configuration().get_dictionary()
-        self._results[pickle.dumps(new_config)] = self._reward_while_pending()
+            num_tries += 1
         return new_config
 
     def update(self, config, **kwargs):
@@ -198,6 +218,7 @@ class SKoptSearcher(BaseSearcher):
         try:
             self.bayes_optimizer.tell(self.config2skopt(config),
                                       -reward)  # provide negative reward since skopt performs minimization
+            self._proposals = [] # proposals of the previous surrogate model are outdated
         except self.errors_tohandle:
             logger.info("surrogate model not updated this trial")
 
@@ -1,7 +1,7 @@
 import copy
 import math
 import os
-from collections import OrderedDict, defaultdict
+from collections import OrderedDict
 
 import cloudpickle as pkl
 import matplotlib.pyplot as plt
@@ -11,11 +11,11 @@ from PIL import Image
 from mxnet.gluon.data.vision import transforms
 
 from .metrics import get_metric_instance
-from .nets import get_network
+from .nets import get_network, Ensemble
 from .utils import *
 from ..base.base_predictor import BasePredictor
 from ...core import AutoGluonObject
-from ...utils import save, load, tqdm, collect_params, update_params
+from ...utils import save, load, tqdm, collect_params, update_params, DataLoader
 
 __all__ = ['Classifier']
 
@@ -89,7 +89,8 @@ class Classifier(BasePredictor):
         state_dict = self.state_dict()
         save(state_dict, checkpoint)
 
-    def predict(self, X, input_size=224, crop_ratio=0.875, set_prob_thresh=0.001, plot=False):
+    def predict(self, X, input_size=224, crop_ratio=0.875, set_prob_thresh=0.001, plot=False,
+                batch_size=None, num_workers=None, ctx=None):
         """Predict class-index and associated class probability for each image in a given dataset (or just a single image). 
         
         Parameters
@@ -104,6 +105,16 @@ class Classifier(BasePredictor):
             Whether to plot the image being classified.
         set_prob_thresh: float
             Results with probability below threshold are set to 0 by default.
+        batch_size : int
+            Number of images predicted at once when `X` is a dataset. Defaults to the batch size used in training.
+        num_workers : int
+            Number of worker processes loading the images of `X` when it is a dataset. Defaults to the number used in training.
+        ctx : mxnet.context
+            Context to predict datasets on. Defaults to the context of the model parameters.
+
+        Returns
+        -------
+        When `X` is a dataset, NumPy arrays of the predicted class-indices, their probabilities, and the probabilities of all classes with one row per image.
 
         Examples
         --------
@@ -126,60 +137,25 @@ class Classifier(BasePredictor):
             transforms.Normalize([0.485, 0.456, 0.406], [0.229, 0.224, 0.225])
         ])
 
-        def predict_img(img, ensemble=False):
+        def predict_img(img):
             proba = self.predict_proba(img)
-            if ensemble:
-                return proba
             ind = mx.nd.argmax(proba, axis=1).astype('int')
             idx = mx.nd.stack(mx.nd.arange(proba.shape[0], ctx=proba.context), ind.astype('float32'))
             probai = mx.nd.gather_nd(proba, idx)
             return ind, probai, proba
 
-        def avg_prediction(different_dataset, threshold=0.001):
-            result = defaultdict(list)
-            inds, probas, probals_all = [], [], []
-            for i in range(len(different_dataset)):
-                for j in range(len(different_dataset[0])):
-                    result[j].append(different_dataset[i][j])
-
-            for c in result:
-                proba_all = sum([*result[c]]) / len(different_dataset)
-                proba_all = (proba_all >= threshold) * proba_all
-                ind = mx.nd.argmax(proba_all, axis=1).astype('int')
-                idx = mx.nd.stack(mx.nd.arange(proba_all.shape[0], ctx=proba_all.context), ind.astype('float32'))
-                proba = mx.nd.gather_nd(proba_all, idx)
-                inds.append(ind.asscalar())
-                probas.append(proba.asnumpy())
-                probals_all.append(proba_all.asnumpy().flatten())
-            return inds, probas, probals_all
-
         def predict_imgs(X):
             if isinstance(X, list):
-                different_dataset = []
-                for i, x in enumerate(X):
-                    proba_all_one_dataset = []
-                    tbar = tqdm(range(len(x.items)))
-                    for j, x_item in enumerate(x):
-                        tbar.update(1)
-                        proba_all = predict_img(x_item[0], ensemble=True)
-                        tbar.set_description('ratio:[%d],The input picture [%d]' % (i, j))
-                        proba_all_one_dataset.append(proba_all)
-                    different_dataset.append(proba_all_one_dataset)
-                inds, probas, probals_all = avg_prediction(different_dataset, threshold=set_prob_thresh)
+                # Average the probabilities of the different scales of the images, then zero probabilities below threshold
+                proba_all = np.mean([
+                    self._predict_proba_dataset(x, batch_size=batch_size, num_workers=num_workers, ctx=ctx) for x in X
+                ], axis=0)
+                proba_all = (proba_all >= set_prob_thresh) * proba_all
             else:
-                inds, probas, probals_all = [], [], []
-                tbar = tqdm(range(len(X.items)))
-                for i, x in enumerate(X):
-                    tbar.update(1)
-                    ind, proba, proba_all = predict_img(x[0])
-                    tbar.set_description(
-                        'The input picture [%d] is classified as [%d], with probability %.2f ' %
-                        (i, ind.asscalar(), proba.asscalar())
-                    )
-                    inds.append(ind.asscalar())
-                    probas.append(proba.asnumpy())
-                    probals_all.append(proba_all.asnumpy().flatten())
-            return inds, probas, probals_all
+                proba_all = self._predict_proba_dataset(X, batch_size=batch_size, num_workers=num_workers, ctx=ctx)
+            inds = np.argmax(proba_all, axis=1)
+            probas = proba_all[np.arange(proba_all.shape[0]), inds]
+            return inds, probas, proba_all
 
         if isinstance(X, str) and os.path.isfile(X):
             img = mx.image.imread(filename=X)
@@ -213,6 +189,33 @@ class Classifier(BasePredictor):
         pred = self.model(X.expand_dims(0))
         return mx.nd.softmax(pred)
 
+    def _predict_proba_dataset(self, dataset, batch_size=None, num_workers=None, ctx=None):
+        """Produces predicted class probabilities for all images in a dataset as NumPy array of shape (num_images, num_classes),
+        predicting batches of images loaded by a multi-worker DataLoader with the hybridized network.
+        """
+        if batch_size is None:
+            batch_size = self.args.batch_size
+        if num_workers is None:
+            num_workers = self.args.num_workers
+        # Networks of the model, several for an ensemble (`fit(..., ensemble>1)`)
+        nets = self.model.model_list if isinstance(self.model, Ensemble) else [self.model]
+        if ctx is None:
+            params = list(nets[0].collect_params().values()) if hasattr(nets[0], 'collect_params') else []
+            ctx = params[0].list_ctx()[0] if params else mx.cpu()
+        if not getattr(self, '_is_hybridized', False):
+            for net in nets:
+                if isinstance(net, mx.gluon.HybridBlock):
+                    net.hybridize(static_alloc=True)
+            self._is_hybridized = True
+        data_loader = DataLoader(dataset, batch_size=batch_size, shuffle=False, last_batch='keep', num_workers=num_workers)
+        probas = []
+        with mx.autograd.pause(train_mode=False):
+            for batch in tqdm(data_loader):
+                data = batch[0] if isinstance(batch, (list, tuple)) else batch
+                pred = self.model(data.as_in_context(ctx))
+                probas.append(mx.nd.softmax(pred).asnumpy())
+        return np.concatenate(probas, axis=0)
+
     def evaluate(self, dataset, input_size=224, ctx=[mx.cpu()]):
         """Evaluate predictive performance of trained image classifier using given test data.
         
@@ -1,8 +1,13 @@
+import hashlib
+import io
+import json
 import logging
 import math
+import multiprocessing
 import os
 import platform
 import sys
+import uuid
 import warnings
 
 import numpy as np
@@ -20,7 +25,7 @@ from ...utils.pil_transforms import *
 _is_osx = platform.system() == "Darwin"
 
 __all__ = [
-    'get_dataset', 'get_built_in_dataset',
+    'get_dataset', 'get_built_in_dataset', 'pack_image_folder', 'pack_dataset',
     'ImageFolderDataset', 'RecordDataset', 'NativeImageFolderDataset'
 ]
 
@@ -105,10 +110,86 @@ def generate_transform(train, resize, _is_osx, input_size, jitter_param):
         )
 
 
+def _encode_resized_image(item):
+    """Decodes an image, resizes it so that its shorter side is `short_size` and encodes it as JPEG."""
+    filename, short_size, quality = item
+    with open(filename, 'rb') as f:
+        img = Image.open(f)
+        img = img.convert('RGB')
+    width, height = img.size
+    scale = short_size / min(width, height)
+    if scale < 1:
+        img = img.resize((max(1, round(width * scale)), max(1, round(height * scale))), Image.BILINEAR)
+    buffer = io.BytesIO()
+    img.save(buffer, format='JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+def _get_classes_path(rec_path):
+    """Path of the JSON file next to a RecordIO file storing the number of classes and class names of its images."""
+    return os.path.splitext(rec_path)[0] + '.classes.json'
+
+
+def pack_image_folder(items, cache_dir, short_size=256, quality=95, num_workers=None, classes=None):
+    """Decodes the images of a folder dataset, downsizes them so that their shorter side is `short_size`,
+    and packs them with their labels into an indexed RecordIO file that can be read by :class:`RecordDataset`.
+    The file is named after the images and packing options, and reused if it already exists in `cache_dir`.
+    The number of classes and the class names are stored in a JSON file next to it, so that :class:`RecordDataset`
+    does not have to read every record to count the classes.
+
+    Parameters
+    ----------
+    items : list of (str, int)
+        Paths of the images and their labels, such as the `items` of an image folder dataset.
+    cache_dir : str
+        Local directory to store the RecordIO file and its index in.
+    short_size : int
+        Size of the shorter side of the packed images, images that are already smaller are not resized.
+    quality : int
+        JPEG quality of the packed images.
+    num_workers : int, default None
+        Number of processes decoding and resizing images, defaults to the number of CPUs.
+    classes : list of str, default None
+        Class names of the labels, such as the `classes` of an image folder dataset.
+
+    Returns
+    -------
+    str : Path of the RecordIO file.
+    """
+    fingerprint = hashlib.sha1(repr((short_size, quality, classes)).encode())
+    for filename, label in items:
+        stat = os.stat(filename)
+        fingerprint.update(repr((os.path.abspath(filename), label, stat.st_size, stat.st_mtime)).encode())
+    rec_path = os.path.join(cache_dir, fingerprint.hexdigest() + '.rec')
+    idx_path = os.path.splitext(rec_path)[0] + '.idx'
+    if os.path.exists(rec_path):
+        return rec_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    logger.info(f'Packing {len(items)} images into {rec_path}, resized to a shorter side of {short_size} '
+                f'and encoded as JPEG with quality {quality}')
+    # Write to temporary files first so that concurrent readers never see a partial file
+    tmp_prefix = os.path.join(cache_dir, uuid.uuid4().hex)
+    record = recordio.MXIndexedRecordIO(tmp_prefix + '.idx', tmp_prefix + '.rec', 'w')
+    with multiprocessing.Pool(num_workers) as pool:
+        encoded_imgs = pool.imap(_encode_resized_image, [(filename, short_size, quality) for filename, _ in items],
+                                 chunksize=64)
+        for i, ((_, label), encoded_img) in enumerate(zip(items, encoded_imgs)):
+            header = recordio.IRHeader(0, float(label), i, 0)
+            record.write_idx(i, recordio.pack(header, encoded_img))
+    record.close()
+    with open(tmp_prefix + '.classes.json', 'w') as f:
+        json.dump(dict(num_classes=len({label for _, label in items}), classes=classes), f)
+    os.replace(tmp_prefix + '.classes.json', _get_classes_path(rec_path))
+    os.replace(tmp_prefix + '.idx', idx_path)
+    os.replace(tmp_prefix + '.rec', rec_path)
+    return rec_path
+
+
 @func()
 def get_dataset(path=None, train=True, name=None,
                 input_size=224, crop_ratio=0.875, jitter_param=0.4, scale_ratio_choice=[],
-                *args, **kwargs):
+                *args, cache_dir=None, **kwargs):
     """ Method to produce image classification dataset for AutoGluon, can either be a
     :class:`ImageFolderDataset`, :class:`RecordDataset`, or a
     popular dataset already built into AutoGluon ('mnist', 'cifar10', 'cifar100', 'imagenet').
@@ -130,6 +211,13 @@ def get_dataset(path=None, train=True, name=None,
         Center crop ratio (for evaluation only)
     scale_ratio_choice: list
         List of crop_ratio, only in the test dataset, the set of scaling ratios obtained is scaled to the original image, and then cut a fixed size (input_size) and get a set of predictions for averaging.
+    cache_dir : str, optional
+        If specified, the images of a training image folder are decoded once, downsized to a shorter side of
+        `input_size / crop_ratio`, re-encoded as JPEG with quality 95, and packed into an indexed RecordIO file in
+        this local directory, which is then read by all trials instead of the original images.
+        The packed file is reused by later calls on the same images. Packing is disabled by default.
+        Note that packing changes the training data: random crops of the training transform are taken from the
+        downsized images, and JPEG re-encoding is lossy.
 
     Returns
     -------
@@ -191,9 +279,36 @@ def get_dataset(path=None, train=True, name=None,
 
     if not scale_ratio_choice:
         dataset = dataset.init()
+        if cache_dir is not None and train and hasattr(dataset, 'items') and not _is_osx:
+            rec_path = pack_image_folder(dataset.items, cache_dir, short_size=resize, classes=dataset.classes)
+            dataset = RecordDataset(
+                rec_path,
+                gray_scale=kwargs.get('gray_scale', False),
+                transform=_TransformFirstClosure(transform),
+                classes=dataset.classes
+            ).init()
     return dataset
 
 
+def pack_dataset(dataset):
+    """Packs the images of a training dataset returned by :func:`get_dataset` if it specifies a `cache_dir`.
+    Called once before trials start, so that trials running concurrently all read the packed file instead of each
+    packing the images themselves.
+
+    Parameters
+    ----------
+    dataset : :class:`autogluon.space.AutoGluonObject`
+        Dataset to pack, other datasets are left as they are.
+    """
+    if not isinstance(dataset, AutoGluonObject) or getattr(dataset, 'func', None) is not get_dataset.__wrapped__:
+        return
+    if dataset.kwargs.get('cache_dir') is None or not dataset.kwargs.get('train', True) \
+            or dataset.kwargs.get('scale_ratio_choice'):
+        return
+    # Packs the images with the default config, trials sampling the same input size then find them in cache_dir
+    dataset.init()
+
+
 @obj()
 class IndexImageDataset(MXImageFolderDataset):
     """A image classification dataset with a CVS label file
@@ -281,25 +396,36 @@ class RecordDataset:
     transform : function, default None
         A user defined callback that transforms each sample.
     classes : iterable of str, default is None
-        User provided class names. If `None` is provide, will use
+        User provided class names. If `None` is provide, will use the class names stored next to
+        files packed by :func:`pack_image_folder`, or else
         a list of increasing natural number ['0', '1', ..., 'N'] by default.
     """
 
     def __init__(self, filename, gray_scale=False, transform=None, classes=None):
         flag = 0 if gray_scale else 1
-        # retrieve number of classes without decoding images
-        td = RecordFileDataset(filename)
-        s = {recordio.unpack(td.__getitem__(i))[0].label[0] for i in range(len(td))}
-        self._num_classes = len(s)
+        classes_path = _get_classes_path(filename)
+        if os.path.exists(classes_path):
+            with open(classes_path) as f:
+                classes_info = json.load(f)
+            self._num_classes = classes_info['num_classes']
+            if not classes:
+                classes = classes_info['classes']
+        else:
+            # retrieve number of classes without decoding images
+            td = RecordFileDataset(filename)
+            s = {recordio.unpack(td.__getitem__(i))[0].label[0] for i in range(len(td))}
+            self._num_classes = len(s)
         if not classes:
             self._classes = [str(i) for i in range(self._num_classes)]
-        elif len(self._num_classes) != len(classes):
+        elif self._num_classes != len(classes):
             warnings.warn(
                 f'Provided class names do not match data, expected "num_class" is {self._num_classes} vs. provided: {len(classes)}'
             )
 
             self._classes = list(classes) + \
                     [str(i) for i in range(len(classes), self._num_classes)]
+        else:
+            self._classes = list(classes)
         self._dataset = ImageRecordDataset(filename, flag=flag)
         if transform:
             self._dataset = self._dataset.transform_first(transform)
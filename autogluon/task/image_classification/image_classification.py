@@ -4,7 +4,7 @@ import copy
 import mxnet as mx
 
 from .classifier import Classifier
-from .dataset import get_dataset
+from .dataset import get_dataset, pack_dataset
 from .nets import *
 from .pipeline import train_image_classification
 from .utils import *
@@ -250,6 +250,10 @@ class ImageClassification(BaseTask):
             # based on the dataset statistics
             net = auto_suggest_network(dataset, net)
 
+        # If the dataset sets cache_dir, pack the training images once here,
+        # rather than in each of the trials started concurrently by the scheduler
+        pack_dataset(dataset)
+
         nthreads_per_trial = get_cpu_count() if nthreads_per_trial > get_cpu_count() else nthreads_per_trial
         ngpus_per_trial = get_gpu_count() if ngpus_per_trial > get_gpu_count() else ngpus_per_trial
 
@@ -4,8 +4,10 @@ import cloudpickle as pkl
 import gluoncv as gcv
 import matplotlib.pyplot as plt
 import mxnet as mx
+import numpy as np
 from gluoncv.data.batchify import Tuple, Stack, Pad, Append
 from gluoncv.data.transforms import presets
+from gluoncv.data.transforms import image as timage
 from gluoncv.data.transforms.presets.rcnn import FasterRCNNDefaultValTransform
 from gluoncv.data.transforms.presets.yolo import YOLO3DefaultValTransform
 from mxnet import gluon
@@ -42,6 +44,7 @@ class Detector(BasePredictor):
         args = self.args
         net = self.model
         net.collect_params().reset_ctx(ctx)
+        self._predict_config = None
 
         def _get_dataloader(net, test_dataset, data_shape, batch_size, num_workers, num_devices,
                                 args):
@@ -148,29 +151,42 @@ class Detector(BasePredictor):
                                     args.num_workers, len(ctx), args)
         return _validate(net, test_data, ctx, eval_metric)
 
-    def predict(self, X, input_size=224, thresh=0.15, plot=True):
+    def predict(self, X, input_size=224, thresh=0.15, plot=True, batch_size=None, num_workers=None, ctx=None):
         """ Use this object detector to make predictions on test data.
         
         Parameters
         ----------
         X : Test data with image(s) to make predictions for.
+            Either the path to a single image, a list of paths to images, or a `Dataset` in the same format as the training data.
         input_size : int
             Size of images in test data (pixels).
         thresh : float
             Confidence Threshold above which detector outputs bounding box for object.
+            Detections with lower confidence are discarded when predicting multiple images.
         plot : bool
             Whether or not to plot the bounding box of detected objects on top of the original images.
+            Only used when predicting a single image.
+        batch_size : int
+            Number of images predicted at once when predicting multiple images. Defaults to the batch size used in training.
+        num_workers : int
+            Number of processes decoding and resizing images when predicting multiple images. Defaults to the number used in training.
+        ctx : `mxnet.context`
+            Context to predict on, defaults to `mx.cpu()`. The network is only moved when the context changes between calls.
         
         Returns
         -------
         Tuple containing the class-IDs of detected objects, the confidence-scores associated with 
         these detectiions, and the corresponding predicted bounding box locations.
+        When predicting multiple images, a list with one such tuple of NumPy arrays per image,
+        with bounding boxes in the coordinates of the original images.
         """
+        if not isinstance(X, str):
+            return self._predict_batch(X, thresh=thresh, batch_size=batch_size, num_workers=num_workers, ctx=ctx)
         net = self.model
-        net.set_nms(0.45, 200)
-        net.collect_params().reset_ctx(ctx=mx.cpu())
+        ctx = self._prepare_predict(ctx=ctx)
 
         x, img = presets.yolo.load_test(X, short=512)
+        x = x.as_in_context(ctx)
         ids, scores, bboxes = [xx[0].asnumpy() for xx in net(x)]
 
         if plot:
@@ -181,6 +197,55 @@ class Detector(BasePredictor):
         plt.show()
         return ids, scores, bboxes
 
+    def _prepare_predict(self, ctx=None, nms_thresh=0.45, nms_topk=200):
+        """Sets the NMS parameters of the network and moves it to `ctx`, only if these changed since the previous prediction.
+        """
+        ctx = mx.cpu() if ctx is None else ctx
+        predict_config = (str(ctx), nms_thresh, nms_topk)
+        if getattr(self, '_predict_config', None) != predict_config:
+            net = self.model
+            net.set_nms(nms_thresh, nms_topk)
+            net.collect_params().reset_ctx(ctx=ctx)
+            net.hybridize()
+            self._predict_config = predict_config
+        return ctx
+
+    def _predict_batch(self, X, thresh=0.15, batch_size=None, num_workers=None, ctx=None, short=512, max_size=1024):
+        """Predicts a list of image paths or a dataset in batches of images padded to the same size.
+        """
+        args = self.args
+        if batch_size is None:
+            batch_size = args.batch_size
+        if num_workers is None:
+            num_workers = args.num_workers
+        if args.meta_arch == 'faster_rcnn':
+            batch_size = 1  # Faster R-CNN predicts a single image at a time
+        if isinstance(X, AutoGluonObject):
+            X = X.init()
+        if hasattr(X, 'get_dataset_and_metric'):
+            X = X.get_dataset_and_metric()[0]
+        elif not isinstance(X, gluon.data.Dataset):
+            X = gluon.data.SimpleDataset(list(X))
+        ctx = self._prepare_predict(ctx=ctx)
+        test_loader = gluon.data.DataLoader(
+            X.transform(_DetectionTestTransform(short=short, max_size=max_size)),
+            batch_size,
+            False,
+            batchify_fn=_pad_batchify_fn,
+            last_batch='keep',
+            num_workers=num_workers
+        )
+        net = self.model
+        results = []
+        for x, bbox_scale in test_loader:
+            ids, scores, bboxes = [xx.asnumpy() for xx in net(x.as_in_context(ctx))]
+            bboxes = bboxes * bbox_scale.asnumpy()[:, np.newaxis, :]
+            # Padded detections have a score of -1, so they are discarded along with the detections below thresh
+            keep = scores[:, :, 0] > thresh
+            for i in range(keep.shape[0]):
+                results.append((ids[i][keep[i]], scores[i][keep[i]], bboxes[i][keep[i]]))
+        return results
+
     @classmethod
     def load(cls, checkpoint):
         """ load trained object detector from the file specified by 'checkpoint'
@@ -220,3 +285,37 @@ class Detector(BasePredictor):
 
     def predict_proba(self, X):
         raise NotImplementedError
+
+
+class _DetectionTestTransform:
+    """Decodes an image if given its path, then resizes and normalizes it as `presets.yolo.load_test`.
+    Returns the image and the factors to scale bounding boxes back to the original image size.
+    """
+    def __init__(self, short=512, max_size=1024, mean=(0.485, 0.456, 0.406), std=(0.229, 0.224, 0.225)):
+        self.short = short
+        self.max_size = max_size
+        self.mean = mean
+        self.std = std
+
+    def __call__(self, img, *args):
+        if isinstance(img, str):
+            img = mx.image.imread(img)
+        height, width = img.shape[:2]
+        img = timage.resize_short_within(img, self.short, self.max_size)
+        bbox_scale = np.array([width / img.shape[1], height / img.shape[0]] * 2, dtype='float32')
+        img = mx.nd.image.to_tensor(img)
+        img = mx.nd.image.normalize(img, mean=self.mean, std=self.std)
+        return img, bbox_scale
+
+
+def _pad_batchify_fn(samples):
+    """Pads images of different sizes with zeros at the bottom and right into a single batch, which does not move bounding boxes.
+    """
+    imgs = [img.asnumpy() for img, _ in samples]
+    height = max(img.shape[1] for img in imgs)
+    width = max(img.shape[2] for img in imgs)
+    batch = np.zeros((len(imgs), imgs[0].shape[0], height, width), dtype='float32')
+    for i, img in enumerate(imgs):
+        batch[i, :, :img.shape[1], :img.shape[2]] = img
+    bbox_scales = np.stack([bbox_scale for _, bbox_scale in samples])
+    return mx.nd.array(batch), mx.nd.array(bbox_scales)
@@ -1,5 +1,6 @@
 import copy
 import logging
+from contextlib import contextmanager
 
 import pandas as pd
 
@@ -11,6 +12,7 @@ from ...utils.tabular.ml.constants import REGRESSION
 from ...utils.tabular.ml.learner.abstract_learner import AbstractLearner as Learner  # TODO: Keep track of true type of learner for loading
 from ...utils.tabular.ml.trainer.abstract_trainer import AbstractTrainer  # TODO: Keep track of true type of trainer for loading
 from ...utils.tabular.ml.utils import setup_outputdir
+from ...utils.tabular.utils.profiler import profiling
 
 __all__ = ['TabularPredictor']
 
@@ -103,7 +105,18 @@ class TabularPredictor(BasePredictor):
         logger.warning('WARNING: `predictor.model_performance` is a deprecated `predictor` variable. Use `predictor.leaderboard()` instead. Use of `predictor.model_performance` will result in an exception starting in autogluon==0.1')
         return self._trainer.model_performance
 
-    def predict(self, dataset, model=None, as_pandas=False, use_pred_cache=False, add_to_pred_cache=False):
+    @property
+    def early_exit_info(self):
+        """ Information on the models skipped in the last `predict()` or `predict_proba()` call with `early_exit_tol`.
+            Dictionary with the names of the bagged models and weighted ensembles that skipped models as keys,
+            None if `early_exit_tol` was never used.
+            For bagged models, lists the skipped fold models and the number of rows predicted by each fold model.
+            For weighted ensembles, lists the evaluated and skipped base models, and the skipped share of the weights.
+        """
+        return getattr(self._learner, 'early_exit_info', None)
+
+    def predict(self, dataset, model=None, as_pandas=False, use_pred_cache=False, add_to_pred_cache=False,
+                early_exit_tol=None):
         """ Use trained models to produce predicted labels (in classification) or response values (in regression).
 
             Parameters
@@ -123,6 +136,15 @@ class TabularPredictor(BasePredictor):
             add_to_pred_cache : bool (optional)
                 Whether these predictions should be cached for reuse in future `predict()` calls on the same table rows
                 (can speedup repeated runs of `predict()` on multiple datasets with overlapping rows between them).
+            early_exit_tol : float (optional)
+                If specified, the fold models of each bagged model are evaluated one at a time, and a row is no longer
+                passed to the remaining fold models once the standard error of its averaged prediction is at most
+                `early_exit_tol`. Weighted ensembles evaluate their base models in descending order of weight, and skip
+                the remaining base models once their total weight is at most `early_exit_tol` (classification only).
+                Can substantially reduce inference time when most rows are easy to predict, at the cost of predictions
+                that may slightly differ from those obtained with `early_exit_tol=None`. Has no effect on other models.
+                Example: `early_exit_tol=0.01`.
+                The skipped models are listed in `predictor.early_exit_info` after the prediction.
 
             Returns
             -------
@@ -130,9 +152,10 @@ class TabularPredictor(BasePredictor):
 
         """
         dataset = self.__get_dataset(dataset)
-        return self._learner.predict(X=dataset, model=model, as_pandas=as_pandas, use_pred_cache=use_pred_cache, add_to_pred_cache=add_to_pred_cache)
+        return self._learner.predict(X=dataset, model=model, as_pandas=as_pandas, use_pred_cache=use_pred_cache,
+                                     add_to_pred_cache=add_to_pred_cache, early_exit_tol=early_exit_tol)
 
-    def predict_proba(self, dataset, model=None, as_pandas=False, as_multiclass=False):
+    def predict_proba(self, dataset, model=None, as_pandas=False, as_multiclass=False, early_exit_tol=None):
         """ Use trained models to produce predicted class probabilities rather than class-labels (if task is classification).
 
             Parameters
@@ -153,6 +176,15 @@ class TabularPredictor(BasePredictor):
                     Output will contain two columns, and if `as_pandas=True`, the column names will correspond to the binary class labels.
                     The columns will be the same order as `predictor.class_labels`.
                 Only impacts output for binary classification problems.
+            early_exit_tol : float (optional)
+                If specified, the fold models of each bagged model are evaluated one at a time, and a row is no longer
+                passed to the remaining fold models once the standard error of its averaged prediction is at most
+                `early_exit_tol`. Weighted ensembles evaluate their base models in descending order of weight, and skip
+                the remaining base models once their total weight is at most `early_exit_tol` (classification only).
+                Can substantially reduce inference time when most rows are easy to predict, at the cost of predictions
+                that may slightly differ from those obtained with `early_exit_tol=None`. Has no effect on other models.
+                Example: `early_exit_tol=0.01`.
+                The skipped models are listed in `predictor.early_exit_info` after the prediction.
 
             Returns
             -------
@@ -161,7 +193,43 @@ class TabularPredictor(BasePredictor):
             For binary classification problems, the output contains for each datapoint only the predicted probability of the positive class, unless you specify `as_multiclass=True`.
         """
         dataset = self.__get_dataset(dataset)
-        return self._learner.predict_proba(X=dataset, model=model, as_pandas=as_pandas, as_multiclass=as_multiclass)
+        return self._learner.predict_proba(X=dataset, model=model, as_pandas=as_pandas, as_multiclass=as_multiclass,
+                                           early_exit_tol=early_exit_tol)
+
+    def predict_chunked(self, dataset, output_path, chunksize=100000, model=None, proba=False, as_multiclass=False,
+                        **kwargs):
+        """ Produce predictions for a dataset stored on disk that is potentially too large to fit in memory.
+            The dataset is loaded in chunks of `chunksize` rows, each chunk is passed through the feature generators and
+            models, and its predictions are appended to `output_path` before the next chunk is loaded.
+            Peak memory usage is therefore bounded by `chunksize` rather than by the size of `dataset`.
+
+            Parameters
+            ----------
+            dataset : str or list of str
+                File path (or list of file paths) to CSV or parquet data to make predictions for, in the same format as
+                the training data.
+                Multipart directories (ending in '/', containing 'part-*' files) are also supported.
+            output_path : str
+                Local file path of the CSV file the predictions are written to.
+                Rows are in the same order as in `dataset`.
+            chunksize : int, default = 100000
+                Number of rows to load and predict at once.
+            model : str (optional)
+                The name of the model to get predictions from. Defaults to None, which uses the highest scoring model
+                on the validation set.
+            proba : bool, default = False
+                Whether to write predicted class-probabilities (as in `predict_proba()`) instead of predicted labels.
+            as_multiclass : bool, default = False
+                Only used if `proba=True`. See `predict_proba()`.
+            **kwargs :
+                Additional arguments passed to the data loader, such as `delimiter`, `columns_to_keep` or `dtype`.
+
+            Returns
+            -------
+            Number of rows predicted.
+        """
+        return self._learner.predict_chunked(path=dataset, output_path=output_path, chunksize=chunksize, model=model,
+                                             proba=proba, as_multiclass=as_multiclass, load_kwargs=kwargs)
 
     def evaluate(self, dataset, silent=False):
         """ Report the predictive performance evaluated for a given Dataset.
@@ -780,6 +848,115 @@ class TabularPredictor(BasePredictor):
         self._learner.save()
         logger.log(20, "TabularPredictor saved. To load, use: TabularPredictor.load(\"%s\")" % self.output_directory)
 
+    def export_inference_artifact(self, path, model=None):
+        """
+        Saves a compact, inference-only version of this predictor to a single file.
+        The file only contains the fitted feature generators, the label mappings,
+        and the models required to predict with `model` (including all of their bagged fold models).
+        Training data, out-of-fold predictions and other information only required for fitting are not included,
+        and the trainer and learner objects are not loaded at inference time.
+        The artifact can then be loaded with `autogluon_inference.load_inference_artifact()`,
+        and supports the `predict()` and `predict_proba()` methods on pandas DataFrames.
+        Loading the artifact this way does not import the `autogluon` package,
+        only the modules of the models in the artifact.
+        MXNet is therefore only imported if the artifact contains a neural network model.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to save the artifact to.
+        model : str, default = None
+            The name of the model to export.
+            Defaults to None, which uses the highest scoring model on the validation set.
+            Valid models are listed in this `predictor` by calling `predictor.get_model_names()`.
+
+        Returns
+        -------
+        :class:`autogluon.utils.tabular.ml.learner.inference_artifact.InferenceArtifact` object saved to `path`.
+
+        Examples
+        --------
+        >>> predictor.export_inference_artifact('inference_artifact.pkl')
+
+        In the process used for inference:
+
+        >>> from autogluon_inference import load_inference_artifact
+        >>> artifact = load_inference_artifact('inference_artifact.pkl')
+        >>> y_pred = artifact.predict(test_data)
+        """
+        return self._learner.export_inference_artifact(path=path, model=model)
+
+    def get_post_hoc_ensembler(self, dataset, models=None):
+        """
+        Predicts once with the trained models on labeled holdout data, and returns an object caching these predictions
+        to fit weighted ensembles over them after training.
+        Ensembles can be fit repeatedly with different metrics, model subsets and ensemble sizes
+        without predicting with the models again, and report their score on `dataset`
+        as well as their full inference time, including all base models they depend on.
+        Predictions and scores are in the internal label space of the trained models.
+
+        Parameters
+        ----------
+        dataset : str or :class:`TabularDataset` or `pandas.DataFrame`
+            Holdout data, which must contain the label column.
+        models : list of str, default = None
+            The names of the models to cache predictions of. Defaults to None, which uses all models that can infer.
+            Valid models are listed in this `predictor` by calling `predictor.get_model_names()`.
+
+        Returns
+        -------
+        :class:`autogluon.utils.tabular.ml.tuning.post_hoc_ensemble.PostHocEnsembler` object.
+
+        Examples
+        --------
+        >>> ensembler = predictor.get_post_hoc_ensembler(test_data)
+        >>> ensemble_info = ensembler.fit(ensemble_size=25)
+        >>> ensemble_info_fast = ensembler.fit(models=['LightGBMClassifier', 'RandomForestClassifierGini'])
+        >>> print(ensemble_info['weights'], ensemble_info['score'], ensemble_info['pred_time'])
+        """
+        dataset = self.__get_dataset(dataset)
+        return self._learner.get_post_hoc_ensembler(X=dataset, models=models)
+
+    @contextmanager
+    def profile(self, track_memory=True):
+        """
+        Context manager recording the time and peak memory usage of each stage of the calls made within it,
+        such as `predict()` or `evaluate()`. Yields a :class:`autogluon.utils.tabular.utils.profiler.Profiler`.
+        Only calls made in the current thread are recorded, so predictors used at the same time in other threads
+        are not included.
+        Stages are recorded per model and include:
+            'feature_generation': transformation of the raw data by the feature generator.
+            'load_model', 'save_model', 'load_trainer', 'save_trainer', 'save_learner': loading and saving of
+                pickled objects.
+            'preprocess': model specific preprocessing of the data.
+            'stacker_features': assembly of the base model predictions used as input features of stacker models.
+            'predict_proba', 'fit': model prediction and training, including the nested stages above.
+        To profile `fit()`, wrap it in `autogluon.utils.tabular.utils.profiler.profiling()` instead,
+        which works the same way.
+
+        After the context manager exits, the recorded stages are returned by the methods of the profiler:
+            `profiler.get_summary()`: one row per stage and model with the columns:
+                'stage', 'model', 'count', 'time_total', 'time_mean', 'time_max', 'peak_memory'.
+                Rows are sorted by 'time_total'. Stages that are not specific to a model have `model=''`.
+            `profiler.get_records()`: one row per execution of a stage with the columns:
+                'stage', 'model', 'parent_stage', 'depth', 'time', 'peak_memory', 'thread'.
+        Times are in seconds, and peak memory usage in bytes (NaN if `track_memory=False`).
+
+        Parameters
+        ----------
+        track_memory : bool, default = True
+            Whether to record the peak memory allocated during each stage with `tracemalloc`.
+            This slows down the profiled code, set `track_memory=False` if only timings are needed.
+
+        Examples
+        --------
+        >>> with predictor.profile() as profiler:
+        >>>     y_pred = predictor.predict(test_data)
+        >>> print(profiler.get_summary())
+        """
+        with profiling(track_memory=track_memory) as profiler:
+            yield profiler
+
     def load_data_internal(self, dataset='train', return_X=True, return_y=True):
         """
         Loads the internal data representation used during model training.
@@ -250,6 +250,9 @@ class TabularPrediction(BaseTask):
                     Note: Hyperparameter tuning is disabled for this model.
                 KNN: See sklearn documentation: https://scikit-learn.org/stable/modules/generated/sklearn.neighbors.KNeighborsClassifier.html
                     Note: Hyperparameter tuning is disabled for this model.
+                    Note: Specify `'backend': 'faiss'` to use an approximate nearest neighbour index instead.
+                          Requires faiss.
+                          See `autogluon/utils/tabular/ml/models/knn/knn_utils.py` for its hyperparameters.
                 LR: `autogluon/utils/tabular/ml/models/lr/hyperparameters/parameters.py`
                     Note: Hyperparameter tuning is disabled for this model.
                     Note: 'penalty' parameter can be used for regression to specify regularization method: 'L1' and 'L2' values are supported.
@@ -310,6 +313,8 @@ class TabularPrediction(BaseTask):
         nthreads_per_trial : int
             How many CPUs to use in each training run of an individual model.
             This is automatically determined by AutoGluon when left as None (based on available compute).
+            Also limits the threads of models trained without hyperparameter tuning,
+            unless their thread count hyperparameter (such as `num_threads` or `n_jobs`) is specified.
         ngpus_per_trial : int
             How many GPUs to use in each trial (ie. single training run of a model).
             This is automatically determined by AutoGluon when left as None.
@@ -419,6 +424,15 @@ class TabularPrediction(BaseTask):
                     The seed used for stack level L is equal to `seed+L`.
                     This means `random_seed=1` will have the same split indices at L=0 as `random_seed=0` will have at L=1.
                 If `random_seed=None`, a random integer is used.
+            max_models_concurrent : int, default = 1
+                Maximum number of models of the same stack level to train at the same time,
+                each using an equal share of the CPU cores (at most `nthreads_per_trial`).
+                Whenever a model finishes, the next model starts with its share of the time left in the stack level,
+                so time left unused by models that finish early is given to the models that start later.
+                Models are only started concurrently while at least 20% of system memory is available.
+                Neural networks and hyperparameter tuning always train models one after another.
+                Values greater than 1 can substantially reduce the training time on machines with many cores,
+                at the cost of higher peak memory usage.
 
         Returns
         -------
@@ -466,6 +480,7 @@ class TabularPrediction(BaseTask):
             'cache_data',
             'refit_full',
             'random_seed',
+            'max_models_concurrent',
             'enable_fit_continuation'  # TODO: Remove on 0.1.0 release
         }
         for kwarg_name in kwargs:
@@ -532,6 +547,7 @@ class TabularPrediction(BaseTask):
         ag_args_fit = kwargs.get('AG_args_fit', {})
         excluded_model_types = kwargs.get('excluded_model_types', [])
         random_seed = kwargs.get('random_seed', 0)
+        max_models_concurrent = kwargs.get('max_models_concurrent', 1)
         nthreads_per_trial, ngpus_per_trial = setup_compute(nthreads_per_trial, ngpus_per_trial)
         num_train_rows = len(train_data)
         if auto_stack:
@@ -593,7 +609,9 @@ class TabularPrediction(BaseTask):
         learner.fit(X=train_data, X_val=tuning_data, scheduler_options=scheduler_options,
                     hyperparameter_tune=hyperparameter_tune, feature_prune=feature_prune,
                     holdout_frac=holdout_frac, num_bagging_folds=num_bagging_folds, num_bagging_sets=num_bagging_sets, stack_ensemble_levels=stack_ensemble_levels,
-                    hyperparameters=hyperparameters, ag_args_fit=ag_args_fit, excluded_model_types=excluded_model_types, time_limit=time_limits_orig, save_data=cache_data, save_bagged_folds=save_bagged_folds, verbosity=verbosity)
+                    hyperparameters=hyperparameters, ag_args_fit=ag_args_fit, excluded_model_types=excluded_model_types,
+                    time_limit=time_limits_orig, save_data=cache_data, save_bagged_folds=save_bagged_folds,
+                    max_models_concurrent=max_models_concurrent, verbosity=verbosity)
 
         predictor = TabularPredictor(learner=learner)
 
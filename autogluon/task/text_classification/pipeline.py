@@ -2,7 +2,6 @@ import os
 import io
 import time
 import logging
-import multiprocessing
 import random
 import warnings
 import numpy as np
@@ -16,6 +15,7 @@ from ...utils.try_import import try_import_gluonnlp
 from .network import get_network
 from .dataset import *
 from .transforms import BERTDatasetTransform
+from .tokenization_cache import LazyPool, get_tokenized_dataset, get_tokenization_key
 from ...core import *
 from ...utils import tqdm
 from ...utils.mxutils import collect_params
@@ -23,9 +23,13 @@ from ...utils.mxutils import collect_params
 __all__ = ['train_text_classification', 'preprocess_data']
 
 
-def preprocess_data(tokenizer, task, batch_size, dev_batch_size, max_len, vocab, pad=False, num_workers=1):
-    """Train/eval Data preparation function."""
-    pool = multiprocessing.Pool()
+def preprocess_data(tokenizer, task, batch_size, dev_batch_size, max_len, vocab, pad=False, num_workers=1,
+                    cache_dir=None):
+    """Train/eval Data preparation function.
+
+    Tokenized train and dev datasets are cached in `cache_dir` if provided, and reused by later calls
+    with the same tokenizer, vocabulary, `max_len`, `pad` and dataset contents, such as other trials.
+    """
     nlp = try_import_gluonnlp()
     # transformation for data train and dev
     label_dtype = 'int32' if task.class_labels else 'float32'
@@ -35,13 +39,21 @@ def preprocess_data(tokenizer, task, batch_size, dev_batch_size, max_len, vocab,
                                  label_alias=task.label_alias,
                                  pad=pad, pair=task.is_pair,
                                  has_label=True)
+    tokenization_key = get_tokenization_key(tokenizer, vocab, max_len, pad, task.is_pair,
+                                            class_labels=task.class_labels, label_alias=task.label_alias)
 
-    # data train
-    # task.dataset_train returns (segment_name, dataset)
+    # task.dataset_train returns (segment_name, dataset). For MNLI, more than one dev set is available
     train_tsv = task.dataset_train()[1]
-    data_train = mx.gluon.data.SimpleDataset(pool.map(trans, train_tsv))
-    data_train_len = data_train.transform(
-        lambda input_id, length, segment_id, label_id: length, lazy=False)
+    dev_tsv = task.dataset_dev()
+    dev_tsv_list = dev_tsv if isinstance(dev_tsv, list) else [dev_tsv]
+    # The worker pool is only started if a dataset is not found in cache_dir
+    with LazyPool() as pool:
+        data_train = get_tokenized_dataset(trans, train_tsv, tokenization_key, cache_dir=cache_dir, pool=pool)
+        data_dev_list = [(segment, get_tokenized_dataset(trans, data, tokenization_key, cache_dir=cache_dir, pool=pool))
+                         for segment, data in dev_tsv_list]
+
+    # data train
+    data_train_len = data_train.valid_length.tolist()
     # bucket sampler for training
     pad_val = vocab[vocab.padding_token]
     batchify_fn = nlp.data.batchify.Tuple(
@@ -62,12 +74,9 @@ def preprocess_data(tokenizer, task, batch_size, dev_batch_size, max_len, vocab,
         batch_sampler=batch_sampler,
         batchify_fn=batchify_fn)
 
-    # data dev. For MNLI, more than one dev set is available
-    dev_tsv = task.dataset_dev()
-    dev_tsv_list = dev_tsv if isinstance(dev_tsv, list) else [dev_tsv]
+    # data dev
     loader_dev_list = []
-    for segment, data in dev_tsv_list:
-        data_dev = mx.gluon.data.SimpleDataset(pool.map(trans, data))
+    for segment, data_dev in data_dev_list:
         loader_dev = mx.gluon.data.DataLoader(
             data_dev,
             batch_size=dev_batch_size,
@@ -197,7 +206,7 @@ def train_text_classification(args, reporter=None):
     # Get the loader.
     train_data, dev_data_list, num_train_examples, trans, test_trans = preprocess_data(
         bert_tokenizer, task, batch_size, dev_batch_size, args.max_len, vocabulary,
-        True, args.num_workers)
+        True, args.num_workers, cache_dir=args.tokenization_cache_dir)
 
     def log_train(batch_id, batch_num, metric, step_loss, log_interval, epoch_id, learning_rate, tbar):
         """Generate and print out the log message for training. """
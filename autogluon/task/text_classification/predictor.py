@@ -2,7 +2,9 @@ import os
 import math
 import pickle
 import copy
+import multiprocessing
 import numpy as np
+import pandas as pd
 from collections import OrderedDict
 import mxnet as mx
 import matplotlib.pyplot as plt
@@ -29,32 +31,50 @@ class TextClassificationPredictor(Classifier):
         self.scheduler_checkpoint = scheduler_checkpoint
         self.args = args
 
-    def predict(self, X):
-        """Predict class-index of a given sentence / text-snippet.
+    def predict(self, X, batch_size=None, num_workers=None, ctx=None):
+        """Predict class-index of a given sentence / text-snippet, or of each sentence in a collection.
         
         Parameters
         ----------
-        X : str
-            The input sentence we should classify.
+        X : str or list or `pandas.Series` or :class:`autogluon.task.TextClassification.Dataset`
+            The input sentence we should classify, or a collection of sentences (sentence pairs as tuples for pair tasks).
+            For a dataset, the sentences of its dev segment are classified.
+        batch_size : int
+            Number of sentences predicted at once for collections. Defaults to the `dev_batch_size` used in training.
+        num_workers : int
+            Number of processes tokenizing the sentences of collections. Defaults to the number used in training.
+        ctx : `mxnet.context`
+            Context to predict collections on. Defaults to the context of the model parameters.
     
         Examples
         --------
         >>> class_index = predictor.predict('this is cool')
+        >>> class_indices = predictor.predict(['this is cool', 'this is not cool'])
     
         Returns
         -------
-        Int corresponding to index of the predicted class.
+        Int corresponding to index of the predicted class, or NumPy array of the predicted class indices in the order of `X` for collections.
         """
-        proba = self.predict_proba(X)
-        return mx.nd.argmax(proba, axis=1).astype('int')
+        proba = self.predict_proba(X, batch_size=batch_size, num_workers=num_workers, ctx=ctx)
+        if isinstance(X, str):
+            return mx.nd.argmax(proba, axis=1).astype('int')
+        return np.argmax(proba, axis=1)
 
-    def predict_proba(self, X):
-        """Predict class-probabilities of a given sentence / text-snippet.
+    def predict_proba(self, X, batch_size=None, num_workers=None, ctx=None):
+        """Predict class-probabilities of a given sentence / text-snippet, or of each sentence in a collection.
+        Collections are tokenized in parallel, and sentences of similar length are predicted together in batches padded to their longest sentence.
         
         Parameters
         ----------
-        X : str
-            The input sentence we should classify.
+        X : str or list or `pandas.Series` or :class:`autogluon.task.TextClassification.Dataset`
+            The input sentence we should classify, or a collection of sentences (sentence pairs as tuples for pair tasks).
+            For a dataset, the sentences of its dev segment are classified.
+        batch_size : int
+            Number of sentences predicted at once for collections. Defaults to the `dev_batch_size` used in training.
+        num_workers : int
+            Number of processes tokenizing the sentences of collections. Defaults to the number used in training.
+        ctx : `mxnet.context`
+            Context to predict collections on. Defaults to the context of the model parameters.
         
         Examples
         --------
@@ -62,9 +82,12 @@ class TextClassificationPredictor(Classifier):
         
         Returns
         -------
-        `mxnet.NDArray` containing predicted probabilities of each class.
+        `mxnet.NDArray` containing predicted probabilities of each class,
+        or NumPy array of shape (num_sentences, num_classes) in the order of `X` for collections.
         """
-        inputs = self.test_transform(X)
+        if not isinstance(X, str):
+            return self._predict_proba_batch(X, batch_size=batch_size, num_workers=num_workers, ctx=ctx)
+        inputs = self.test_transform(self._get_line(X))
         X, valid_length, segment_id = [mx.nd.array(np.expand_dims(x, 0)) for x in inputs]
         if self.use_roberta:
             pred = self.model(X, valid_length)
@@ -72,6 +95,66 @@ class TextClassificationPredictor(Classifier):
             pred = self.model(X, segment_id, valid_length)
         return mx.nd.softmax(pred)
 
+    @staticmethod
+    def _get_line(sentence):
+        # The transform expects a tuple of strings, a single sentence would otherwise be read character by character
+        return (sentence,) if isinstance(sentence, str) else tuple(sentence)
+
+    def _get_lines(self, X):
+        if isinstance(X, AutoGluonObject):
+            X = X.init()
+        if isinstance(X, (AbstractGlueTask, AbstractCustomTask)):
+            # Dataset lines end with their label
+            return [tuple(line[:-1]) for line in X.get_dataset('dev')]
+        if isinstance(X, pd.Series):
+            X = X.values
+        return [self._get_line(sentence) for sentence in X]
+
+    def _predict_proba_batch(self, X, batch_size=None, num_workers=None, ctx=None):
+        args = self.args
+        if batch_size is None:
+            batch_size = args.dev_batch_size
+        if num_workers is None:
+            num_workers = args.num_workers
+        if ctx is None:
+            ctx = list(self.model.collect_params().values())[0].list_ctx()[0]
+        lines = self._get_lines(X)
+        if num_workers > 1 and len(lines) > batch_size:
+            with multiprocessing.Pool(num_workers) as pool:
+                inputs = pool.map(self.test_transform, lines, chunksize=max(1, len(lines) // (num_workers * 4)))
+        else:
+            inputs = [self.test_transform(line) for line in lines]
+        if not inputs:
+            raise ValueError('No sentences to predict.')
+
+        vocab = self.test_transform.vocab
+        pad_val = vocab[vocab.padding_token]
+        valid_lengths = np.array([int(valid_length) for _, valid_length, _ in inputs])
+        # Bucket sentences of similar length into the same batch so that little computation is spent on padding
+        order = np.argsort(valid_lengths, kind='stable')
+        batch_probas = []
+        for batch_start in tqdm(range(0, len(order), batch_size)):
+            batch_indices = order[batch_start:batch_start + batch_size]
+            seq_len = valid_lengths[batch_indices].max()
+            input_ids = np.full((len(batch_indices), seq_len), pad_val, dtype='int32')
+            segment_ids = np.zeros((len(batch_indices), seq_len), dtype='int32')
+            for i, index in enumerate(batch_indices):
+                input_id, valid_length, segment_id = inputs[index]
+                input_ids[i, :valid_length] = input_id[:valid_length]
+                segment_ids[i, :valid_length] = segment_id[:valid_length]
+            input_ids = mx.nd.array(input_ids, ctx=ctx)
+            valid_length = mx.nd.array(valid_lengths[batch_indices], ctx=ctx, dtype='float32')
+            if self.use_roberta:
+                pred = self.model(input_ids, valid_length)
+            else:
+                pred = self.model(input_ids, mx.nd.array(segment_ids, ctx=ctx), valid_length)
+            batch_probas.append(mx.nd.softmax(pred).asnumpy())
+        # Restore the original order of the sentences
+        probas_sorted = np.concatenate(batch_probas, axis=0)
+        probas = np.empty_like(probas_sorted)
+        probas[order] = probas_sorted
+        return probas
+
     def evaluate(self, dataset, ctx=[mx.cpu()]):
         """Evaluate predictive performance of trained text classifier using given test data.
         
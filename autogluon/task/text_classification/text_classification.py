@@ -1,4 +1,5 @@
 import logging
+import os
 
 import mxnet as mx
 from ...utils.try_import import try_import_gluonnlp
@@ -57,6 +58,7 @@ class TextClassification(BaseTask):
             time_limits=None,
             resume=False,
             checkpoint='checkpoint/exp1.ag',
+            tokenization_cache_dir=None,
             visualizer='none',
             dist_ip_addrs=None,
             auto_search=True,
@@ -128,6 +130,9 @@ class TextClassification(BaseTask):
         resume : bool
             If True, the hyperparameter search is started from state loaded
             from checkpoint
+        tokenization_cache_dir : str or None
+            Local directory where tokenized datasets are cached, so that they are only tokenized once across all trials.
+            Defaults to a 'tokenization_cache' directory next to `checkpoint` (no caching if `checkpoint` is None).
         visualizer : str
             Describes method to visualize training progress during `fit()`. Options: ['mxboard', 'tensorboard', 'none']. 
         dist_ip_addrs : list
@@ -161,6 +166,9 @@ class TextClassification(BaseTask):
         if num_trials is None and time_limits is None:
             num_trials = 2
 
+        if tokenization_cache_dir is None and checkpoint is not None:
+            tokenization_cache_dir = os.path.join(os.path.dirname(checkpoint), 'tokenization_cache')
+
         train_text_classification.register_args(
             dataset=dataset,
             pretrained_dataset=pretrained_dataset,
@@ -183,6 +191,7 @@ class TextClassification(BaseTask):
             hybridize=hybridize,
             verbose=verbose,
             final_fit=False,
+            tokenization_cache_dir=tokenization_cache_dir,
             **kwargs)
 
         # Backward compatibility:
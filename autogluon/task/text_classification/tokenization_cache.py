@@ -0,0 +1,178 @@
+import hashlib
+import logging
+import multiprocessing
+import os
+import shutil
+import uuid
+
+import numpy as np
+import mxnet as mx
+
+__all__ = ['TokenizedDataset', 'LazyPool', 'get_tokenized_dataset', 'get_tokenization_key']
+
+logger = logging.getLogger(__name__)
+
+
+class TokenizedDataset(mx.gluon.data.Dataset):
+    """Dataset of sentences tokenized by `BERTDatasetTransform`, stored as flat arrays that can be memory-mapped from disk.
+
+    Each sample is a tuple of (input token ids, valid length, token type ids, label), as returned by the transform.
+
+    Parameters
+    ----------
+    arrays : dict of str to np.ndarray
+        'input_ids' and 'segment_ids' hold the concatenated token ids of all samples, starting at 'offsets',
+        'valid_length' and 'label' hold one entry per sample ('label' is only present if the samples have labels).
+    path : str, default None
+        Directory the arrays are memory-mapped from, used to memory-map them again when the dataset is pickled to workers.
+    """
+    _array_names = ['input_ids', 'segment_ids', 'offsets', 'valid_length', 'label']
+
+    def __init__(self, arrays, path=None):
+        self._arrays = arrays
+        self._path = path
+
+    @classmethod
+    def from_samples(cls, samples):
+        lengths = np.array([len(sample[0]) for sample in samples], dtype='int64')
+        arrays = {
+            'input_ids': np.concatenate([sample[0] for sample in samples]).astype('int32'),
+            'segment_ids': np.concatenate([sample[2] for sample in samples]).astype('int32'),
+            'offsets': np.concatenate([[0], np.cumsum(lengths)]),
+            'valid_length': np.array([sample[1] for sample in samples], dtype='int32'),
+        }
+        if len(samples[0]) > 3:
+            arrays['label'] = np.stack([sample[3] for sample in samples])
+        return cls(arrays)
+
+    @classmethod
+    def load(cls, path):
+        arrays = dict()
+        for name in cls._array_names:
+            array_path = os.path.join(path, name + '.npy')
+            if os.path.exists(array_path):
+                arrays[name] = np.load(array_path, mmap_mode='r')
+        return cls(arrays, path=path)
+
+    def save(self, path):
+        """Saves the arrays to directory `path`, replacing it atomically so that concurrent trials never read partial files.
+        """
+        path_tmp = f'{path}.{uuid.uuid4().hex}.tmp'
+        os.makedirs(path_tmp)
+        for name, array in self._arrays.items():
+            np.save(os.path.join(path_tmp, name + '.npy'), array)
+        try:
+            os.rename(path_tmp, path)
+        except OSError:
+            # Another trial saved the same dataset first
+            shutil.rmtree(path_tmp, ignore_errors=True)
+
+    @property
+    def valid_length(self):
+        return self._arrays['valid_length']
+
+    def __len__(self):
+        return len(self._arrays['valid_length'])
+
+    def __getitem__(self, idx):
+        start, end = self._arrays['offsets'][idx], self._arrays['offsets'][idx + 1]
+        sample = (np.array(self._arrays['input_ids'][start:end]),
+                  self._arrays['valid_length'][idx],
+                  np.array(self._arrays['segment_ids'][start:end]))
+        if 'label' in self._arrays:
+            sample += (np.array(self._arrays['label'][idx]),)
+        return sample
+
+    def __getstate__(self):
+        if self._path is not None:
+            return {'_arrays': None, '_path': self._path}
+        return self.__dict__
+
+    def __setstate__(self, state):
+        if state['_arrays'] is None:
+            self.__dict__ = TokenizedDataset.load(state['_path']).__dict__
+        else:
+            self.__dict__ = state
+
+
+class LazyPool(object):
+    """Pool of worker processes that is only started when `map` is first called, such as on a cache miss of
+    `get_tokenized_dataset()`. Use it as a context manager to close the pool, if it was started, on exit.
+
+    Parameters
+    ----------
+    processes : int, default None
+        Number of worker processes, defaults to the number of CPUs.
+    """
+    def __init__(self, processes=None):
+        self._processes = processes
+        self._pool = None
+
+    def map(self, func, iterable):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self._processes)
+        return self._pool.map(func, iterable)
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def get_tokenization_key(tokenizer, vocab, max_len, pad, is_pair, class_labels=None, label_alias=None):
+    """Returns a key identifying the output of `BERTDatasetTransform` created with these arguments.
+    """
+    key = hashlib.sha1()
+    key.update(type(tokenizer).__name__.encode())
+    basic_tokenizer = getattr(tokenizer, 'basic_tokenizer', tokenizer)
+    key.update(repr(getattr(basic_tokenizer, 'lower', None)).encode())
+    key.update('\n'.join(vocab.idx_to_token).encode())
+    key.update(repr((max_len, pad, is_pair, class_labels, sorted((label_alias or {}).items()))).encode())
+    return key.hexdigest()
+
+
+def get_tokenized_dataset(transform, dataset, tokenization_key, cache_dir=None, pool=None):
+    """Tokenizes `dataset` with `transform`, reusing the result cached in `cache_dir` by an earlier call
+    (for instance by another trial) with the same `tokenization_key` and dataset contents.
+
+    Parameters
+    ----------
+    transform : BERTDatasetTransform
+        The transform to apply to each line of the dataset.
+    dataset : Dataset
+        Dataset of text lines.
+    tokenization_key : str
+        Key identifying the tokenizer, vocabulary and settings of `transform`, see `get_tokenization_key()`.
+    cache_dir : str, default None
+        Local directory to cache tokenized datasets in. The dataset is not cached if None.
+    pool : multiprocessing.Pool or LazyPool, default None
+        Pool to tokenize the dataset with on a cache miss. Its `map` is not called on a cache hit.
+
+    Returns
+    -------
+    TokenizedDataset : memory-mapped from `cache_dir` if it is set.
+    """
+    cache_path = None
+    if cache_dir is not None:
+        fingerprint = hashlib.sha1(tokenization_key.encode())
+        for line in dataset:
+            fingerprint.update(repr(line).encode())
+        cache_path = os.path.join(cache_dir, fingerprint.hexdigest())
+        if os.path.isdir(cache_path):
+            logger.info(f'Loading tokenized dataset from {cache_path}')
+            return TokenizedDataset.load(cache_path)
+
+    samples = pool.map(transform, dataset) if pool is not None else [transform(line) for line in dataset]
+    tokenized_dataset = TokenizedDataset.from_samples(samples)
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        tokenized_dataset.save(cache_path)
+        tokenized_dataset = TokenizedDataset.load(cache_path)
+    return tokenized_dataset
@@ -0,0 +1,340 @@
+# Batch versions of the augmentations in augment.py, operating on uint8 NumPy arrays of shape (N, H, W, C).
+# Each operation takes the images to augment and one magnitude per image,
+# and follows the PIL implementation of augment.py.
+
+import numpy as np
+
+from .augment import get_augment, rand_augment_list
+from . import augment
+
+__all__ = ['BatchAugmentation', 'BatchRandAugment', 'batch_augment_dict']
+
+CUTOUT_COLOR = np.array([125, 123, 114], dtype=np.uint8)
+
+_grid_cache = {}
+
+
+def _get_grid(height, width):
+    """Returns the coordinates of the pixel centers of an image, shared by all affine operations on this image size."""
+    key = (height, width)
+    if key not in _grid_cache:
+        ys, xs = np.meshgrid(np.arange(height, dtype=np.float32) + 0.5, np.arange(width, dtype=np.float32) + 0.5,
+                             indexing='ij')
+        _grid_cache[key] = (xs, ys)
+    return _grid_cache[key]
+
+
+def _random_sign(n, mirror=True):
+    if not mirror:
+        return np.ones(n, dtype=np.float32)
+    return np.where(np.random.random(n) > 0.5, -1., 1.).astype(np.float32)
+
+
+def _affine(imgs, matrices, resample='bilinear'):
+    """Applies PIL.Image.AFFINE transforms, given per image as the (a, b, c, d, e, f) coefficients mapping output
+    to input pixels. Pixels sampled outside of the input image are black.
+    Bilinear resampling approximates the bicubic resampling of augment.py."""
+    n, height, width, channels = imgs.shape
+    xs, ys = _get_grid(height, width)
+    a, b, c, d, e, f = [matrices[:, i, np.newaxis, np.newaxis].astype(np.float32) for i in range(6)]
+    # Coordinates in images padded by a black border of one pixel, outside pixels are clipped onto the border
+    src_x = np.clip(a * xs + b * ys + (c + 0.5), 0, width + 1)
+    src_y = np.clip(d * xs + e * ys + (f + 0.5), 0, height + 1)
+    imgs_padded = np.zeros((n, height + 2, width + 2, channels), dtype=np.uint8)
+    imgs_padded[:, 1:-1, 1:-1] = imgs
+    pixels = imgs_padded.reshape(-1, channels)
+    # Sample all images at once from the flattened pixels with linear indices
+    row_offsets = (np.arange(n, dtype=np.int64) * (height + 2))[:, np.newaxis, np.newaxis]
+    if resample == 'nearest':
+        ix = np.minimum((src_x + 0.5).astype(np.int64), width + 1)
+        iy = np.minimum((src_y + 0.5).astype(np.int64), height + 1)
+        return np.take(pixels, (row_offsets + iy) * (width + 2) + ix, axis=0)
+    x0 = np.minimum(src_x.astype(np.int64), width)
+    y0 = np.minimum(src_y.astype(np.int64), height)
+    wx = (src_x - x0)[..., np.newaxis]
+    wy = (src_y - y0)[..., np.newaxis]
+    idx = (row_offsets + y0) * (width + 2) + x0
+    top = np.take(pixels, idx, axis=0) * (1 - wx) + np.take(pixels, idx + 1, axis=0) * wx
+    idx += width + 2
+    bottom = np.take(pixels, idx, axis=0) * (1 - wx) + np.take(pixels, idx + 1, axis=0) * wx
+    out = top * (1 - wy) + bottom * wy
+    out += 0.5
+    return np.clip(out, 0, 255).astype(np.uint8)
+
+
+def _affine_matrices(n, a=1., b=0., c=0., d=0., e=1., f=0.):
+    matrices = np.zeros((n, 6), dtype=np.float32)
+    for i, value in enumerate((a, b, c, d, e, f)):
+        matrices[:, i] = value
+    return matrices
+
+
+def ShearX(imgs, v):
+    v = v * _random_sign(len(imgs), augment.random_mirror)
+    return _affine(imgs, _affine_matrices(len(imgs), b=v))
+
+
+def ShearY(imgs, v):
+    v = v * _random_sign(len(imgs), augment.random_mirror)
+    return _affine(imgs, _affine_matrices(len(imgs), d=v))
+
+
+def TranslateX(imgs, v):
+    v = v * _random_sign(len(imgs), augment.random_mirror) * imgs.shape[2]
+    return _affine(imgs, _affine_matrices(len(imgs), c=v))
+
+
+def TranslateY(imgs, v):
+    v = v * _random_sign(len(imgs), augment.random_mirror) * imgs.shape[1]
+    return _affine(imgs, _affine_matrices(len(imgs), f=v))
+
+
+def TranslateXabs(imgs, v):
+    return _affine(imgs, _affine_matrices(len(imgs), c=v * _random_sign(len(imgs))))
+
+
+def TranslateYabs(imgs, v):
+    return _affine(imgs, _affine_matrices(len(imgs), f=v * _random_sign(len(imgs))))
+
+
+def Rotate(imgs, v):
+    # Same matrix as PIL.Image.rotate, which rotates counter clockwise around the center with nearest resampling
+    v = v * _random_sign(len(imgs), augment.random_mirror)
+    height, width = imgs.shape[1:3]
+    center_x, center_y = width / 2., height / 2.
+    angle = -np.radians(v)
+    a, b = np.cos(angle), np.sin(angle)
+    d, e = -np.sin(angle), np.cos(angle)
+    c = a * -center_x + b * -center_y + center_x
+    f = d * -center_x + e * -center_y + center_y
+    return _affine(imgs, np.stack([a, b, c, d, e, f], axis=1), resample='nearest')
+
+
+def _apply_lut(imgs, lut):
+    """Maps the pixel values of each image through its lookup table,
+    of shape (N, 256) or (N, C, 256) for one table per channel."""
+    out = np.empty_like(imgs)
+    for i in range(len(imgs)):
+        if lut.ndim == 2:
+            np.take(lut[i], imgs[i], out=out[i])
+        else:
+            for channel in range(imgs.shape[3]):
+                np.take(lut[i, channel], imgs[i, ..., channel], out=out[i, ..., channel])
+    return out
+
+
+_LEVELS = np.arange(256, dtype=np.float32)
+
+
+def AutoContrast(imgs, _):
+    # Computed in float64 as PIL.ImageOps.autocontrast, so that truncated values match exactly
+    lo = imgs.min(axis=(1, 2)).astype(np.float64)[..., np.newaxis]
+    hi = imgs.max(axis=(1, 2)).astype(np.float64)[..., np.newaxis]
+    scale = 255. / np.maximum(hi - lo, 1)
+    lut = np.where(hi > lo, np.clip(np.arange(256) * scale - lo * scale, 0, 255), _LEVELS)
+    return _apply_lut(imgs, lut.astype(np.uint8))
+
+
+def Invert(imgs, _):
+    return 255 - imgs
+
+
+def Equalize(imgs, _):
+    # Per image and channel histogram equalization with the lookup table of PIL.ImageOps.equalize
+    n, height, width, channels = imgs.shape
+    values = imgs.transpose(0, 3, 1, 2).reshape(n * channels, height * width)
+    offsets = (np.arange(n * channels) * 256)[:, np.newaxis]
+    hist = np.bincount((values + offsets).ravel(), minlength=n * channels * 256).reshape(n * channels, 256)
+    last_nonzero = 255 - np.argmax(hist[:, ::-1] > 0, axis=1)
+    step = (hist.sum(axis=1) - hist[np.arange(n * channels), last_nonzero]) // 255
+    cumsum_exclusive = np.cumsum(hist, axis=1) - hist
+    lut = (step[:, np.newaxis] // 2 + cumsum_exclusive) // np.maximum(step, 1)[:, np.newaxis]
+    lut = np.where(step[:, np.newaxis] > 0, np.minimum(lut, 255), np.arange(256))
+    return _apply_lut(imgs, lut.reshape(n, channels, 256).astype(np.uint8))
+
+
+def Flip(imgs, _):
+    return imgs[:, :, ::-1]
+
+
+def Solarize(imgs, v):
+    lut = np.where(_LEVELS < v[:, np.newaxis], _LEVELS, 255 - _LEVELS)
+    return _apply_lut(imgs, lut.astype(np.uint8))
+
+
+def SolarizeAdd(imgs, v, threshold=128):
+    lut = np.clip(_LEVELS + v.astype(np.int64)[:, np.newaxis], 0, 255)
+    lut = np.where(lut < threshold, lut, 255 - lut)
+    return _apply_lut(imgs, lut.astype(np.uint8))
+
+
+def Posterize(imgs, v):
+    bits = v.astype(np.int64)
+    mask = (~(2 ** (8 - bits) - 1) & 0xFF).astype(np.uint8)
+    return imgs & mask[:, np.newaxis, np.newaxis, np.newaxis]
+
+
+Posterize2 = Posterize
+
+
+_LUMA_WEIGHTS = np.array([299. / 1000, 587. / 1000, 114. / 1000], dtype=np.float32)
+
+
+def _grayscale(imgs):
+    # ITU-R 601-2 luma transform of PIL.Image.convert('L')
+    if imgs.shape[3] == 1:
+        return imgs[..., 0].astype(np.float32)
+    return np.dot(imgs, _LUMA_WEIGHTS)
+
+
+def _blend(degenerate, imgs, v):
+    """Blends each image with its degenerate image as PIL.ImageEnhance, in place of the float32 `imgs`."""
+    factor = v.astype(np.float32)[:, np.newaxis, np.newaxis, np.newaxis]
+    imgs -= degenerate
+    imgs *= factor
+    imgs += degenerate
+    return np.clip(imgs, 0, 255, out=imgs).astype(np.uint8)
+
+
+def Contrast(imgs, v):
+    mean = np.floor(_grayscale(imgs).mean(axis=(1, 2)) + 0.5)[:, np.newaxis]
+    lut = np.clip(mean + v.astype(np.float32)[:, np.newaxis] * (_LEVELS - mean), 0, 255)
+    return _apply_lut(imgs, lut.astype(np.uint8))
+
+
+def Color(imgs, v):
+    return _blend(_grayscale(imgs)[..., np.newaxis], imgs.astype(np.float32), v)
+
+
+def Brightness(imgs, v):
+    lut = np.clip(v.astype(np.float32)[:, np.newaxis] * _LEVELS, 0, 255)
+    return _apply_lut(imgs, lut.astype(np.uint8))
+
+
+def Sharpness(imgs, v):
+    # Smoothed image with the 3x3 SMOOTH kernel of PIL.ImageFilter, keeping the border pixels
+    imgs_float = imgs.astype(np.float32)
+    rows = imgs_float[:, :-2] + imgs_float[:, 1:-1] + imgs_float[:, 2:]
+    kernel_sum = rows[:, :, :-2] + rows[:, :, 1:-1] + rows[:, :, 2:]
+    kernel_sum += 4 * imgs_float[:, 1:-1, 1:-1]
+    degenerate = imgs_float.copy()
+    degenerate[:, 1:-1, 1:-1] = np.floor(kernel_sum / 13 + 0.5)
+    return _blend(degenerate, imgs_float, v)
+
+
+def CutoutAbs(imgs, v):
+    n, height, width = imgs.shape[:3]
+    x0 = np.maximum(0, np.random.uniform(width, size=n) - v / 2.).astype(np.int64)
+    y0 = np.maximum(0, np.random.uniform(height, size=n) - v / 2.).astype(np.int64)
+    x1 = np.minimum(width, x0 + v)
+    y1 = np.minimum(height, y0 + v)
+    # PIL.ImageDraw rectangles include their end coordinates
+    xs = np.arange(width)
+    ys = np.arange(height)
+    mask = (((ys >= y0[:, np.newaxis]) & (ys <= y1[:, np.newaxis]))[:, :, np.newaxis]
+            & ((xs >= x0[:, np.newaxis]) & (xs <= x1[:, np.newaxis]))[:, np.newaxis, :])
+    mask &= (v >= 0)[:, np.newaxis, np.newaxis]
+    imgs = imgs.copy()
+    imgs[mask] = CUTOUT_COLOR[:imgs.shape[3]]
+    return imgs
+
+
+def Cutout(imgs, v):
+    return CutoutAbs(imgs, np.where(v > 0, v * imgs.shape[2], -1))
+
+
+def TranslateXAbs(imgs, v):
+    return TranslateXabs(imgs, v)
+
+
+def TranslateYAbs(imgs, v):
+    return TranslateYabs(imgs, v)
+
+
+batch_augment_dict = {fn.__name__: fn for fn in [
+    ShearX, ShearY, TranslateX, TranslateY, TranslateXabs, TranslateYabs, TranslateXAbs, TranslateYAbs, Rotate,
+    AutoContrast, Invert, Equalize, Flip, Solarize, SolarizeAdd, Posterize, Contrast, Color, Brightness, Sharpness,
+    CutoutAbs, Cutout,
+]}
+batch_augment_dict['Posterize2'] = Posterize2
+
+
+def _to_batch(imgs):
+    imgs = np.asarray(imgs.asnumpy() if hasattr(imgs, 'asnumpy') else imgs)
+    if imgs.dtype != np.uint8:
+        raise ValueError(f'Batch augmentation expects uint8 images, got {imgs.dtype}')
+    if imgs.ndim == 3:
+        imgs = imgs[..., np.newaxis]
+    return imgs.copy()
+
+
+def _apply_ops(imgs, op_names, values, apply_mask):
+    """Applies op_names[i] with magnitude values[i] to image i where apply_mask[i], grouping images by operation."""
+    for name in np.unique(op_names[apply_mask]):
+        idx = np.flatnonzero(apply_mask & (op_names == name))
+        imgs[idx] = batch_augment_dict[name](imgs[idx], values[idx])
+    return imgs
+
+
+class BatchAugmentation(object):
+    r"""
+    Applies AutoAugment policies to a batch of uint8 images of shape (N, H, W, C) at once.
+    Each image samples its own policy and applies each of its operations with their probability,
+    as :class:`Augmentation`.
+
+    Example
+    -------
+    >>> from autogluon.utils.augment import autoaug_imagenet_policies
+    >>> from autogluon.utils.batch_augment import BatchAugmentation
+    >>> aa_transform = BatchAugmentation(autoaug_imagenet_policies())
+    >>> imgs = aa_transform(imgs)
+    """
+    def __init__(self, policies):
+        """
+        policies : list of list of (name, pr, level)
+        """
+        self.policies = policies
+
+    def __call__(self, imgs):
+        imgs = _to_batch(imgs)
+        n = len(imgs)
+        policy_idx = np.random.randint(len(self.policies), size=n)
+        for op_pos in range(max(len(policy) for policy in self.policies)):
+            op_names = np.empty(n, dtype=object)
+            values = np.zeros(n, dtype=np.float32)
+            probs = np.zeros(n, dtype=np.float32)
+            for i, policy in enumerate(self.policies):
+                if op_pos >= len(policy):
+                    continue
+                name, pr, level = policy[op_pos]
+                _, low, high = get_augment(name)
+                selected = policy_idx == i
+                op_names[selected] = name
+                values[selected] = level * (high - low) + low
+                probs[selected] = pr
+            apply_mask = (np.random.random(n) <= probs) & (op_names != None)  # noqa: E711
+            imgs = _apply_ops(imgs, op_names, values, apply_mask)
+        return imgs
+
+
+class BatchRandAugment(object):
+    """Applies RandAugment with `n` operations of magnitude `m` from `rand_augment_list()`
+    to a batch of uint8 images of shape (N, H, W, C),
+    sampling operations per image as :class:`RandAugment`.
+    """
+    def __init__(self, n, m):
+        self.n = n
+        self.m = m
+        self.augment_list = rand_augment_list()
+
+    def __call__(self, imgs):
+        imgs = _to_batch(imgs)
+        num_imgs = len(imgs)
+        op_names = np.array([op.__name__ for op, _, _ in self.augment_list], dtype=object)
+        op_values = np.array([(float(self.m) / 30) * float(maxval - minval) + minval
+                              for _, minval, maxval in self.augment_list], dtype=np.float32)
+        for _ in range(self.n):
+            op_idx = np.random.randint(len(self.augment_list), size=num_imgs)
+            apply_mask = np.random.random(num_imgs) <= np.random.uniform(0.2, 0.8, size=num_imgs)
+            imgs = _apply_ops(imgs, op_names[op_idx], op_values[op_idx], apply_mask)
+        return imgs
@@ -10,6 +10,7 @@ import multiprocessing.queues
 from multiprocessing.reduction import ForkingPickler
 from multiprocessing.pool import ThreadPool
 import threading
+import itertools
 import numpy as np
 
 try:
@@ -17,6 +18,12 @@ try:
 except ImportError:
     pass
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Python < 3.8, batches are always pickled
+    shared_memory = None
+
 from mxnet.gluon.data import sampler as _sampler
 from mxnet import nd, context
 #from mxnet.util import is_np_shape, is_np_array, set_np
@@ -32,20 +39,118 @@ def _worker_initializer(dataset, active_shape, active_array):
     _worker_dataset = dataset
     #set_np(shape=active_shape, array=active_array)
 
-def _worker_fn(samples, batchify_fn, dataset=None):
-    """Function for processing data in worker process."""
+_SHM_ALIGNMENT = 64
+_worker_shm_cache = {}
+_WORKER_SHM_CACHE_SIZE = 32
+# Generation of the shared memory ring whose blocks are attached in _worker_shm_cache of a worker process
+_worker_shm_generation = None
+# Each shared memory ring created by the main process gets a new generation
+_shm_generations = itertools.count()
+
+def _flatten_batch(batch, arrays):
+    """Replaces the arrays of a (nested) batch by their index in `arrays`,
+    returns None if the batch cannot be placed in shared memory."""
+    if isinstance(batch, np.ndarray):
+        arrays.append(batch)
+        return ('np', len(arrays) - 1)
+    if isinstance(batch, nd.NDArray):
+        # Includes arrays already in shared memory (context 'cpu_shared'), which are copied into the block as well,
+        # as pickling them allocates a new shared memory block for every batch
+        arrays.append(batch.asnumpy())
+        return ('nd', len(arrays) - 1)
+    if isinstance(batch, (list, tuple)):
+        structure = []
+        for item in batch:
+            item_structure = _flatten_batch(item, arrays)
+            if item_structure is None:
+                return None
+            structure.append(item_structure)
+        return (type(batch).__name__, structure)
+    return None
+
+def _unflatten_batch(structure, arrays):
+    """Rebuilds a batch flattened by `_flatten_batch` with copies of `arrays`."""
+    kind, value = structure
+    if kind == 'np':
+        return arrays[value].copy()
+    if kind == 'nd':
+        return nd.array(arrays[value], dtype=arrays[value].dtype)
+    items = [_unflatten_batch(item, arrays) for item in value]
+    return tuple(items) if kind == 'tuple' else items
+
+def _get_worker_shm(name, generation):
+    """Attaches to the shared memory block `name` from a worker process, keeping recently used blocks attached.
+    Blocks of previous generations are detached when the first block of a new ring is used, as the main process
+    unlinks them once the ring is released, and they would otherwise stay mapped in the worker."""
+    global _worker_shm_generation
+    if generation != _worker_shm_generation:
+        for shm in _worker_shm_cache.values():
+            shm.close()
+        _worker_shm_cache.clear()
+        _worker_shm_generation = generation
+    shm = _worker_shm_cache.get(name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            # The main process owns the block, avoid the worker's resource tracker unlinking it on exit
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+        if len(_worker_shm_cache) >= _WORKER_SHM_CACHE_SIZE:
+            _worker_shm_cache.pop(next(iter(_worker_shm_cache))).close()
+        _worker_shm_cache[name] = shm
+    return shm
+
+def _write_batch_to_shm(batch, shm_slot):
+    """Copies the arrays of a batch into the shared memory slot,
+    returns their layout or None if the batch does not fit."""
+    arrays = []
+    structure = _flatten_batch(batch, arrays)
+    if structure is None:
+        return None
+    name, size, generation = shm_slot
+    layout = []
+    offset = 0
+    for array in arrays:
+        layout.append((offset, array.shape, array.dtype.str))
+        offset += -(-array.nbytes // _SHM_ALIGNMENT) * _SHM_ALIGNMENT
+    if offset > size:
+        return None
+    shm = _get_worker_shm(name, generation)
+    for array, (array_offset, shape, dtype) in zip(arrays, layout):
+        np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=array_offset)[...] = array
+    return structure, layout
+
+def _worker_fn(samples, batchify_fn, dataset=None, shm_slot=None):
+    """Function for processing data in worker process.
+    If `shm_slot` is given as (name, size, generation) of a shared memory block, the arrays of the batch are written
+    into it and only the structure of the batch is returned, otherwise the pickled batch is returned."""
     # pylint: disable=unused-argument
     # it is required that each worker process has to fork a new MXIndexedRecordIO handle
     # preserving dataset as global variable can save tons of overhead and is safe in new process
     global _worker_dataset
+    if shm_slot is not None and batchify_fn is default_mp_batchify_fn:
+        # The batch is copied into the shared memory block, so it does not have to be allocated in shared memory
+        batchify_fn = default_batchify_fn
     batch = batchify_fn([_worker_dataset[i] for i in samples])
+    if shm_slot is not None:
+        shm_batch = _write_batch_to_shm(batch, shm_slot)
+        if shm_batch is not None:
+            return shm_batch
     buf = io.BytesIO()
     ForkingPickler(buf, pickle.HIGHEST_PROTOCOL).dump(batch)
     return buf.getvalue()
 
+def _get_batch_nbytes(batch):
+    arrays = []
+    if _flatten_batch(batch, arrays) is None:
+        return None
+    return sum(-(-array.nbytes // _SHM_ALIGNMENT) * _SHM_ALIGNMENT for array in arrays)
+
 def _thread_worker_initializer(active_shape, active_array):
     """Initializer for ThreadPool."""
-    set_np(shape=active_shape, array=active_array)
+    #set_np(shape=active_shape, array=active_array)
 
 def _thread_worker_fn(samples, batchify_fn, dataset):
     """Threadpool worker function for processing data."""
@@ -71,6 +176,14 @@ class _MultiWorkerIter(object):
         self._timeout = timeout
         self._sample_times = sample_times
         self._iters = 0
+        # Ring of shared memory blocks that worker processes write batches into,
+        # created from the size of the first batch
+        self._use_shm = shared_memory is not None and dataset is None and worker_fn is _worker_fn
+        self._shm_ring = None
+        self._shm_generation = None
+        self._shm_free = []
+        self._shm_in_use = {}
+        self._num_shm_slots = max(prefetch, 1) + 1
         self._push_next()
         # pre-fetch
         if prefetch > 1:
@@ -88,8 +201,14 @@ class _MultiWorkerIter(object):
         r = next(self._iter, None)
         if r is None:
             return
-        async_ret = self._worker_pool.apply_async(
-            self._worker_fn, (r, self._batchify_fn, self._dataset))
+        if self._shm_free:
+            shm = self._shm_free.pop()
+            self._shm_in_use[self._sent_idx] = shm
+            async_ret = self._worker_pool.apply_async(
+                self._worker_fn, (r, self._batchify_fn, self._dataset, (shm.name, shm.size, self._shm_generation)))
+        else:
+            async_ret = self._worker_pool.apply_async(
+                self._worker_fn, (r, self._batchify_fn, self._dataset))
         self._data_buffer[self._sent_idx] = async_ret
         self._sent_idx += 1
 
@@ -99,6 +218,7 @@ class _MultiWorkerIter(object):
             self._push_next()
         if self._rcvd_idx == self._sent_idx:
             assert not self._data_buffer, "Data buffer should be empty at this moment"
+            self._release_shm_ring()
             raise StopIteration
 
         assert self._rcvd_idx < self._sent_idx, "rcvd_idx must be smaller than sent_idx"
@@ -106,7 +226,16 @@ class _MultiWorkerIter(object):
         ret = self._data_buffer.pop(self._rcvd_idx)
         try:
             if self._dataset is None:
-                batch = pickle.loads(ret.get(self._timeout))
+                batch = ret.get(self._timeout)
+                shm = self._shm_in_use.pop(self._rcvd_idx, None)
+                if isinstance(batch, bytes):
+                    batch = pickle.loads(batch)
+                    if self._use_shm and self._shm_ring is None:
+                        self._create_shm_ring(batch)
+                else:
+                    batch = self._read_batch_from_shm(batch, shm)
+                if shm is not None:
+                    self._shm_free.append(shm)
             else:
                 batch = ret.get(self._timeout)
             if self._pin_memory:
@@ -128,6 +257,42 @@ class _MultiWorkerIter(object):
             self._worker_pool.terminate()
             raise
 
+    def _create_shm_ring(self, batch):
+        """Allocates the shared memory blocks, sized with some headroom for batches larger than `batch`."""
+        nbytes = _get_batch_nbytes(batch)
+        self._use_shm = False
+        if not nbytes:
+            return
+        size = int(nbytes * 1.25) + _SHM_ALIGNMENT
+        self._shm_ring = [shared_memory.SharedMemory(create=True, size=size) for _ in range(self._num_shm_slots)]
+        self._shm_generation = next(_shm_generations)
+        self._shm_free = list(self._shm_ring)
+
+    @staticmethod
+    def _read_batch_from_shm(shm_batch, shm):
+        """Copies the arrays of a batch out of its shared memory block,
+        so that the block can be reused by the next batches."""
+        structure, layout = shm_batch
+        arrays = [np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+                  for offset, shape, dtype in layout]
+        return _unflatten_batch(structure, arrays)
+
+    def _release_shm_ring(self):
+        if self._shm_ring is None:
+            return
+        for shm in self._shm_ring:
+            try:
+                shm.close()
+                shm.unlink()
+            except (FileNotFoundError, BufferError):
+                pass
+        self._shm_ring = None
+        self._shm_free = []
+        self._shm_in_use = {}
+
+    def __del__(self):
+        self._release_shm_ring()
+
     def next(self):
         return self.__next__()
 
@@ -171,6 +336,11 @@ class DataLoader(object):
                     return nd.array(data, dtype=data.dtype)
     num_workers : int, default 0
         The number of multiprocessing workers to use for data preprocessing.
+        On Python 3.8+, multiprocessing workers write the arrays of each batch (NumPy arrays and NDArrays, possibly
+        nested in lists and tuples) into a ring of shared memory blocks that is reused across batches, instead of
+        pickling them. This includes the shared memory NDArrays returned by `default_mp_batchify_fn`, the default
+        `batchify_fn` with workers, which are returned as regular CPU NDArrays. Batches of other types, and batches
+        larger than the blocks, which are sized from the first batch, are pickled.
     pin_memory : boolean, default False
         If ``True``, the dataloader will copy NDArrays into pinned memory
         before returning them. Copying from CPU pinned memory to GPU is faster
@@ -1,8 +1,11 @@
 import copy
 import logging
 import math
+import multiprocessing
+import pickle
 import re
 from collections import defaultdict
+from multiprocessing.pool import MaybeEncodingError
 
 import numpy as np
 import pandas as pd
@@ -12,6 +15,7 @@ from pandas.api.types import CategoricalDtype
 
 from .feature_types_metadata import FeatureTypesMetadata
 from .utils import get_type_family, get_type_groups_df, get_type_family_groups_df
+from ..utils import multiprocessing_utils
 from ..utils.decorators import calculate_time
 from ..utils.savers import save_pkl
 
@@ -41,6 +45,10 @@ class AbstractFeatureGenerator:
 
         self.minimize_categorical_memory_usage_flag = True
 
+        self.n_jobs = -1  # Number of worker processes used to transform independent column groups in parallel. -1 uses all cores, 1 transforms serially.
+        self.parallel_min_rows = 20000  # Column groups are only transformed in parallel if the data has at least this many rows, as starting the worker pool has a fixed cost.
+        self._pool = None  # Worker pool shared by the column groups of a single fit_transform() or transform() call, never saved
+
         self.pre_memory_usage = None
         self.pre_memory_usage_per_row = None
         self.post_memory_usage = None
@@ -96,7 +104,10 @@ class AbstractFeatureGenerator:
         self.feature_type_family_init_raw = get_type_groups_df(X)
 
         X.reset_index(drop=True, inplace=True)
-        X_features = self.generate_features(X)
+        try:
+            X_features = self.generate_features(X)
+        finally:
+            self._close_pool()
         for column in X_features:
             unique_value_count = len(X_features[column].unique())
             if unique_value_count == 1:
@@ -188,7 +199,10 @@ class AbstractFeatureGenerator:
 
         X = X.astype(self.features_init_types)
         X.reset_index(drop=True, inplace=True)
-        X_features = self.generate_features(X)
+        try:
+            X_features = self.generate_features(X)
+        finally:
+            self._close_pool()
         for column in self.features_binned:
             X_features[column] = self.bin_column(series=X_features[column], mapping=self.features_binned_mapping[column])
         if self.is_dummy:
@@ -379,25 +393,26 @@ class AbstractFeatureGenerator:
         # print(avg_words)
         return avg_words >= 3
 
-    def generate_text_features(self, X: Series, feature: str) -> DataFrame:
+    @classmethod
+    def generate_text_features(cls, X: Series, feature: str) -> DataFrame:
         X: DataFrame = X.to_frame(name=feature)
-        X[f'{feature}.char_count'] = [self.char_count(value) for value in X[feature]]
-        X[f'{feature}.word_count'] = [self.word_count(value) for value in X[feature]]
+        X[f'{feature}.char_count'] = [cls.char_count(value) for value in X[feature]]
+        X[f'{feature}.word_count'] = [cls.word_count(value) for value in X[feature]]
         X[f'{feature}.capital_ratio'] = [
-            self.capital_ratio(value) for value in X[feature]
+            cls.capital_ratio(value) for value in X[feature]
         ]
 
-        X[f'{feature}.lower_ratio'] = [self.lower_ratio(value) for value in X[feature]]
-        X[f'{feature}.digit_ratio'] = [self.digit_ratio(value) for value in X[feature]]
+        X[f'{feature}.lower_ratio'] = [cls.lower_ratio(value) for value in X[feature]]
+        X[f'{feature}.digit_ratio'] = [cls.digit_ratio(value) for value in X[feature]]
         X[f'{feature}.special_ratio'] = [
-            self.special_ratio(value) for value in X[feature]
+            cls.special_ratio(value) for value in X[feature]
         ]
 
 
         symbols = ['!', '?', '@', '%', '$', '*', '&', '#', '^', '.', ':', ' ', '/', ';', '-', '=']
         for symbol in symbols:
             X[f'{feature}.symbol_count.' + symbol] = [
-                self.symbol_in_string_count(value, symbol) for value in X[feature]
+                cls.symbol_in_string_count(value, symbol) for value in X[feature]
             ]
 
             X[f'{feature}.symbol_ratio.' + symbol] = (
@@ -410,6 +425,45 @@ class AbstractFeatureGenerator:
 
         return X
 
+    # Applies transformer to each element of chunks, using a pool of worker processes if the data is large enough
+    # to benefit. The pool is started on first use and reused by all column groups of the current fit_transform()
+    # or transform() call.
+    # Output order always matches the order of chunks, so the resulting column order is deterministic.
+    def transform_column_groups(self, transformer, chunks: list, num_rows: int) -> list:
+        workers_count = self._get_workers_count(num_chunks=len(chunks))
+        if workers_count <= 1 or num_rows < getattr(self, 'parallel_min_rows', 20000):
+            return [transformer(chunk) for chunk in chunks]
+        logger.log(15, f'Transforming {len(chunks)} column groups in parallel with {workers_count} workers...')
+        try:
+            if getattr(self, '_pool', None) is None:
+                self._pool = multiprocessing_utils.get_pool(workers_count=self._get_workers_count())
+            return multiprocessing_utils.execute_multiprocessing(workers_count=workers_count, transformer=transformer,
+                                                                 chunks=chunks, pool=self._pool)
+        except (pickle.PicklingError, MaybeEncodingError, OSError) as err:
+            # Only failures to start the pool or to send chunks and results between processes fall back to the serial
+            # transform, exceptions raised by the transformer itself are re-raised by the pool
+            logger.warning(f'Warning: Parallel transform of column groups failed, falling back to serial transform... '
+                           f'Error: {err}')
+            self._close_pool()
+            return [transformer(chunk) for chunk in chunks]
+
+    def _get_workers_count(self, num_chunks: int = None) -> int:
+        n_jobs = getattr(self, 'n_jobs', 1)  # Generators saved before n_jobs was added transform serially
+        if n_jobs is None or n_jobs < 0:
+            workers_count = multiprocessing.cpu_count()
+        else:
+            workers_count = n_jobs
+        if num_chunks is not None:
+            workers_count = min(workers_count, num_chunks)
+        return workers_count
+
+    def _close_pool(self):
+        pool = getattr(self, '_pool', None)
+        if pool is not None:
+            pool.close()
+            pool.join()
+        self._pool = None
+
     def minimize_memory_usage(self, X_features):
         if self.minimize_categorical_memory_usage_flag:
             X_features = self.minimize_categorical_memory_usage(X_features=X_features)
@@ -490,18 +544,28 @@ class AbstractFeatureGenerator:
     def symbol_in_string_count(string, character):
         return sum(c == character for c in string) if string else 0
 
-    # TODO: optimize by not considering columns with unique sums/means
+    # Removes columns whose values are identical to the values of an earlier column.
+    # Each column is hashed once, and only columns with identical hashes are compared value by value, avoiding the transpose of X.
     # TODO: Multithread?
     @staticmethod
     def drop_duplicate_features(X):
-        X_without_dups = X.T.drop_duplicates().T
-        logger.debug(f"X_without_dups.shape: {X_without_dups.shape}")
-
-        columns_orig = X.columns.values
-        columns_new = X_without_dups.columns.values
-        columns_removed = [column for column in columns_orig if column not in columns_new]
-
-        del X_without_dups
+        column_hashes = AbstractFeatureGenerator.get_column_hashes(X)
+        columns_by_hash = defaultdict(list)
+        for column in X.columns:
+            columns_by_hash[column_hashes[column]].append(column)
+
+        columns_removed = set()
+        for hash_columns in columns_by_hash.values():
+            columns_unique = []
+            for column in hash_columns:
+                if any(AbstractFeatureGenerator.is_equal_column(X[column], X[column_unique]) for column_unique in columns_unique):
+                    columns_removed.add(column)
+                else:
+                    columns_unique.append(column)
+
+        columns_new = [column for column in X.columns if column not in columns_removed]
+        columns_removed = [column for column in X.columns if column in columns_removed]
+        logger.debug(f"X_without_dups.shape: {(len(X), len(columns_new))}")
 
         logger.log(15, 'Warning: duplicate columns removed ')
         logger.log(15, columns_removed)
@@ -509,5 +573,59 @@ class AbstractFeatureGenerator:
 
         return X[columns_new]
 
+    # Returns a dictionary of column name -> uint64 hash of the column's values, order dependent and consistent across dtypes for numeric values.
+    # Numeric columns are hashed together in blocks as float64, categorical columns hash their categories and look up the hashes by code.
+    # Missing values (NaN, None, NaT) all hash to the hash of a float NaN, as they are equal when comparing columns.
+    @staticmethod
+    def get_column_hashes(X, max_block_size=2**24):
+        num_rows = len(X)
+        row_multipliers = np.arange(1, 2 * num_rows, 2, dtype=np.uint64)  # Odd multipliers so that reordered rows change the hash
+        nan_hash = pd.util.hash_array(np.array([np.nan]))[0]
+        column_hashes = dict()
+        numeric_columns = [column for column in X.columns if pd.api.types.is_numeric_dtype(X[column].dtype)]
+        block_num_columns = max(1, max_block_size // max(1, num_rows))
+        for i in range(0, len(numeric_columns), block_num_columns):
+            block_columns = numeric_columns[i:i + block_num_columns]
+            block_values = X[block_columns].to_numpy(dtype=np.float64).T + 0.0  # Adding 0.0 normalizes -0.0 to 0.0
+            block_hashes = pd.util.hash_array(block_values.ravel()).reshape(block_values.shape)
+            for column, hashes in zip(block_columns, block_hashes):
+                column_hashes[column] = int((hashes * row_multipliers).sum())
+        for column in X.columns:
+            if column in column_hashes:
+                continue
+            series = X[column]
+            if isinstance(series.dtype, CategoricalDtype):
+                categories = series.cat.categories
+                # Code -1 (missing value) indexes the appended NaN hash
+                category_hashes = np.append(AbstractFeatureGenerator._hash_values(categories.to_numpy()), nan_hash)
+                hashes = category_hashes[series.cat.codes.to_numpy()]
+            else:
+                values = series.to_numpy()
+                hashes = AbstractFeatureGenerator._hash_values(values)
+                hashes[pd.isnull(values)] = nan_hash
+            column_hashes[column] = int((hashes * row_multipliers).sum())
+        return column_hashes
+
+    # Hashes values as float64 if they are all numbers (ignoring missing values), so that numbers stored as objects hash as in numeric columns
+    @staticmethod
+    def _hash_values(values: np.ndarray) -> np.ndarray:
+        if values.dtype == object and pd.api.types.infer_dtype(values, skipna=True) in ['integer', 'floating', 'mixed-integer-float', 'boolean']:
+            values = np.where(pd.isnull(values), np.nan, values).astype(np.float64)
+        if pd.api.types.is_numeric_dtype(values.dtype):
+            return pd.util.hash_array(values.astype(np.float64) + 0.0)
+        return pd.util.hash_array(values)
+
+    # Returns True if the two Series have identical values in each row, treating missing values as equal
+    @staticmethod
+    def is_equal_column(series_a, series_b):
+        values_a = np.asarray(series_a, dtype=object)
+        values_b = np.asarray(series_b, dtype=object)
+        is_null = pd.isnull(values_a)
+        if not np.array_equal(is_null, pd.isnull(values_b)):
+            return False
+        # Only non-missing values are compared, as comparisons with the pd.NA of nullable dtypes are ambiguous
+        is_valid = ~is_null
+        return bool(np.all(values_a[is_valid] == values_b[is_valid]))
+
     def save_self(self, path):
         save_pkl.save(path=path, object=self)
@@ -58,7 +58,6 @@ class AutoMLFeatureGenerator(AbstractFeatureGenerator):
                 if type_family not in ['object', 'text', 'datetime']:
                     self.feature_transformations['raw'] += self.feature_type_family[type_family]
 
-    # TODO: Parallelize with decorator!
     def generate_features(self, X: DataFrame):
         if not self.fit:
             self._compute_feature_transformations()
@@ -71,9 +70,8 @@ class AutoMLFeatureGenerator(AbstractFeatureGenerator):
 
         X_text_features_combined = []
         if self.feature_transformations['text_special']:
-            for nlp_feature in self.feature_transformations['text_special']:
-                X_text_features = self.generate_text_features(X[nlp_feature], nlp_feature)
-                X_text_features_combined.append(X_text_features)
+            chunks = [(type(self), X[nlp_feature], nlp_feature) for nlp_feature in self.feature_transformations['text_special']]
+            X_text_features_combined = self.transform_column_groups(transformer=_generate_text_features, chunks=chunks, num_rows=len(X))
             X_text_features_combined = pd.concat(X_text_features_combined, axis=1)
 
         X = self.preprocess(X)
@@ -97,9 +95,10 @@ class AutoMLFeatureGenerator(AbstractFeatureGenerator):
             X_features = X_features.join(X_text_features_combined)
 
         if self.feature_transformations['datetime']:
-            for datetime_feature in self.feature_transformations['datetime']:
-                X_features[datetime_feature] = pd.to_datetime(X[datetime_feature])
-                X_features[datetime_feature] = pd.to_numeric(X_features[datetime_feature])  # TODO: Use actual date info
+            chunks = [X[datetime_feature] for datetime_feature in self.feature_transformations['datetime']]
+            X_datetime_features = self.transform_column_groups(transformer=_generate_datetime_feature, chunks=chunks, num_rows=len(X))
+            for datetime_feature, X_datetime_feature in zip(self.feature_transformations['datetime'], X_datetime_features):
+                X_features[datetime_feature] = X_datetime_feature
                 self.feature_type_family_generated['datetime'].append(datetime_feature)
                 # TODO: Add fastai date features
 
@@ -234,3 +233,13 @@ class AutoMLFeatureGenerator(AbstractFeatureGenerator):
             X_nlp_features_combined = pd.concat(X_nlp_features_combined, axis=1)
 
         return X_nlp_features_combined
+
+
+# Module level functions so that they can be sent to worker processes in AbstractFeatureGenerator.transform_column_groups()
+def _generate_text_features(chunk):
+    feature_generator_cls, X, feature = chunk
+    return feature_generator_cls.generate_text_features(X, feature)
+
+
+def _generate_datetime_feature(X: pd.Series) -> pd.Series:
+    return pd.to_numeric(pd.to_datetime(X))  # TODO: Use actual date info
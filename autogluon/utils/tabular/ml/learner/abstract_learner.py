@@ -15,12 +15,15 @@ from sklearn.metrics import accuracy_score, balanced_accuracy_score, matthews_co
 from sklearn.metrics import mean_absolute_error, explained_variance_score, r2_score, mean_squared_error, median_absolute_error  # , max_error
 
 from ..constants import BINARY, MULTICLASS, REGRESSION
+from .inference_artifact import InferenceArtifact
 from ..trainer.abstract_trainer import AbstractTrainer
-from ..tuning.ensemble_selection import EnsembleSelection
+from ..tuning.post_hoc_ensemble import PostHocEnsembler
 from ..utils import get_pred_from_proba, get_leaderboard_pareto_frontier, infer_problem_type, augment_rare_classes
 from ...data.label_cleaner import LabelCleaner, LabelCleanerMulticlassToBinary
 from ...features.abstract_feature_generator import AbstractFeatureGenerator
+from ...utils import s3_utils
 from ...utils.loaders import load_pkl, load_pd
+from ...utils.profiler import profile
 from ...utils.savers import save_pkl, save_pd, save_json
 
 logger = logging.getLogger(__name__)
@@ -63,6 +66,7 @@ class AbstractLearner:
         self.time_fit_preprocessing = None
         self.time_fit_training = None
         self.time_limit = None
+        self.early_exit_info = None  # Models skipped in the last prediction with early_exit_tol, see AbstractTrainer
 
         try:
             from .....version import __version__
@@ -90,9 +94,13 @@ class AbstractLearner:
         raise NotImplementedError
 
     # TODO: Add pred_proba_cache functionality as in predict()
-    def predict_proba(self, X: DataFrame, model=None, as_pandas=False, as_multiclass=False, inverse_transform=True):
+    def predict_proba(self, X: DataFrame, model=None, as_pandas=False, as_multiclass=False, inverse_transform=True,
+                      early_exit_tol=None):
         X = self.transform_features(X)
-        y_pred_proba = self.load_trainer().predict_proba(X, model=model)
+        trainer = self.load_trainer()
+        y_pred_proba = trainer.predict_proba(X, model=model, early_exit_tol=early_exit_tol)
+        if early_exit_tol is not None:
+            self.early_exit_info = trainer.early_exit_info
         if inverse_transform:
             y_pred_proba = self.label_cleaner.inverse_transform_proba(y_pred_proba)
         if as_multiclass and (self.problem_type == BINARY):
@@ -107,7 +115,8 @@ class AbstractLearner:
     # TODO: Add decorators for cache functionality, return core code to previous state
     # use_pred_cache to check for a cached prediction of rows, can dramatically speedup repeated runs
     # add_to_pred_cache will update pred_cache with new predictions
-    def predict(self, X: DataFrame, model=None, as_pandas=False, use_pred_cache=False, add_to_pred_cache=False):
+    def predict(self, X: DataFrame, model=None, as_pandas=False, use_pred_cache=False, add_to_pred_cache=False,
+                early_exit_tol=None):
         pred_cache = None
         if use_pred_cache or add_to_pred_cache:
             try:
@@ -126,7 +135,8 @@ class AbstractLearner:
             X_cache_miss = X
 
         if len(X_cache_miss) > 0:
-            y_pred_proba = self.predict_proba(X=X_cache_miss, model=model, inverse_transform=False)
+            y_pred_proba = self.predict_proba(X=X_cache_miss, model=model, inverse_transform=False,
+                                              early_exit_tol=early_exit_tol)
             problem_type = self.trainer_problem_type or self.problem_type
             y_pred = get_pred_from_proba(y_pred_proba=y_pred_proba, problem_type=problem_type)
             y_pred = self.label_cleaner.inverse_transform(pd.Series(y_pred))
@@ -155,6 +165,33 @@ class AbstractLearner:
             y_pred = pd.Series(data=y_pred, name=self.label)
         return y_pred
 
+    # Streams the data at path through the feature generator and models in chunks of chunksize rows, appending the
+    # predictions of each chunk to output_path as csv.
+    # Peak memory usage is bounded by chunksize rather than the size of the data. Returns the number of rows predicted.
+    def predict_chunked(self, path, output_path, chunksize=100000, model=None, proba=False, as_multiclass=False,
+                        load_kwargs=None):
+        if load_kwargs is None:
+            load_kwargs = dict()
+        if s3_utils.is_s3_url(output_path):
+            raise ValueError(f'output_path must be a local file path for chunked prediction, but was: {output_path}')
+        output_dir = os.path.dirname(output_path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        num_rows = 0
+        with open(output_path, 'w') as f:
+            for i, X in enumerate(load_pd.load_chunks(path=path, chunksize=chunksize, **load_kwargs)):
+                if proba:
+                    y_pred = self.predict_proba(X=X, model=model, as_pandas=True, as_multiclass=as_multiclass)
+                else:
+                    y_pred = self.predict(X=X, model=model, as_pandas=True)
+                if isinstance(y_pred, Series):
+                    y_pred = y_pred.to_frame()
+                y_pred.to_csv(f, header=(i == 0), index=False)
+                num_rows += len(X)
+                logger.log(15, f'Predicted chunk {i} | Total rows predicted = {num_rows}')
+        logger.log(20, f'Saved predictions for {num_rows} rows to: {output_path}')
+        return num_rows
+
     def get_inputs_to_stacker(self, dataset=None, model=None, base_models: list = None, use_orig_features=True):
         if model is not None and base_models is not None:
             raise AssertionError('Only one of `model`, `base_models` is allowed to be set.')
@@ -208,13 +245,15 @@ class AbstractLearner:
         return trainer.refit_ensemble_full(model=model)
 
     def fit_transform_features(self, X, y=None):
-        for feature_generator in self.feature_generators:
-            X = feature_generator.fit_transform(X, y)
+        with profile('feature_generation'):
+            for feature_generator in self.feature_generators:
+                X = feature_generator.fit_transform(X, y)
         return X
 
     def transform_features(self, X):
-        for feature_generator in self.feature_generators:
-            X = feature_generator.transform(X)
+        with profile('feature_generation'):
+            for feature_generator in self.feature_generators:
+                X = feature_generator.transform(X)
         return X
 
     def score(self, X: DataFrame, y=None, model=None):
@@ -231,7 +270,8 @@ class AbstractLearner:
         return trainer.score(X=X, y=y, model=model)
 
     # Scores both learner and all individual models, along with computing the optimal ensemble score + weights (oracle)
-    def score_debug(self, X: DataFrame, y=None, compute_oracle=False, silent=False):
+    # Returns the transformed features and internal labels of holdout data, along with the loaded trainer
+    def _transform_holdout(self, X: DataFrame, y=None):
         if y is None:
             X, y = self.extract_label(X)
         X = self.transform_features(X)
@@ -242,25 +282,52 @@ class AbstractLearner:
             if (not trainer.eval_metric_expects_y_pred) and (-1 in y.unique()):
                 # log_loss / pac_score
                 raise ValueError(f'Multiclass scoring with eval_metric=\'{self.eval_metric.name}\' does not support unknown classes.')
+        return X, y, trainer
+
+    # Predicts once with models (all models that can infer if None) on the holdout data
+    # and returns a PostHocEnsembler holding the predictions, to fit weighted ensembles over them
+    # with different metrics, model subsets and ensemble sizes without predicting again.
+    def get_post_hoc_ensembler(self, X: DataFrame, y=None, models=None):
+        X, y, trainer = self._transform_holdout(X=X, y=y)
+        if models is None:
+            models = trainer.get_model_names_all(can_infer=True)
+        model_pred_proba_dict, pred_time_marginal = trainer.get_model_pred_proba_dict(X=X, models=models, fit=False,
+                                                                                      record_pred_time=True)
+        return PostHocEnsembler(
+            model_pred_proba_dict=model_pred_proba_dict,
+            labels=y,
+            problem_type=trainer.problem_type,
+            eval_metric=self.eval_metric,
+            trainer=trainer,
+            pred_time_marginal=pred_time_marginal,
+        )
+
+    def score_debug(self, X: DataFrame, y=None, compute_oracle=False, silent=False):
+        X, y, trainer = self._transform_holdout(X=X, y=y)
 
         scores = {}
         all_trained_models = trainer.get_model_names_all()
         all_trained_models_can_infer = trainer.get_model_names_all(can_infer=True)
-        all_trained_models_original = all_trained_models.copy()
         model_pred_proba_dict, pred_time_test_marginal = trainer.get_model_pred_proba_dict(X=X, models=all_trained_models_can_infer, fit=False, record_pred_time=True)
 
+        model_graph = trainer.model_graph
         if compute_oracle:
-            pred_probas = list(model_pred_proba_dict.values())
-            ensemble_selection = EnsembleSelection(ensemble_size=100, problem_type=trainer.problem_type, metric=self.eval_metric)
-            ensemble_selection.fit(predictions=pred_probas, labels=y, identifiers=None)
-            oracle_weights = ensemble_selection.weights_
+            post_hoc_ensembler = PostHocEnsembler(
+                model_pred_proba_dict=model_pred_proba_dict,
+                labels=y,
+                problem_type=trainer.problem_type,
+                eval_metric=self.eval_metric,
+                trainer=trainer,
+            )
+            oracle_weights = post_hoc_ensembler.fit(ensemble_size=100, name='oracle_ensemble')['weights']
             oracle_pred_time_start = time.time()
-            oracle_pred_proba_norm = [pred * weight for pred, weight in zip(pred_probas, oracle_weights)]
-            oracle_pred_proba_ensemble = np.sum(oracle_pred_proba_norm, axis=0)
+            oracle_pred_proba_ensemble = post_hoc_ensembler.predict_proba(oracle_weights)
             oracle_pred_time = time.time() - oracle_pred_time_start
             model_pred_proba_dict['oracle_ensemble'] = oracle_pred_proba_ensemble
             pred_time_test_marginal['oracle_ensemble'] = oracle_pred_time
             all_trained_models.append('oracle_ensemble')
+            # The oracle ensemble depends on the models with non-zero weight, add it to a copy of the model graph to compute its full prediction time
+            model_graph = post_hoc_ensembler.get_model_graph(oracle_weights, name='oracle_ensemble')
 
         for model_name, pred_proba in model_pred_proba_dict.items():
             if (trainer.problem_type == BINARY) and (self.problem_type == MULTICLASS):
@@ -271,24 +338,12 @@ class AbstractLearner:
             else:
                 scores[model_name] = self.eval_metric(y, pred_proba)
 
-        pred_time_test = {}
-        # TODO: Add support for calculating pred_time_test_full for oracle_ensemble, need to copy graph from trainer and add oracle_ensemble to it with proper edges.
-        for model in model_pred_proba_dict.keys():
-            if model in all_trained_models_original:
-                base_model_set = trainer.get_minimum_model_set(model)
-                if len(base_model_set) == 1:
-                    pred_time_test[model] = pred_time_test_marginal[base_model_set[0]]
-                else:
-                    pred_time_test_full_num = sum(
-                        pred_time_test_marginal[base_model]
-                        for base_model in base_model_set
-                    )
-
-                    pred_time_test[model] = pred_time_test_full_num
-            else:
-                pred_time_test[model] = None
+        # The model sets of the trained models are the same in model_graph, so they are also reused for the validation leaderboard below
+        model_set_dict = trainer.get_model_set_dict(model_graph=model_graph)
+        pred_time_test_full_dict = trainer.get_model_attribute_full_dict(attribute='predict_time', attribute_dict=pred_time_test_marginal, model_graph=model_graph, model_set_dict=model_set_dict)
+        pred_time_test = {model: pred_time_test_full_dict[model] for model in model_pred_proba_dict.keys()}
 
-        scored_models = list(scores.keys())
+        scored_models = set(scores.keys())
         for model in all_trained_models:
             if model not in scored_models:
                 scores[model] = None
@@ -309,7 +364,10 @@ class AbstractLearner:
 
         df = df.sort_values(by=['score_test', 'pred_time_test'], ascending=[False, True]).reset_index(drop=True)
 
-        leaderboard_df = self.leaderboard(silent=silent)
+        leaderboard_df = trainer.leaderboard(model_set_dict=model_set_dict)
+        if not silent:
+            with pd.option_context('display.max_rows', None, 'display.max_columns', None, 'display.width', 1000):
+                print(leaderboard_df)
 
         df_merged = pd.merge(df, leaderboard_df, on='model', how='left')
         df_columns_lst = df_merged.columns.tolist()
@@ -565,7 +623,27 @@ class AbstractLearner:
         return infer_problem_type(y=y)
 
     def save(self):
-        save_pkl.save(path=self.save_path, object=self)
+        with profile('save_learner'):
+            save_pkl.save(path=self.save_path, object=self)
+
+    # Saves a single file to path containing only what is required to predict with model, see InferenceArtifact.
+    def export_inference_artifact(self, path, model=None):
+        trainer = self.load_trainer()
+        if model is None:
+            model = trainer.model_best if trainer.model_best is not None else trainer.get_model_best()
+        models = trainer.get_inference_models(model)
+        artifact = InferenceArtifact(
+            label=self.label,
+            problem_type=self.problem_type,
+            trainer_problem_type=self.trainer_problem_type,
+            feature_generators=self.feature_generators,
+            label_cleaner=self.label_cleaner,
+            model_name=models[-1].name,
+            models=models,
+            version=self.version,
+        )
+        artifact.save(path=path)
+        return artifact
 
     # reset_paths=True if the learner files have changed location since fitting.
     # TODO: Potentially set reset_paths=False inside load function if it is the same path to avoid re-computing paths on all models
@@ -596,7 +674,8 @@ class AbstractLearner:
         if self.is_trainer_present:
             return self.trainer
         else:
-            return self.trainer_type.load(path=self.trainer_path, reset_paths=self.reset_paths)
+            with profile('load_trainer'):
+                return self.trainer_type.load(path=self.trainer_path, reset_paths=self.reset_paths)
 
     # TODO: Add to predictor
     # TODO: Make this safe in large ensemble situations that would result in OOM
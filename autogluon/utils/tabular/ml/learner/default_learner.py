@@ -13,6 +13,7 @@ from ..trainer.auto_trainer import AutoTrainer
 from ..utils import augment_rare_classes
 from ...data.cleaner import Cleaner
 from ...data.label_cleaner import LabelCleaner
+from ...utils.profiler import profile
 
 logger = logging.getLogger(__name__)
 
@@ -30,7 +31,8 @@ class DefaultLearner(AbstractLearner):
     # TODO: Add trainer_kwargs to simplify parameter count and extensibility
     def fit(self, X: DataFrame, X_val: DataFrame = None, scheduler_options=None, hyperparameter_tune=True,
             feature_prune=False, holdout_frac=0.1, num_bagging_folds=0, num_bagging_sets=1, stack_ensemble_levels=0,
-            hyperparameters=None, ag_args_fit=None, excluded_model_types=None, time_limit=None, save_data=False, save_bagged_folds=True, verbosity=2):
+            hyperparameters=None, ag_args_fit=None, excluded_model_types=None, time_limit=None, save_data=False,
+            save_bagged_folds=True, max_models_concurrent=1, verbosity=2):
         """ Arguments:
                 X (DataFrame): training data
                 X_val (DataFrame): data used for hyperparameter tuning. Note: final model may be trained using this data as well as training data
@@ -45,6 +47,8 @@ class DefaultLearner(AbstractLearner):
                     Default is 0 (disabled). Use values between 1-3 to improve model quality.
                     Ignored unless kfolds is also set >= 2
                 hyperparameters (dict): keys = hyperparameters + search-spaces for each type of model we should train.
+                max_models_concurrent (int): maximum number of models of a stack level to train at the same time
+                    (1: train models one after another)
         """
         if hyperparameters is None:
             hyperparameters = {'NN': {}, 'GBM': {}}
@@ -64,7 +68,9 @@ class DefaultLearner(AbstractLearner):
             logger.log(20, f'Tuning Data Columns: {len(X_val.columns)}')
         time_preprocessing_start = time.time()
         logger.log(20, 'Preprocessing data ...')
-        X, y, X_val, y_val, holdout_frac, num_bagging_folds = self.general_data_processing(X, X_val, holdout_frac, num_bagging_folds)
+        with profile('data_processing'):
+            X, y, X_val, y_val, holdout_frac, num_bagging_folds = self.general_data_processing(
+                X, X_val, holdout_frac, num_bagging_folds)
         time_preprocessing_end = time.time()
         self.time_fit_preprocessing = time_preprocessing_end - time_preprocessing_start
         logger.log(20, f'\tData preprocessing and feature engineering runtime = {round(self.time_fit_preprocessing, 2)}s ...')
@@ -89,6 +95,7 @@ class DefaultLearner(AbstractLearner):
             save_data=save_data,
             save_bagged_folds=save_bagged_folds,
             random_seed=self.random_seed,
+            max_models_concurrent=max_models_concurrent,
             verbosity=verbosity
         )
 
@@ -99,8 +106,10 @@ class DefaultLearner(AbstractLearner):
             self.stopping_metric = trainer.stopping_metric
 
         self.save()
-        trainer.train(X, y, X_val, y_val, hyperparameter_tune=hyperparameter_tune, feature_prune=feature_prune, holdout_frac=holdout_frac,
-                      hyperparameters=hyperparameters, ag_args_fit=ag_args_fit, excluded_model_types=excluded_model_types)
+        with profile('train'):
+            trainer.train(X, y, X_val, y_val, hyperparameter_tune=hyperparameter_tune, feature_prune=feature_prune,
+                          holdout_frac=holdout_frac, hyperparameters=hyperparameters, ag_args_fit=ag_args_fit,
+                          excluded_model_types=excluded_model_types)
         self.save_trainer(trainer=trainer)
         time_end = time.time()
         self.time_fit_training = time_end - time_preprocessing_end
@@ -164,12 +173,16 @@ class DefaultLearner(AbstractLearner):
             # Do this if working with SKLearn models, otherwise categorical features may perform very badly on the test set
             logger.log(15, 'Performing general data preprocessing with merged train & validation data, so validation performance may not accurately reflect performance on new test data')
             X_super = pd.concat([X, X_val], ignore_index=True)
-            X_super = self.feature_generator.fit_transform(X_super, banned_features=self.submission_columns, drop_duplicates=False)
+            with profile('feature_generation'):
+                X_super = self.feature_generator.fit_transform(X_super, banned_features=self.submission_columns,
+                                                               drop_duplicates=False)
             X = X_super.head(len(X)).set_index(X.index)
             X_val = X_super.tail(len(X_val)).set_index(X_val.index)
             del X_super
         else:
-            X = self.feature_generator.fit_transform(X, banned_features=self.submission_columns, drop_duplicates=False)
+            with profile('feature_generation'):
+                X = self.feature_generator.fit_transform(X, banned_features=self.submission_columns,
+                                                         drop_duplicates=False)
 
         return X, y, X_val, y_val, holdout_frac, num_bagging_folds
 
@@ -0,0 +1,89 @@
+import logging
+
+import pandas as pd
+from pandas import DataFrame
+
+from ..constants import BINARY, MULTICLASS
+from ..utils import get_pred_from_proba
+from ...data.label_cleaner import LabelCleanerMulticlassToBinary
+from ...utils.loaders import load_pkl
+from ...utils.savers import save_pkl
+
+logger = logging.getLogger(__name__)
+
+
+# Inference-only form of a fitted learner, stored as a single file.
+# Created by AbstractLearner.export_inference_artifact().
+# Contains only the fitted feature generators, the label cleaner,
+# and the models required to predict with a single model, loaded in memory with all of their bagged children.
+# The artifact does not reference the trainer or learner.
+# The modules of the contained models are imported when it is unpickled.
+# Importing this module through the autogluon package imports MXNet and the scheduler,
+# load artifacts with autogluon_inference.load_inference_artifact() to avoid this.
+class InferenceArtifact:
+    def __init__(self, label, problem_type, trainer_problem_type, feature_generators, label_cleaner, model_name, models,
+                 version=None):
+        self.label = label
+        self.problem_type = problem_type
+        self.trainer_problem_type = trainer_problem_type
+        self.feature_generators = feature_generators
+        self.label_cleaner = label_cleaner
+        self.model_name = model_name  # Name of the model used for prediction, the last model in self.models
+        self.models = models  # List of models required to predict with self.model_name, in prediction order
+        self.version = version
+
+    @property
+    def class_labels(self):
+        return self.label_cleaner.ordered_class_labels
+
+    def get_model_names(self):
+        return [model.name for model in self.models]
+
+    def transform_features(self, X):
+        for feature_generator in self.feature_generators:
+            X = feature_generator.transform(X)
+        return X
+
+    # Equivalent to AbstractTrainer.get_model_pred_proba_dict() restricted to the models of the artifact
+    def _predict_proba_internal(self, X):
+        model_pred_proba_dict = {}
+        for model in self.models:
+            # Stacker models take the predictions of their base models as input, these are always earlier in self.models
+            if getattr(model, 'stack_column_prefix_lst', None):
+                X_input = model.preprocess(X=X, preprocess=True, infer=False,
+                                           model_pred_proba_dict=model_pred_proba_dict)
+                model_pred_proba_dict[model.name] = model.predict_proba(X_input, preprocess=False)
+            else:
+                model_pred_proba_dict[model.name] = model.predict_proba(X)
+        return model_pred_proba_dict[self.model_name]
+
+    def predict_proba(self, X: DataFrame, as_pandas=False, as_multiclass=False, inverse_transform=True):
+        X = self.transform_features(X)
+        y_pred_proba = self._predict_proba_internal(X)
+        if inverse_transform:
+            y_pred_proba = self.label_cleaner.inverse_transform_proba(y_pred_proba)
+        if as_multiclass and (self.problem_type == BINARY):
+            y_pred_proba = LabelCleanerMulticlassToBinary.convert_binary_proba_to_multiclass_proba(y_pred_proba)
+        if as_pandas:
+            if self.problem_type == MULTICLASS or (as_multiclass and self.problem_type == BINARY):
+                y_pred_proba = pd.DataFrame(data=y_pred_proba, columns=self.class_labels)
+            else:
+                y_pred_proba = pd.Series(data=y_pred_proba, name=self.label)
+        return y_pred_proba
+
+    def predict(self, X: DataFrame, as_pandas=False):
+        y_pred_proba = self.predict_proba(X=X, inverse_transform=False)
+        problem_type = self.trainer_problem_type or self.problem_type
+        y_pred = get_pred_from_proba(y_pred_proba=y_pred_proba, problem_type=problem_type)
+        y_pred = self.label_cleaner.inverse_transform(pd.Series(y_pred))
+        y_pred = y_pred.values
+        if as_pandas:
+            y_pred = pd.Series(data=y_pred, name=self.label)
+        return y_pred
+
+    def save(self, path):
+        save_pkl.save(path=path, object=self)
+
+    @classmethod
+    def load(cls, path):
+        return load_pkl.load(path=path)
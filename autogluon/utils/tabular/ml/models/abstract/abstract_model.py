@@ -10,7 +10,6 @@ from typing import Union
 import pandas as pd
 import psutil
 
-from .model_trial import model_trial
 from ...constants import AG_ARGS_FIT, BINARY, REGRESSION, REFIT_FULL_SUFFIX, OBJECTIVES_TO_NORMALIZE
 from ...tuning.feature_pruner import FeaturePruner
 from ...utils import get_pred_from_proba, generate_train_test_split, shuffle_df_rows, convert_categorical_to_int, normalize_pred_probas, infer_eval_metric
@@ -18,10 +17,11 @@ from .... import metrics
 from ....features.feature_types_metadata import FeatureTypesMetadata
 from ....utils.exceptions import TimeLimitExceeded, NoValidFeatures
 from ....utils.loaders import load_pkl
+from ....utils.profiler import profile_model_method
 from ....utils.savers import save_pkl, save_json
-from ......core import Space, Categorical, List, NestedSpace
-from ......scheduler.fifo import FIFOScheduler
-from ......task.base import BasePredictor
+
+# The search spaces, the scheduler and model_trial are imported in the functions that tune hyperparameters,
+# so that loading a fitted model does not import the autogluon package and MXNet.
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +29,7 @@ logger = logging.getLogger(__name__)
 # Methods useful for all models:
 def fixedvals_from_searchspaces(params):
     """ Converts any search space hyperparams in params dict into fixed default values. """
+    from ......core import Space
     if any(isinstance(params[hyperparam], Space) for hyperparam in params):
         logger.warning("Attempting to fit model without HPO, but search space is provided. fit() will only consider default hyperparameter values from search space.")
         bad_keys = [hyperparam for hyperparam in params if isinstance(params[hyperparam], Space)][:]  # delete all keys which are of type autogluon Space
@@ -41,6 +42,7 @@ def fixedvals_from_searchspaces(params):
 def hp_default_value(hp_value):
     """ Extracts default fixed value from hyperparameter search space hp_value to use a fixed value instead of a search space.
     """
+    from ......core import Space, Categorical, List, NestedSpace
     if not isinstance(hp_value, Space):
         return hp_value
     if isinstance(hp_value, Categorical):
@@ -145,6 +147,10 @@ class AbstractModel:
     def is_fit(self):
         return self.model is not None
 
+    # Checks if the model can be fit in a thread while other models are fit in other threads of the same process
+    def can_fit_concurrently(self):
+        return True
+
     def _set_default_params(self):
         pass
 
@@ -217,6 +223,7 @@ class AbstractModel:
     # Extensions of preprocess must act identical in bagged situations, otherwise test-time predictions will be incorrect
     # This means preprocess cannot be used for normalization
     # TODO: Add preprocess_stateful() to enable stateful preprocessing for models such as KNN
+    @profile_model_method('preprocess')
     def preprocess(self, X):
         if self.features is None:
             self.features = list(X.columns)  # TODO: add fit and transform versions of preprocess instead of doing this
@@ -257,6 +264,7 @@ class AbstractModel:
         kwargs['time_limit'] = time_limit
         return kwargs
 
+    @profile_model_method('fit')
     def fit(self, **kwargs):
         kwargs = self._preprocess_fit_args(**kwargs)
         if 'time_limit' not in kwargs or kwargs['time_limit'] is None or kwargs['time_limit'] > 0:
@@ -270,12 +278,24 @@ class AbstractModel:
         X_train = self.preprocess(X_train)
         self.model = self.model.fit(X_train, y_train)
 
+    # Called by bagged ensembles once on the full training data prior to fitting the fold models.
+    # Models can return a fold-invariant object (such as pre-binned data) which is passed to get_fold_fit_kwargs for
+    # each fold.
+    def construct_bagged_dataset(self, X, y):
+        return None
+
+    # Returns additional kwargs to pass to fit() of the fold model trained on the rows train_index of the bagged
+    # training data, validated on rows val_index.
+    def get_fold_fit_kwargs(self, bagged_dataset, train_index, val_index):
+        return {}
+
     def predict(self, X, preprocess=True):
         y_pred_proba = self.predict_proba(X, preprocess=preprocess)
         return get_pred_from_proba(
             y_pred_proba=y_pred_proba, problem_type=self.problem_type
         )
 
+    @profile_model_method('predict_proba')
     def predict_proba(self, X, preprocess=True, normalize=None):
         if normalize is None:
             normalize = self.normalize_pred_probas
@@ -479,6 +499,9 @@ class AbstractModel:
         return template
 
     def hyperparameter_tune(self, X_train, y_train, X_val, y_val, scheduler_options, **kwargs):
+        from .model_trial import model_trial
+        from ......core import Space
+        from ......scheduler.fifo import FIFOScheduler
         # verbosity = kwargs.get('verbosity', 2)
         time_start = time.time()
         logger.log(
@@ -536,6 +559,8 @@ class AbstractModel:
         return self._get_hpo_results(scheduler=scheduler, scheduler_options=scheduler_options, time_start=time_start)
 
     def _get_hpo_results(self, scheduler, scheduler_options, time_start):
+        from .model_trial import model_trial
+        from ......task.base import BasePredictor
         # Store results / models from this HPO run:
         best_hp = scheduler.get_best_config()  # best_hp only contains searchable stuff
         hpo_results = {
@@ -612,6 +637,12 @@ class AbstractModel:
     def reduce_memory_size(self, remove_fit=True, remove_info=False, requires_save=True, **kwargs):
         pass
 
+    # Removes all variables which are not required for inference from the model in memory,
+    # without modifying the model files on disk. The model should not be fit or saved to its original path afterwards.
+    # Used when exporting inference artifacts, see AbstractTrainer.get_inference_models().
+    def convert_to_inference_model(self):
+        self.reduce_memory_size(remove_fit=True, remove_info=False, requires_save=True)
+
     # Deletes the model from disk.
     # WARNING: This will DELETE ALL FILES in the self.path directory, regardless if they were created by AutoGluon or not.
     #  DO NOT STORE FILES INSIDE OF THE MODEL DIRECTORY THAT ARE UNRELATED TO AUTOGLUON.
@@ -664,6 +695,7 @@ class AbstractModel:
 class SKLearnModel(AbstractModel):
     """Abstract model for all Sklearn models."""
 
+    @profile_model_method('preprocess')
     def preprocess(self, X):
         X = convert_categorical_to_int(X)
         return super().preprocess(X)
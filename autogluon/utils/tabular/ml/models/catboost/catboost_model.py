@@ -7,12 +7,12 @@ import time
 import psutil
 import numpy as np
 
-from .catboost_utils import construct_custom_catboost_metric # make_softclass_metric, make_softclass_objective  # TODO: replace with SoftclassObjective, SoftclassCustomMetric once lazy import no longer needed.
+from .catboost_utils import QuantizedPoolSlicer, construct_custom_catboost_metric # make_softclass_metric, make_softclass_objective  # TODO: replace with SoftclassObjective, SoftclassCustomMetric once lazy import no longer needed.
 from .hyperparameters.parameters import get_param_baseline
-from .hyperparameters.searchspaces import get_default_searchspace
-from ..abstract.abstract_model import AbstractModel
+from ..abstract.abstract_model import AbstractModel, fixedvals_from_searchspaces
 from ...constants import PROBLEM_TYPES_CLASSIFICATION, MULTICLASS, SOFTCLASS
 from ....utils.exceptions import NotEnoughMemoryError, TimeLimitExceeded
+from ....utils.profiler import profile_model_method
 from .....try_import import try_import_catboost, try_import_catboostdev
 
 logger = logging.getLogger(__name__)
@@ -33,13 +33,20 @@ class CatboostModel(AbstractModel):
             self._set_default_param_value('eval_metric', construct_custom_catboost_metric(self.stopping_metric, True, not self.stopping_metric_needs_y_pred, self.problem_type))
 
     def _get_default_searchspace(self):
+        from .hyperparameters.searchspaces import get_default_searchspace
         return get_default_searchspace(self.problem_type, num_classes=self.num_classes)
 
+    @profile_model_method('preprocess')
     def preprocess(self, X):
         X = super().preprocess(X)
-        if categoricals := list(X.select_dtypes(include='category').columns):
-            X = X.copy()
-            for category in categoricals:
+        categoricals = list(X.select_dtypes(include='category').columns)
+        # Only categoricals containing missing values need to be filled,
+        # this avoids copying the data during inference in most cases
+        categoricals_with_nan = [category for category in categoricals if X[category].hasnans]
+        if categoricals_with_nan:
+            # Columns are replaced rather than modified in-place, so a shallow copy is sufficient
+            X = X.copy(deep=False)
+            for category in categoricals_with_nan:
                 current_categories = X[category].cat.categories
                 if '__NaN__' in current_categories:
                     X[category] = X[category].fillna('__NaN__')
@@ -47,9 +54,35 @@ class CatboostModel(AbstractModel):
                     X[category] = X[category].cat.add_categories('__NaN__').fillna('__NaN__')
         return X
 
-    # TODO: Use Pool in preprocess, optimize bagging to do Pool.split() to avoid re-computing pool for each fold! Requires stateful + y
-    #  Pool is much more memory efficient, avoids copying data twice in memory
-    def _fit(self, X_train, y_train, X_val=None, y_val=None, time_limit=None, **kwargs):
+    def construct_bagged_dataset(self, X, y):
+        """ Builds a Pool of the full bagged training data and computes its quantization borders once.
+            Fold models train on slices of it via get_fold_fit_kwargs, quantized with the shared borders.
+        """
+        # TODO: remove this once catboost-dev is no longer necessary, SOFTCLASS requires the catboost_dev Pool
+        if self.problem_type == SOFTCLASS:
+            return None
+        try_import_catboost()
+        from catboost import Pool
+        X = self.preprocess(X)
+        cat_features = list(X.select_dtypes(include='category').columns)
+        pool = Pool(data=X, label=y, cat_features=cat_features)
+        params = fixedvals_from_searchspaces(self.params.copy())
+        if params.get('task_type', None) == 'GPU':
+            return pool  # Pools are quantized on the GPU during training
+        quantization_params_keys = ['border_count', 'max_bin', 'feature_border_type', 'per_float_feature_quantization',
+                                    'nan_mode']
+        quantization_params = {key: params[key] for key in quantization_params_keys if key in params}
+        return QuantizedPoolSlicer(pool, quantization_params=quantization_params)
+
+    def get_fold_fit_kwargs(self, bagged_dataset, train_index, val_index):
+        if bagged_dataset is None:
+            return {}
+        return dict(pool_train=bagged_dataset.slice(train_index), pool_val=bagged_dataset.slice(val_index))
+
+    # Pool is much more memory efficient, avoids copying data twice in memory
+    # If pool_train and pool_val are specified (such as Pool slices from construct_bagged_dataset),
+    # they are used instead of X_train and X_val.
+    def _fit(self, X_train, y_train, X_val=None, y_val=None, pool_train=None, pool_val=None, time_limit=None, **kwargs):
         try_import_catboost()
         from catboost import CatBoostClassifier, CatBoostRegressor, Pool
         if self.problem_type == SOFTCLASS:
@@ -89,14 +122,17 @@ class CatboostModel(AbstractModel):
                 logger.warning('\tWarning: Potentially not enough memory to safely train CatBoost model, roughly requires: %s GB, but only %s GB is available...' % (round(approx_mem_size_req / 1e9, 3), round(available_mem / 1e9, 3)))
 
         start_time = time.time()
-        X_train = self.preprocess(X_train)
-        cat_features = list(X_train.select_dtypes(include='category').columns)
-        X_train = Pool(data=X_train, label=y_train, cat_features=cat_features)
+        if pool_train is None:
+            X_train = self.preprocess(X_train)
+            pool_train = Pool(data=X_train, label=y_train,
+                              cat_features=list(X_train.select_dtypes(include='category').columns))
+        X_train = pool_train
 
-        if X_val is not None:
+        if pool_val is None and X_val is not None:
             X_val = self.preprocess(X_val)
-            X_val = Pool(data=X_val, label=y_val, cat_features=cat_features)
-            eval_set = X_val
+            pool_val = Pool(data=X_val, label=y_val, cat_features=list(X_val.select_dtypes(include='category').columns))
+        if pool_val is not None:
+            eval_set = pool_val
             modifier = 1 if num_rows_train <= 10000 else 10000/num_rows_train
             early_stopping_rounds = max(round(modifier*150), 10)
             num_sample_iter_max = max(round(modifier*50), 2)
@@ -140,6 +176,10 @@ class CatboostModel(AbstractModel):
 
         params = self.params.copy()
         num_features = len(self.features)
+        # thread_count defaults to all cores, which oversubscribes the CPU when other models train alongside
+        num_cpus = kwargs.get('num_cpus', None)
+        if num_cpus is not None and params.get('thread_count', -1) == -1:
+            params['thread_count'] = num_cpus
 
         if params.get('task_type', None) == 'GPU':
             if 'colsample_bylevel' in params:
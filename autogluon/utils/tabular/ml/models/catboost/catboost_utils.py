@@ -1,4 +1,7 @@
 import logging
+import os
+import tempfile
+
 import numpy as np
 
 from ...constants import BINARY, MULTICLASS, REGRESSION, SOFTCLASS
@@ -122,3 +125,24 @@ def construct_custom_catboost_metric(metric, is_higher_better, needs_pred_proba,
         return 'R2'
     metric_class = metric_classes_dict[problem_type]
     return metric_class(metric=metric, is_higher_better=is_higher_better, needs_pred_proba=needs_pred_proba)
+
+
+class QuantizedPoolSlicer:
+    """ Slices a catboost Pool into Pools quantized with the borders of the full Pool.
+
+        The borders are computed once on the full Pool and saved to a temporary file, which exists as long as this
+        object.
+        The full Pool itself is kept unquantized, as catboost<0.24 can not train on slices of a quantized Pool.
+    """
+    def __init__(self, pool, quantization_params=None):
+        self.pool = pool
+        self._borders_dir = tempfile.TemporaryDirectory()
+        self.borders_path = os.path.join(self._borders_dir.name, 'borders.tsv')
+        pool_quantized = pool.slice(np.arange(pool.num_row()))
+        pool_quantized.quantize(**(quantization_params or {}))
+        pool_quantized.save_quantization_borders(self.borders_path)
+
+    def slice(self, index):
+        pool = self.pool.slice(index)
+        pool.quantize(input_borders=self.borders_path)
+        return pool
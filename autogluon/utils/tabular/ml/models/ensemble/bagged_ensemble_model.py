@@ -13,6 +13,7 @@ from ...constants import MULTICLASS, REGRESSION, SOFTCLASS, REFIT_FULL_SUFFIX
 from ...utils import generate_kfold
 from ....utils.exceptions import TimeLimitExceeded
 from ....utils.loaders import load_pkl
+from ....utils.profiler import profile, profile_model_method
 from ....utils.savers import save_pkl
 
 logger = logging.getLogger(__name__)
@@ -34,6 +35,8 @@ class BaggedEnsembleModel(AbstractModel):
         self._k_per_n_repeat = []  # k-fold used for each n_repeat. == [5, 10, 3] if first kfold was 5, second was 10, and third was 3
         self._random_state = random_state
         self.low_memory = True
+        # Information on the child models skipped during the last early exit prediction, see _predict_proba_early_exit()
+        self._early_exit_info = None
         self.bagged_mode = None
         self.save_bagged_folds = save_bagged_folds
 
@@ -53,6 +56,9 @@ class BaggedEnsembleModel(AbstractModel):
     def can_infer(self):
         return self.is_fit() and self.save_bagged_folds
 
+    def can_fit_concurrently(self):
+        return self._get_model_base().can_fit_concurrently()
+
     def is_stratified(self):
         return self.problem_type not in [REGRESSION, SOFTCLASS]
 
@@ -73,6 +79,7 @@ class BaggedEnsembleModel(AbstractModel):
             oof_pred_model_repeats_without_0 = oof_pred_model_repeats_without_0[:, None]
         return oof_pred_proba / oof_pred_model_repeats_without_0
 
+    @profile_model_method('preprocess')
     def preprocess(self, X, model=None):
         if model is None:
             if not self.models:
@@ -151,6 +158,8 @@ class BaggedEnsembleModel(AbstractModel):
             oof_pred_proba = np.zeros(shape=len(X))
         oof_pred_model_repeats = np.zeros(shape=len(X))
 
+        bagged_dataset = model_base.construct_bagged_dataset(X=X, y=y)
+
         models = []
         folds_to_fit = fold_end - fold_start
         for j in range(n_repeat_start, n_repeats):  # For each n_repeat
@@ -184,7 +193,10 @@ class BaggedEnsembleModel(AbstractModel):
                 fold_model = copy.deepcopy(model_base)
                 fold_model.name = f'{fold_model.name}_fold_{i}'
                 fold_model.set_contexts(self.path + fold_model.name + os.path.sep)
-                fold_model.fit(X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val, time_limit=time_limit_fold, **kwargs)
+                fold_fit_kwargs = model_base.get_fold_fit_kwargs(bagged_dataset=bagged_dataset,
+                                                                 train_index=train_index, val_index=val_index)
+                fold_model.fit(X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val, time_limit=time_limit_fold,
+                               **fold_fit_kwargs, **kwargs)
                 time_train_end_fold = time.time()
                 if time_limit is not None and i != (fold_end - 1):
                     time_elapsed = time.time() - time_start
@@ -234,11 +246,17 @@ class BaggedEnsembleModel(AbstractModel):
 
     # FIXME: Defective if model does not apply same preprocessing in all bags!
     #  No model currently violates this rule, but in future it could happen
-    def predict_proba(self, X, preprocess=True):
+    # If early_exit_tol is specified, rows stop being predicted by further child models once the standard error of their
+    # mean prediction is at most early_exit_tol.
+    @profile_model_method('predict_proba')
+    def predict_proba(self, X, preprocess=True, early_exit_tol=None, early_exit_min_models=2):
         model = self.load_child(self.models[0])
         if preprocess:
             X = self.preprocess(X, model=model)
 
+        if early_exit_tol is not None and len(self.models) > early_exit_min_models:
+            return self._predict_proba_early_exit(X=X, model=model, early_exit_tol=early_exit_tol,
+                                                  early_exit_min_models=early_exit_min_models)
         pred_proba = model.predict_proba(X=X, preprocess=False)
         for model in self.models[1:]:
             model = self.load_child(model)
@@ -247,6 +265,47 @@ class BaggedEnsembleModel(AbstractModel):
 
         return pred_proba
 
+    # Anytime inference: child models are evaluated one at a time on the rows whose mean prediction is still uncertain.
+    # After at least early_exit_min_models children, rows whose standard error of the mean prediction (max over classes)
+    # is at most early_exit_tol are finalized.
+    # Information on the rows predicted by each child and on the skipped children is stored in self._early_exit_info.
+    def _predict_proba_early_exit(self, X, model, early_exit_tol, early_exit_min_models=2):
+        num_rows = len(X)
+        pred_proba = model.predict_proba(X=X, preprocess=False)
+        pred_proba_sum = pred_proba.astype(np.float64)
+        pred_proba_sq_sum = pred_proba_sum ** 2
+        num_models_used = np.ones(num_rows, dtype=np.int64)
+        rows_active = np.arange(num_rows)
+        num_rows_predicted = [num_rows]
+        for model in self.models[1:]:
+            if len(rows_active) == 0:
+                break
+            model = self.load_child(model)
+            X_active = X.iloc[rows_active] if isinstance(X, pd.DataFrame) else X[rows_active]
+            pred_proba_active = model.predict_proba(X=X_active, preprocess=False)
+            pred_proba_sum[rows_active] += pred_proba_active
+            pred_proba_sq_sum[rows_active] += pred_proba_active ** 2
+            num_models_used[rows_active] += 1
+            num_rows_predicted.append(len(rows_active))
+            k = len(num_rows_predicted)
+            if k >= early_exit_min_models:
+                pred_proba_mean = pred_proba_sum[rows_active] / k
+                var = np.maximum(pred_proba_sq_sum[rows_active] - k * pred_proba_mean ** 2, 0) / (k - 1)
+                std_error = np.sqrt(var / k).reshape(len(rows_active), -1).max(axis=1)
+                rows_active = rows_active[std_error > early_exit_tol]
+
+        models_skipped = [m if isinstance(m, str) else m.name for m in self.models[len(num_rows_predicted):]]
+        self._early_exit_info = dict(
+            num_rows=num_rows,
+            num_rows_predicted=num_rows_predicted,  # Number of rows predicted by each evaluated child model, in order
+            num_models_skipped=len(models_skipped),
+            models_skipped=models_skipped,  # Child models not evaluated on any row
+            avg_models_used=float(num_models_used.mean()) if num_rows > 0 else 0.0,
+        )
+        if pred_proba_sum.ndim > 1:
+            num_models_used = num_models_used[:, np.newaxis]
+        return (pred_proba_sum / num_models_used).astype(pred_proba.dtype, copy=False)
+
     def score_with_oof(self, y):
         self._load_oof()
         valid_indices = self._oof_pred_model_repeats > 0
@@ -303,7 +362,8 @@ class BaggedEnsembleModel(AbstractModel):
     def load_child(self, model, verbose=False) -> AbstractModel:
         if isinstance(model, str):
             child_path = self.create_contexts(self.path + model + os.path.sep)
-            return self._child_type.load(path=child_path, verbose=verbose)
+            with profile('load_model', model=model):
+                return self._child_type.load(path=child_path, verbose=verbose)
         else:
             return model
 
@@ -462,6 +522,17 @@ class BaggedEnsembleModel(AbstractModel):
                 if requires_save and self.low_memory:
                     self.save_child(model=model)
 
+    # Children are loaded into memory so that the bagged model is self-contained,
+    # OOF predictions are only required to fit stacker models.
+    def convert_to_inference_model(self):
+        self.persist_child_models(reset_paths=True)
+        for child in self.models:
+            child.convert_to_inference_model()
+        self._oof_pred_proba = None
+        self._oof_pred_model_repeats = None
+        self.model_base = None
+        super().convert_to_inference_model()
+
     def _get_model_names(self):
         model_names = []
         for model in self.models:
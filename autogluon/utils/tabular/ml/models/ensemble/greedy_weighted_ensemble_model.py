@@ -1,8 +1,10 @@
 import logging
 
 from ..abstract.abstract_model import AbstractModel
-from ...constants import MULTICLASS
+from ...constants import MULTICLASS, REGRESSION
 from ...tuning.ensemble_selection import EnsembleSelection
+from ...utils import normalize_pred_probas
+from ....utils.profiler import profile_model_method
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,7 @@ class GreedyWeightedEnsembleModel(AbstractModel):
             self._set_default_param_value(param, val)
 
     # TODO: Consider moving convert_pred_probas_df_to_list into inner model to ensure X remains a dataframe after preprocess is called
+    @profile_model_method('preprocess')
     def preprocess(self, X):
         X = self.convert_pred_probas_df_to_list(X)
         return X
@@ -79,6 +82,40 @@ class GreedyWeightedEnsembleModel(AbstractModel):
         num_models = len(self.base_model_names)
         return {self.base_model_names[i]: self.weights_[i] for i in range(num_models)}
 
+    # Anytime inference: base models are evaluated in descending order of weight, get_base_pred_proba(base_model_name)
+    # returns their predictions. Evaluation stops once the remaining base models have at most early_exit_tol of the
+    # total weight.
+    # As predicted probabilities are in [0, 1], the remaining models cannot move the normalized prediction by more than
+    # their share of the weight, so it is within early_exit_tol of the prediction of the full ensemble.
+    # Regression predictions are not bounded, so all base models are evaluated for regression.
+    # model_weights defaults to the weights of this model, keys are base model names.
+    # Returns the predictions and information on the skipped base models.
+    def predict_proba_early_exit(self, get_base_pred_proba, early_exit_tol, model_weights=None):
+        if model_weights is None:
+            model_weights = self._get_model_weights()
+        if self.problem_type == REGRESSION:
+            early_exit_tol = 0
+        base_model_order = sorted(model_weights, key=model_weights.get, reverse=True)
+        weight_total = sum(model_weights.values())
+        weight_used = 0
+        pred_proba = 0
+        base_models_used = []
+        for base_model_name in base_model_order:
+            if base_models_used and weight_total - weight_used <= early_exit_tol * weight_total:
+                break
+            pred_proba = pred_proba + model_weights[base_model_name] * get_base_pred_proba(base_model_name)
+            weight_used += model_weights[base_model_name]
+            base_models_used.append(base_model_name)
+        pred_proba = pred_proba / weight_used
+        if self.normalize_pred_probas:
+            pred_proba = normalize_pred_probas(pred_proba, self.problem_type)
+        early_exit_info = dict(
+            base_models_used=base_models_used,  # In order of evaluation
+            base_models_skipped=base_model_order[len(base_models_used):],
+            weight_skipped=(weight_total - weight_used) / weight_total,
+        )
+        return pred_proba, early_exit_info
+
     def get_info(self):
         info = super().get_info()
         info['model_weights'] = self._get_model_weights()
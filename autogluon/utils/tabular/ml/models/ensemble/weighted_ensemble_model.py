@@ -43,6 +43,17 @@ class WeightedEnsembleModel(StackerEnsembleModel):
             weights_dict[key] = weights_dict[key] / num_models
         return weights_dict
 
+    # Anytime inference, see GreedyWeightedEnsembleModel.predict_proba_early_exit(). The predictions of the bagged
+    # children are linear in the base model predictions, so the bag is evaluated as one weighted ensemble with the
+    # averaged weights of the children.
+    # get_base_pred_proba(base_model_name) returns the predictions of a base model.
+    def predict_proba_early_exit(self, get_base_pred_proba, early_exit_tol):
+        model_weights = {self.stack_column_prefix_to_model_map[stack_column_prefix]: weight
+                         for stack_column_prefix, weight in self._get_model_weights().items()}
+        model: GreedyWeightedEnsembleModel = self.load_child(self.models[0], verbose=False)
+        return model.predict_proba_early_exit(get_base_pred_proba=get_base_pred_proba, early_exit_tol=early_exit_tol,
+                                              model_weights=model_weights)
+
     def compute_feature_importance(self, X, y, features_to_use=None, preprocess=True, is_oof=True, **kwargs):
         logger.warning('Warning: non-raw feature importance calculation is not valid for weighted ensemble since it does not have features, returning ensemble weights instead...')
         if not is_oof:
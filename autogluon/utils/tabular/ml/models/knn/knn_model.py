@@ -6,23 +6,51 @@ import time
 import psutil
 from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
 
-from ..abstract import model_trial
+from .knn_utils import FAISSNeighborsClassifier, FAISSNeighborsRegressor
 from ..abstract.abstract_model import SKLearnModel
 from ...constants import REGRESSION
 from ....utils.exceptions import NotEnoughMemoryError
+from ....utils.profiler import profile_model_method
 
 logger = logging.getLogger(__name__)
 
 
-# TODO: Normalize data!
+SKLEARN = 'sklearn'
+FAISS = 'faiss'
+
+
+# TODO: Normalize data for the sklearn backend!
 class KNNModel(SKLearnModel):
+    """
+    KNearestNeighbors model.
+
+    The `backend` hyperparameter selects the neighbour search implementation:
+        'sklearn' (default): Exact search via sklearn KNeighborsClassifier/KNeighborsRegressor on raw features.
+        'faiss': Approximate search via a faiss index built at fit time on standardized features.
+            Inference cost no longer scales linearly with the number of training rows.
+            Additional hyperparameters such as `index_factory`, `nprobe`, `flat_threshold` and `batch_size` are
+            documented in `autogluon/utils/tabular/ml/models/knn/knn_utils.py`.
+    """
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        if self.problem_type == REGRESSION:
-            self._model_type = KNeighborsRegressor
+        self._model_type = self._get_model_type()
+
+    def _get_model_type(self):
+        backend = self.params.get('backend', SKLEARN)
+        if backend == SKLEARN:
+            if self.problem_type == REGRESSION:
+                return KNeighborsRegressor
+            else:
+                return KNeighborsClassifier
+        elif backend == FAISS:
+            if self.problem_type == REGRESSION:
+                return FAISSNeighborsRegressor
+            else:
+                return FAISSNeighborsClassifier
         else:
-            self._model_type = KNeighborsClassifier
+            raise ValueError(f"Unknown KNN backend '{backend}', valid values: {[SKLEARN, FAISS]}")
 
+    @profile_model_method('preprocess')
     def preprocess(self, X):
         cat_columns = X.select_dtypes(['category']).columns
         X = X.drop(cat_columns, axis=1)  # TODO: Test if crash when all columns are categorical
@@ -63,10 +91,16 @@ class KNNModel(SKLearnModel):
             if model_memory_ratio > (0.45 * max_memory_usage_ratio):
                 raise NotEnoughMemoryError  # don't train full model to avoid OOM error
 
-        model = self._model_type(**self.params)
+        params = self.params.copy()
+        params.pop('backend', None)
+        num_cpus = kwargs.get('num_cpus', None)
+        if num_cpus is not None and params.get('n_jobs', -1) == -1:
+            params['n_jobs'] = num_cpus
+        model = self._model_type(**params)
         self.model = model.fit(X_train, y_train)
 
     def hyperparameter_tune(self, X_train, y_train, X_val, y_val, scheduler_options=None, **kwargs):
+        from ..abstract import model_trial  # Imported here, so that loading fitted models does not import the scheduler
         fit_model_args = dict(X_train=X_train, y_train=y_train, **kwargs)
         predict_proba_args = dict(X=X_val)
         model_trial.fit_and_save_model(
@@ -0,0 +1,202 @@
+import logging
+import math
+
+import numpy as np
+from pandas import DataFrame
+
+from .....try_import import try_import_faiss
+
+logger = logging.getLogger(__name__)
+
+
+# TODO: Add GPU support via faiss.index_cpu_to_gpu
+class FAISSModel:
+    """
+    Approximate nearest neighbour model backed by a faiss index, with an sklearn-like API.
+
+    Features are standardized with the mean and standard deviation of the training data before being added to the index.
+    The index is built during fit and is serialized alongside the model when pickled, so it is persisted together with
+    the AutoGluon model.
+
+    Parameters
+    ----------
+    n_neighbors : int, default = 5
+        Number of neighbours to use for each query.
+    weights : str, default = 'uniform'
+        Either 'uniform' (all neighbours weighted equally) or 'distance' (neighbours weighted by the inverse of their
+        distance).
+    index_factory : str, default = None
+        faiss index_factory string used to build the index, such as 'Flat', 'IVF1024,Flat' or 'IVF1024,PQ16'.
+        If None, an exact 'Flat' index is used for datasets with fewer than `flat_threshold` rows and a partitioned,
+        scalar quantized 'IVF{nlist},SQ8' index is used otherwise, with nlist = min(4 * sqrt(num_rows), num_rows / 39).
+    nprobe : int, default = 8
+        Number of partitions visited per query for IVF indices. This is the recall/latency knob: larger values increase
+        recall and inference time.
+    normalize : bool, default = True
+        Whether to standardize features prior to indexing and querying.
+    batch_size : int, default = 65536
+        Number of rows queried against the index at once during inference. Bounds the memory used by the intermediate
+        neighbour arrays.
+    n_jobs : int, default = -1
+        Number of threads used by faiss. -1 uses all available cores.
+    flat_threshold : int, default = 10000
+        Number of training rows below which an exact 'Flat' index is built when `index_factory` is None.
+        Searching a Flat index scales linearly with the number of training rows, but is exact and needs no training,
+        which is faster than building a partitioned index on small datasets. Ignored if `index_factory` is specified.
+    """
+    def __init__(self, n_neighbors=5, weights='uniform', index_factory=None, nprobe=8, normalize=True, batch_size=65536,
+                 n_jobs=-1, flat_threshold=10000):
+        if weights not in ['uniform', 'distance']:
+            raise ValueError(f"weights must be one of ['uniform', 'distance'], but was '{weights}'")
+        self.n_neighbors = n_neighbors
+        self.weights = weights
+        self.index_factory = index_factory
+        self.nprobe = nprobe
+        self.normalize = normalize
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs
+        self.flat_threshold = flat_threshold
+        self.index = None
+        self._mean = None
+        self._std = None
+        self._y = None
+
+    def fit(self, X, y):
+        faiss = try_import_faiss()
+        self._set_num_threads(faiss)
+        X = self._fit_normalize(self._to_array(X))
+        num_rows, num_features = X.shape
+        index_factory = self.index_factory
+        if index_factory is None:
+            index_factory = self._get_default_index_factory(num_rows)
+        logger.log(15, f'\tBuilding faiss index "{index_factory}" on {num_rows} rows and {num_features} features...')
+        index = faiss.index_factory(num_features, index_factory)
+        if not index.is_trained:
+            index.train(X)
+        index.add(X)
+        self.index = index
+        self._set_nprobe(faiss)
+        self._y = self._encode_y(y)
+        return self
+
+    def _get_default_index_factory(self, num_rows):
+        if num_rows < self.flat_threshold:
+            return 'Flat'
+        # faiss requires at least 39 training points per partition
+        nlist = int(max(1, min(4 * math.sqrt(num_rows), num_rows / 39)))
+        return f'IVF{nlist},SQ8'
+
+    def _set_nprobe(self, faiss):
+        try:
+            index_ivf = faiss.extract_index_ivf(self.index)
+        except RuntimeError:
+            return  # Not an IVF index, nprobe is not applicable
+        index_ivf.nprobe = self.nprobe
+
+    def _set_num_threads(self, faiss):
+        if self.n_jobs is not None and self.n_jobs > 0:
+            faiss.omp_set_num_threads(self.n_jobs)
+
+    @staticmethod
+    def _to_array(X):
+        if isinstance(X, DataFrame):
+            X = X.values
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    def _fit_normalize(self, X):
+        if not self.normalize:
+            return X
+        self._mean = X.mean(axis=0)
+        std = X.std(axis=0)
+        std[std == 0] = 1
+        self._std = std
+        return self._normalize(X)
+
+    def _normalize(self, X):
+        if not self.normalize:
+            return X
+        return np.ascontiguousarray((X - self._mean) / self._std, dtype=np.float32)
+
+    def _encode_y(self, y):
+        return np.asarray(y)
+
+    def kneighbors(self, X):
+        """ Returns (distances, indices) of the nearest neighbours of each row in X, queried in batches of `batch_size`
+            rows.
+            Missing neighbours (possible with small `nprobe` values on IVF indices) have an index of -1.
+        """
+        faiss = try_import_faiss()
+        self._set_num_threads(faiss)
+        X = self._normalize(self._to_array(X))
+        n_neighbors = min(self.n_neighbors, self.index.ntotal)
+        distances = np.empty((X.shape[0], n_neighbors), dtype=np.float32)
+        indices = np.empty((X.shape[0], n_neighbors), dtype=np.int64)
+        for start in range(0, X.shape[0], self.batch_size):
+            end = start + self.batch_size
+            distances[start:end], indices[start:end] = self.index.search(X[start:end], n_neighbors)
+        return distances, indices
+
+    def _get_neighbor_weights(self, distances, indices):
+        valid = indices >= 0
+        if self.weights == 'uniform':
+            weights = valid.astype(np.float64)
+        else:
+            # faiss L2 indices return squared distances
+            with np.errstate(divide='ignore'):
+                weights = 1 / np.sqrt(np.maximum(distances, 0).astype(np.float64))
+            exact_match = np.isinf(weights)
+            rows_with_exact_match = exact_match.any(axis=1)
+            # Exact matches take all of the weight, as in sklearn
+            weights[rows_with_exact_match] = exact_match[rows_with_exact_match]
+            weights[~valid] = 0
+        num_no_neighbors = (~valid.any(axis=1)).sum()
+        if num_no_neighbors > 0:
+            logger.warning(f'\tWarning: {num_no_neighbors} rows found no neighbours in the faiss index, '
+                           f'consider increasing nprobe.')
+        return weights
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self.index is not None:
+            faiss = try_import_faiss()
+            state['index'] = faiss.serialize_index(self.index)
+        return state
+
+    def __setstate__(self, state):
+        if state.get('index') is not None:
+            faiss = try_import_faiss()
+            state['index'] = faiss.deserialize_index(state['index'])
+        self.__dict__.update(state)
+
+
+class FAISSNeighborsClassifier(FAISSModel):
+    def _encode_y(self, y):
+        self.classes_, y = np.unique(np.asarray(y), return_inverse=True)
+        return y
+
+    def predict_proba(self, X):
+        distances, indices = self.kneighbors(X)
+        weights = self._get_neighbor_weights(distances, indices)
+        neighbor_labels = self._y[np.maximum(indices, 0)]
+        num_rows = neighbor_labels.shape[0]
+        num_classes = len(self.classes_)
+        # Accumulate neighbour weights per class in a single bincount over (row, class) pairs
+        flat_labels = (np.arange(num_rows)[:, None] * num_classes + neighbor_labels).ravel()
+        y_pred_proba = np.bincount(flat_labels, weights=weights.ravel(), minlength=num_rows * num_classes)
+        y_pred_proba = y_pred_proba.reshape(num_rows, num_classes)
+        normalizer = y_pred_proba.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0] = 1
+        return y_pred_proba / normalizer
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class FAISSNeighborsRegressor(FAISSModel):
+    def predict(self, X):
+        distances, indices = self.kneighbors(X)
+        weights = self._get_neighbor_weights(distances, indices)
+        neighbor_values = self._y[np.maximum(indices, 0)]
+        normalizer = weights.sum(axis=1)
+        normalizer[normalizer == 0] = 1
+        return (neighbor_values * weights).sum(axis=1) / normalizer
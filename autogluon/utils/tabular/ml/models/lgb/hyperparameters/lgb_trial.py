@@ -22,7 +22,8 @@ def lgb_trial(args, reporter):
         import lightgbm as lgb
 
         dataset_train = lgb.Dataset(util_args.directory + util_args.dataset_train_filename)
-        dataset_val = lgb.Dataset(util_args.directory + util_args.dataset_val_filename)
+        # Binary Datasets are already binned, so trials do not repeat the binning of the data
+        dataset_val = lgb.Dataset(util_args.directory + util_args.dataset_val_filename, reference=dataset_train)
         X_val, y_val = load_pkl.load(util_args.directory + util_args.dataset_val_pkl_filename)
 
         fit_model_args = dict(dataset_train=dataset_train, dataset_val=dataset_val)
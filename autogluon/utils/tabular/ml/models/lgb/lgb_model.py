@@ -12,22 +12,19 @@ from pandas import DataFrame, Series
 
 from . import lgb_utils
 from .callbacks import early_stopping_custom
-from .hyperparameters.lgb_trial import lgb_trial
 from .hyperparameters.parameters import get_param_baseline
-from .hyperparameters.searchspaces import get_default_searchspace
-from .lgb_utils import construct_dataset
+from .lgb_utils import construct_dataset, get_dataset_num_rows
 from ..abstract.abstract_model import AbstractModel, fixedvals_from_searchspaces
 from ...constants import BINARY, MULTICLASS, REGRESSION, SOFTCLASS
 from ....utils.savers import save_pkl
+from ....utils.profiler import profile_model_method
 from .....try_import import try_import_lightgbm
-from ......core import Int, Space
 
 
 warnings.filterwarnings("ignore", category=UserWarning, message="Starting from version")  # lightGBM brew libomp warning
 logger = logging.getLogger(__name__)
 
 
-# TODO: Save dataset to binary and reload for HPO. This will avoid the memory spike overhead when training each model and instead it will only occur once upon saving the dataset.
 class LGBModel(AbstractModel):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -40,6 +37,7 @@ class LGBModel(AbstractModel):
             self._set_default_param_value(param, val)
 
     def _get_default_searchspace(self):
+        from .hyperparameters.searchspaces import get_default_searchspace
         return get_default_searchspace(problem_type=self.problem_type, num_classes=self.num_classes)
 
     # Use specialized LightGBM metric if available (fast), otherwise use custom func generator
@@ -56,9 +54,13 @@ class LGBModel(AbstractModel):
         start_time = time.time()
         params = self.params.copy()
 
-        # TODO: kwargs can have num_cpu, num_gpu. Currently these are ignored.
+        # TODO: kwargs can have num_gpu. Currently this is ignored.
         verbosity = kwargs.get('verbosity', 2)
         params = fixedvals_from_searchspaces(params)
+        # Limit threads to the CPUs allotted to this model, such as when training models concurrently
+        num_cpus = kwargs.get('num_cpus', None)
+        if num_cpus is not None and params.get('num_threads', -1) == -1:
+            params['num_threads'] = num_cpus
 
         if verbosity <= 1:
             verbose_eval = False
@@ -78,7 +80,7 @@ class LGBModel(AbstractModel):
         logger.log(15, "with the following hyperparameter settings:")
         logger.log(15, params)
 
-        num_rows_train = len(dataset_train.data)
+        num_rows_train = get_dataset_num_rows(dataset_train)
         if (
             'min_data_in_leaf' in params
             and params['min_data_in_leaf'] > num_rows_train
@@ -164,6 +166,7 @@ class LGBModel(AbstractModel):
             else:  # Should this ever happen?
                 return y_pred_proba[:, 1]
 
+    @profile_model_method('preprocess')
     def preprocess(self, X, is_train=False):
         X = super().preprocess(X=X)
 
@@ -184,14 +187,18 @@ class LGBModel(AbstractModel):
             return X
 
     def generate_datasets(self, X_train: DataFrame, y_train: Series, params, X_val=None, y_val=None, dataset_train=None, dataset_val=None, save=False):
-        lgb_dataset_params_keys = ['objective', 'two_round', 'num_threads', 'num_classes', 'verbose']  # Keys that are specific to lightGBM Dataset object construction.
+        # Keys that are specific to lightGBM Dataset object construction.
+        # Binning keys must be present here, as Datasets may be constructed prior to lgb.train and reused.
+        lgb_dataset_params_keys = ['objective', 'two_round', 'num_threads', 'num_classes', 'verbose',
+                                   'max_bin', 'min_data_in_bin', 'bin_construct_sample_cnt', 'use_missing',
+                                   'zero_as_missing']
         data_params = {key: params[key] for key in lgb_dataset_params_keys if key in params}.copy()
 
         W_train = None  # TODO: Add weight support
         W_test = None  # TODO: Add weight support
-        if X_train is not None:
+        if (not dataset_train) and (X_train is not None):
             X_train = self.preprocess(X_train, is_train=True)
-        if X_val is not None:
+        if (not dataset_val) and (X_val is not None):
             X_val = self.preprocess(X_val)
         # TODO: Try creating multiple Datasets for subsets of features, then combining with Dataset.add_features_from(), this might avoid memory spike
 
@@ -220,6 +227,27 @@ class LGBModel(AbstractModel):
                 dataset_val.softlabels = y_val_og
         return dataset_train, dataset_val
 
+    def construct_bagged_dataset(self, X, y):
+        """ Bins the full bagged training data once into a constructed lightGBM Dataset.
+            Fold models train on subsets of it via get_fold_fit_kwargs.
+        """
+        params = fixedvals_from_searchspaces(self.params.copy())
+        dataset, _ = self.generate_datasets(X_train=X, y_train=y, params=params)
+        return dataset.construct()
+
+    def get_fold_fit_kwargs(self, bagged_dataset, train_index, val_index):
+        if bagged_dataset is None:
+            return {}
+        # Subsets share the bin mappers of bagged_dataset, avoiding re-binning the data for every fold
+        train_index = np.sort(train_index)
+        val_index = np.sort(val_index)
+        dataset_train = bagged_dataset.subset(train_index)
+        dataset_val = bagged_dataset.subset(val_index)
+        if self.problem_type == SOFTCLASS:
+            dataset_train.softlabels = bagged_dataset.softlabels[train_index]
+            dataset_val.softlabels = bagged_dataset.softlabels[val_index]
+        return dict(dataset_train=dataset_train, dataset_val=dataset_val)
+
     def debug_features_to_use(self, X_val_in):
         feature_splits = self.model.feature_importance()
         total_splits = feature_splits.sum()
@@ -241,6 +269,9 @@ class LGBModel(AbstractModel):
     #  model names are not aligned with what is communicated to trainer!
     # FIXME: Likely tabular_nn_trial.py and abstract trial also need to be refactored heavily + hyperparameter functions
     def hyperparameter_tune(self, X_train, y_train, X_val, y_val, scheduler_options, **kwargs):
+        # Imported here, so that loading fitted models does not import the search spaces and the scheduler
+        from .hyperparameters.lgb_trial import lgb_trial
+        from ......core import Int, Space
         time_start = time.time()
         logger.log(15, "Beginning hyperparameter tuning for Gradient Boosting Model...")
         self._set_default_searchspace()
@@ -3,7 +3,7 @@ import os
 import numpy as np
 from pandas import DataFrame, Series
 
-from autogluon import try_import_lightgbm
+from .....try_import import try_import_lightgbm
 from ...constants import BINARY, MULTICLASS, REGRESSION, SOFTCLASS
 
 
@@ -76,6 +76,20 @@ def softclass_lgbobj(preds, train_data):
     hess = 2.0 * preds * (1.0-preds)
     return grad.flatten('F'), hess.flatten('F')
 
+
+def get_dataset_num_rows(dataset) -> int:
+    """ Returns the number of rows in a lightGBM Dataset, including Dataset subsets and Datasets loaded from binary
+        files.
+    """
+    if dataset.used_indices is not None:
+        return len(dataset.used_indices)
+    if dataset.handle is None and isinstance(dataset.data, str):
+        dataset.construct()  # Dataset loaded from binary file, row count is only known after construction
+    if dataset.handle is not None:
+        return dataset.num_data()
+    return len(dataset.data)
+
+
 def construct_dataset(x: DataFrame, y: Series, location=None, reference=None, params=None, save=False, weight=None):
     try_import_lightgbm()
     import lightgbm as lgb
@@ -13,6 +13,7 @@ from .hyperparameters.searchspaces import get_default_searchspace
 from .lr_preprocessing_utils import NlpDataPreprocessor, OheFeaturesGenerator, NumericDataPreprocessor
 from ...constants import BINARY, REGRESSION
 from ....ml.models.abstract.abstract_model import AbstractModel
+from ....utils.profiler import profile_model_method
 
 logger = logging.getLogger(__name__)
 
@@ -64,6 +65,7 @@ class LinearModel(AbstractModel):
         return features_selector(df, types_of_features, categorical_featnames, language_featnames, continuous_featnames)
 
     # TODO: handle collinear features - they will impact results quality
+    @profile_model_method('preprocess')
     def preprocess(self, X: DataFrame, is_train=False, vect_max_features=1000, model_specific_preprocessing=False):
         X = super().preprocess(X=X)
         if model_specific_preprocessing:  # This is hack to work-around pre-processing caching in bagging/stacker models
@@ -122,6 +124,9 @@ class LinearModel(AbstractModel):
         X_train = self.preprocess(X_train, is_train=True, vect_max_features=hyperparams['vectorizer_dict_size'], model_specific_preprocessing=True)
 
         params = {k: v for k, v in self.params.items() if k in self.model_params}
+        num_cpus = kwargs.get('num_cpus', None)
+        if num_cpus is not None and params.get('n_jobs', None) == -1:
+            params['n_jobs'] = num_cpus
 
         # Ridge/Lasso are using alpha instead of C, which is C^-1
         # https://scikit-learn.org/stable/modules/generated/sklearn.linear_model.Ridge.html#sklearn.linear_model.Ridge
@@ -7,10 +7,10 @@ import time
 import psutil
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor, ExtraTreesClassifier, ExtraTreesRegressor
 
-from ..abstract import model_trial
 from ..abstract.abstract_model import SKLearnModel
 from ...constants import MULTICLASS, REGRESSION
 from ....utils.exceptions import NotEnoughMemoryError, TimeLimitExceeded
+from ....utils.profiler import profile_model_method
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +27,7 @@ class RFModel(SKLearnModel):
             return RandomForestClassifier
 
     # TODO: X.fillna -inf? Add extra is_missing column?
+    @profile_model_method('preprocess')
     def preprocess(self, X):
         X = super().preprocess(X).fillna(0)
         return X
@@ -52,6 +53,9 @@ class RFModel(SKLearnModel):
         time_start = time.time()
         max_memory_usage_ratio = self.params_aux['max_memory_usage_ratio']
         hyperparams = self.params.copy()
+        num_cpus = kwargs.get('num_cpus', None)
+        if num_cpus is not None and hyperparams.get('n_jobs', -1) == -1:
+            hyperparams['n_jobs'] = num_cpus
         n_estimators_final = hyperparams['n_estimators']
 
         n_estimators_minimum = min(40, n_estimators_final)
@@ -127,6 +131,7 @@ class RFModel(SKLearnModel):
         self.params_trained['n_estimators'] = self.model.n_estimators
 
     def hyperparameter_tune(self, X_train, y_train, X_val, y_val, scheduler_options=None, **kwargs):
+        from ..abstract import model_trial  # Imported here, so that loading fitted models does not import the scheduler
         fit_model_args = dict(X_train=X_train, y_train=y_train, **kwargs)
         predict_proba_args = dict(X=X_val)
         model_trial.fit_and_save_model(
@@ -6,6 +6,7 @@ Unknown categories are returned as None in inverse transforms. Always converts i
 from numbers import Integral
 
 import numpy as np
+import pandas as pd
 from scipy import sparse
 
 from sklearn.base import BaseEstimator, TransformerMixin
@@ -15,7 +16,9 @@ from sklearn.utils.validation import check_is_fitted
 
 __all__ = [
     'OneHotMergeRaresHandleUnknownEncoder',
-    'OrdinalMergeRaresHandleUnknownEncoder'
+    'OrdinalMergeRaresHandleUnknownEncoder',
+    'CategoryCodeOneHotEncoder',
+    'CategoryCodeOrdinalEncoder',
 ]
 
 
@@ -819,3 +822,148 @@ class OrdinalMergeRaresHandleUnknownEncoder(_BaseEncoder):
         return X_tr
 
 
+class _BaseCategoryCodeEncoder(BaseEstimator, TransformerMixin):
+    """
+    Base class for encoders operating directly on the integer codes of pandas categorical columns.
+    Avoids the conversion of categorical values to strings done by the encoders above.
+
+    During fit, a lookup table is computed for each feature that maps the raw index of each category to its output
+    level: raw index 0 is the missing value, raw indices 1 to n correspond to the categories of the training dtype,
+    and raw index n + 1 corresponds to categories unknown at fit time.
+    Missing values are treated as their own category. Categories which do not occur in the training data are treated as
+    unknown. The most frequent `max_levels` categories are kept, the remaining (infrequent) categories are merged into a
+    single level following the frequent ones.
+    Levels follow the order of the categories of the training dtype, preceded by missing values. The output is identical
+    to that of the string encoders above if the string representations of the categories sort in the same order,
+    and otherwise only differs in the order of the levels.
+
+    Attributes
+    ----------
+    categories_ : list of pandas.Index
+        The categories of the training dtype of each feature.
+    lookups_ : list of arrays
+        ``lookups_[i]`` maps raw indices of feature i to output levels. Unknown categories map to level
+        ``n_levels_[i]``.
+    n_levels_ : list of int
+        Number of known output levels of each feature (frequent categories, plus one if infrequent categories were
+        merged).
+    n_frequent_ : list of int
+        Number of frequent categories kept for each feature.
+    """
+
+    def __init__(self, max_levels=None, dtype=np.float64):
+        self.max_levels = max_levels
+        self.dtype = dtype
+
+    def fit(self, X, y=None):
+        if self.max_levels is not None and (
+            (not isinstance(self.max_levels, Integral) or self.max_levels <= 0)
+        ):
+            raise ValueError(
+                f"max_levels must be None or a strictly positive int, got {self.max_levels}."
+            )
+        self.categories_ = []
+        self.lookups_ = []
+        self.n_levels_ = []
+        self.n_frequent_ = []
+        for column in self._get_columns(X):
+            column = self._to_categorical(column)
+            categories = column.cat.categories
+            num_categories = len(categories)
+            counts = np.bincount(column.cat.codes.values + 1, minlength=num_categories + 1)
+            present = np.flatnonzero(counts)
+            if self.max_levels is not None and len(present) > self.max_levels:
+                frequent = np.sort(present[np.argsort(-counts[present], kind='stable')[:self.max_levels]])
+                has_infrequent = True
+            else:
+                frequent = present
+                has_infrequent = False
+            n_levels = len(frequent) + int(has_infrequent)
+            lookup = np.full(num_categories + 2, n_levels, dtype=np.int64)  # unknown level
+            if has_infrequent:
+                lookup[present] = len(frequent)  # merged infrequent level
+            lookup[frequent] = np.arange(len(frequent))
+            self.categories_.append(categories)
+            self.lookups_.append(lookup)
+            self.n_levels_.append(n_levels)
+            self.n_frequent_.append(len(frequent))
+        return self
+
+    @staticmethod
+    def _get_columns(X):
+        if not isinstance(X, pd.DataFrame):
+            X = pd.DataFrame(X)
+        return [X.iloc[:, i] for i in range(X.shape[1])]
+
+    @staticmethod
+    def _to_categorical(column):
+        if column.dtype.name != 'category':
+            column = column.astype('category')
+        return column
+
+    def _get_levels(self, X):
+        """ Returns an int array of shape [n_samples, n_features] containing the output level of each value. """
+        columns = self._get_columns(X)
+        if len(columns) != len(self.categories_):
+            raise ValueError(
+                f"The number of features in X is different to the number of features of the fitted data. "
+                f"The fitted data had {len(self.categories_)} features and the X has {len(columns)} features."
+            )
+        X_levels = np.empty((len(X), len(columns)), dtype=np.int64)
+        for i, column in enumerate(columns):
+            column = self._to_categorical(column)
+            raw_index = column.cat.codes.values.astype(np.int64) + 1
+            categories = column.cat.categories
+            if not categories.equals(self.categories_[i]):
+                # Map the categories of this dtype to the raw indices of the training dtype, unknown categories to n + 1
+                category_map = self.categories_[i].get_indexer(categories) + 1
+                category_map[category_map == 0] = len(self.categories_[i]) + 1
+                raw_index = np.concatenate([[0], category_map])[raw_index]
+            X_levels[:, i] = self.lookups_[i][raw_index]
+        return X_levels
+
+
+class CategoryCodeOneHotEncoder(_BaseCategoryCodeEncoder):
+    """ One-hot encodes pandas categorical columns via their category codes.
+        Equivalent to OneHotMergeRaresHandleUnknownEncoder without the string conversion.
+        Unknown categories encountered at test-time are encoded as all zeros vector.
+
+    Parameters
+    ----------
+    max_levels : int, default=None
+        Maximum number of frequent categories to keep per feature. Infrequent categories are grouped together into one
+        extra column.
+    sparse : bool, default=True
+        Will return sparse matrix if set True else will return an array.
+    dtype : number type, default=np.float64
+        Desired dtype of output.
+    """
+
+    def __init__(self, max_levels=None, sparse=True, dtype=np.float64):
+        super().__init__(max_levels=max_levels, dtype=dtype)
+        self.sparse = sparse
+
+    def transform(self, X):
+        X_levels = self._get_levels(X)
+        n_samples, n_features = X_levels.shape
+        n_columns = np.array(self.n_levels_)
+        feature_offsets = np.concatenate([[0], np.cumsum(n_columns)])
+        X_mask = X_levels < n_columns  # Unknown categories are encoded as all zeros
+        indices = (X_levels + feature_offsets[:-1])[X_mask]
+        indptr = np.concatenate([[0], X_mask.sum(axis=1).cumsum()])
+        data = np.ones(len(indices), dtype=self.dtype)
+        out = sparse.csr_matrix((data, indices, indptr), shape=(n_samples, feature_offsets[-1]), dtype=self.dtype)
+        return out if self.sparse else out.toarray()
+
+
+class CategoryCodeOrdinalEncoder(_BaseCategoryCodeEncoder):
+    """ Ordinal encodes pandas categorical columns via their category codes, for use with embedding layers.
+        Equivalent to OrdinalMergeRaresHandleUnknownEncoder without the string conversion.
+        Returns levels 0 to n_frequent_[i] - 1 for frequent categories, infrequent and unknown categories are both
+        mapped to n_frequent_[i].
+        Embedding layers should be able to take in n_frequent_[i] + 1 categories!
+    """
+
+    def transform(self, X):
+        X_levels = np.minimum(self._get_levels(X), np.array(self.n_frequent_))
+        return X_levels.astype(self.dtype, copy=False)
@@ -19,6 +19,10 @@ def get_fixed_params():
         # Options: [10, 100, 200, 300, 400, 500, 1000, 10000]
         'proc.skew_threshold': 0.99,  # numerical features whose absolute skewness is greater than this receive special power-transform preprocessing. Choose big value to avoid using power-transforms
         # Options: [0.2, 0.3, 0.5, 0.8, 1.0, 10.0, 100.0]
+        # encode features of pandas category dtype directly from their integer codes rather than converting their values
+        # to strings first
+        'proc.use_category_codes': True,
+        # Options: [True, False]
         # Old params: These are now set based off of nthreads_per_trial, ngpus_per_trial.
         # 'num_dataloading_workers': 1,  # Will be overwritten by nthreads_per_trial, can be >= 1
         # 'ctx': mx.cpu(),  # Will be overwritten by ngpus_per_trial if unspecified (can alternatively be: mx.gpu())
@@ -0,0 +1,79 @@
+import numpy as np
+import mxnet as mx
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+
+class FastTabularNNProcessor:
+    """ Compiled form of the fitted ColumnTransformer of a TabularNeuralNetModel, used for low-latency prediction on
+        small inputs.
+        Continuous features are imputed and scaled with precomputed NumPy arrays rather than through the sklearn
+        Pipeline. Other transformers are applied directly to their columns, skipping the validation and dispatch
+        overhead of ColumnTransformer.
+        The output is the formatted batch dict expected by EmbedNet, equivalent to TabularNNDataset.format_batch_data()
+        on the same rows.
+    """
+    def __init__(self, processor, feature_arraycol_map, feature_type_map):
+        # list of (features, transform_func, transform_args) applied in the order of processor.transformers_
+        self.steps = []
+        for name, transformer, features in processor.transformers_:
+            if name == 'remainder' or len(features) == 0:
+                continue
+            continuous_args = self._get_continuous_args(transformer)
+            if continuous_args is not None:
+                self.steps.append((features, self._transform_continuous, continuous_args))
+            else:
+                self.steps.append((features, self._transform_generic, transformer))
+
+        # Same column selection as in TabularNNDataset
+        self.vector_inds = []
+        self.embed_inds = []
+        for feature, feature_type in feature_type_map.items():
+            if feature_type == 'vector':
+                self.vector_inds += feature_arraycol_map[feature]
+            elif feature_type == 'embed':
+                self.embed_inds.append(feature_arraycol_map[feature])
+            else:
+                raise ValueError(f"feature type not supported by FastTabularNNProcessor: {feature_type}")
+        self.vector_inds = np.array(self.vector_inds, dtype=np.int64)
+
+    @staticmethod
+    def _get_continuous_args(transformer):
+        """ Returns (fill_values, mean, scale) if transformer is an imputer followed by a scaler, else None """
+        if not isinstance(transformer, Pipeline) or len(transformer.steps) != 2:
+            return None
+        imputer, scaler = transformer.steps[0][1], transformer.steps[1][1]
+        if not isinstance(imputer, SimpleImputer) or not isinstance(scaler, StandardScaler):
+            return None
+        fill_values = imputer.statistics_.astype(np.float64)
+        if np.isnan(fill_values).any() or imputer.add_indicator:
+            return None  # SimpleImputer drops features whose fill value is NaN, keep the sklearn behaviour in this case
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(len(fill_values))
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(len(fill_values))
+        return fill_values, mean, scale
+
+    @staticmethod
+    def _transform_continuous(X, args):
+        fill_values, mean, scale = args
+        X = X.astype(np.float64).values  # Missing values of nullable dtypes are converted to NaN
+        X = np.where(np.isnan(X), fill_values, X)
+        return (X - mean) / scale
+
+    @staticmethod
+    def _transform_generic(X, transformer):
+        return transformer.transform(X)
+
+    def transform_array(self, X):
+        """ Returns 2D numpy array identical to processor.transform(X) """
+        return np.hstack([func(X[features], args) for features, func, args in self.steps])
+
+    def transform(self, X, ctx):
+        X = self.transform_array(X)
+        data_batch = {}
+        if len(self.vector_inds) > 0:
+            data_batch['vector'] = mx.nd.array(X[:, self.vector_inds], dtype='float32', ctx=ctx)
+        if len(self.embed_inds) > 0:
+            data_batch['embed'] = [mx.nd.array(X[:, embed_ind], dtype='int32', ctx=ctx)
+                                   for embed_ind in self.embed_inds]
+        return data_batch
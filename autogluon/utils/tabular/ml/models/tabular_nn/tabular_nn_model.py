@@ -7,7 +7,13 @@
     Vectors produced by different input layers are then concatenated and passed to multi-layer MLP model with problem_type determined output layer.
     Hyperparameters are passed as dict params, including options for preprocessing stages.
 """
-import random, json, time, os, logging, warnings
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import warnings
 from collections import OrderedDict
 
 import numpy as np
@@ -20,18 +26,17 @@ from sklearn.pipeline import Pipeline
 from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler, QuantileTransformer, FunctionTransformer  # PowerTransformer
 
-from ......core import Space
-from ......utils import try_import_mxboard
+from ......utils.try_import import try_import_mxboard
 from ....utils.loaders import load_pkl
 from ..abstract.abstract_model import AbstractModel, fixedvals_from_searchspaces
 from ...constants import BINARY, MULTICLASS, REGRESSION, SOFTCLASS
 from ....metrics import log_loss, roc_auc
-from .categorical_encoders import OneHotMergeRaresHandleUnknownEncoder, OrdinalMergeRaresHandleUnknownEncoder
+from .categorical_encoders import OneHotMergeRaresHandleUnknownEncoder, OrdinalMergeRaresHandleUnknownEncoder, \
+    CategoryCodeOneHotEncoder, CategoryCodeOrdinalEncoder
 from .tabular_nn_dataset import TabularNNDataset
+from .tabular_nn_fast_processor import FastTabularNNProcessor
 from .embednet import EmbedNet
-from .tabular_nn_trial import tabular_nn_trial
 from .hyperparameters.parameters import get_default_param
-from .hyperparameters.searchspaces import get_default_searchspace
 
 warnings.filterwarnings("ignore", module='sklearn.preprocessing') # sklearn processing n_quantiles warning
 logger = logging.getLogger(__name__)
@@ -81,6 +86,9 @@ class TabularNeuralNetModel(AbstractModel):
         self.feature_arraycol_map = None
         self.feature_type_map = None
         self.processor = None # data processor
+        # compiled version of self.processor used for low-latency prediction on small inputs,
+        # see _compile_fast_processor()
+        self._fast_processor = None
         self.summary_writer = None
         self.ctx = mx.cpu()
         self.batch_size = None
@@ -89,6 +97,7 @@ class TabularNeuralNetModel(AbstractModel):
         self.params_post_fit = None
         self.num_net_outputs = None
         self._architecture_desc = None
+        self._inference_params = None  # Network architecture and parameters, set by convert_to_inference_model()
         self.optimizer = None
         self.verbosity = None
         if self.stopping_metric is not None and self.eval_metric == roc_auc and self.stopping_metric == log_loss:
@@ -96,6 +105,10 @@ class TabularNeuralNetModel(AbstractModel):
 
         self.eval_metric_name = self.stopping_metric.name
 
+    # The autograd recording state and the random state of MXNet are shared by all threads of the process
+    def can_fit_concurrently(self):
+        return False
+
     def _set_default_params(self):
         """ Specifies hyperparameter values to use by default """
         default_params = get_default_param(self.problem_type)
@@ -105,12 +118,16 @@ class TabularNeuralNetModel(AbstractModel):
     def _set_default_auxiliary_params(self):
         default_auxiliary_params = dict(
             ignored_feature_types_special=['text_ngram', 'text_as_category'],
+            # inputs with at most this many rows skip TabularNNDataset and the DataLoader during prediction.
+            # Set to 0 to disable.
+            fast_predict_max_rows=512,
         )
         for key, value in default_auxiliary_params.items():
             self._set_default_param_value(key, value, params=self.params_aux)
         super()._set_default_auxiliary_params()
 
     def _get_default_searchspace(self):
+        from .hyperparameters.searchspaces import get_default_searchspace
         return get_default_searchspace(self.problem_type, num_classes=None)
 
     def set_net_defaults(self, train_dataset, params):
@@ -415,6 +432,8 @@ class TabularNeuralNetModel(AbstractModel):
                 process (bool): should new data be processed (if False, new_data must be TabularNNDataset)
                 predict_proba (bool): should we output class-probabilities (not used for regression)
         """
+        if process and len(new_data) <= self.params_aux.get('fast_predict_max_rows', 0):
+            return self._predict_tabular_data_fast(new_data, predict_proba=predict_proba)
         if process:
             new_data = self.process_test_data(new_data, batch_size=self.batch_size, num_dataloading_workers=self.num_dataloading_workers_inference, labels=None)
         if not isinstance(new_data, TabularNNDataset):
@@ -444,12 +463,38 @@ class TabularNeuralNetModel(AbstractModel):
 
         return preds.asnumpy()  # return 2D numpy array
 
+    def _predict_tabular_data_fast(self, new_data, predict_proba=True):
+        """ Low-latency version of _predict_tabular_data for small DataFrames.
+            Processes new_data with the compiled preprocessor and passes all rows to the network in a single batch,
+            avoiding the construction of a TabularNNDataset and DataLoader.
+        """
+        if set(new_data.columns) != set(self.features):
+            raise ValueError("Column names in provided Dataframe do not match self.features")
+        if self._fast_processor is None:
+            self._fast_processor = self._compile_fast_processor()
+        data_batch = self._fast_processor.transform(new_data, ctx=self.ctx)
+        preds = self.model(data_batch)
+        if self.problem_type != REGRESSION:
+            preds = nd.softmax(preds, axis=1) if predict_proba else nd.argmax(preds, axis=1, keepdims=True)
+        if self.problem_type == REGRESSION or not predict_proba:
+            return preds.asnumpy().flatten()
+        elif self.problem_type == BINARY:
+            return preds[:, 1].asnumpy()
+        return preds.asnumpy()
+
+    def _compile_fast_processor(self):
+        if (self.processor is None or self.feature_arraycol_map is None or self.feature_type_map is None):
+            raise ValueError("Need to process training data before test data")
+        return FastTabularNNProcessor(processor=self.processor, feature_arraycol_map=self.feature_arraycol_map,
+                                      feature_type_map=self.feature_type_map)
+
     def generate_datasets(self, X_train, y_train, params, X_val=None, y_val=None):
         impute_strategy = params['proc.impute_strategy']
         max_category_levels = params['proc.max_category_levels']
         skew_threshold = params['proc.skew_threshold']
         embed_min_categories = params['proc.embed_min_categories']
         use_ngram_features = params['use_ngram_features']
+        use_category_codes = params['proc.use_category_codes']
 
         if isinstance(X_train, TabularNNDataset):
             train_dataset = X_train
@@ -460,6 +505,7 @@ class TabularNeuralNetModel(AbstractModel):
             train_dataset = self.process_train_data(
                 df=X_train, labels=y_train, batch_size=self.batch_size, num_dataloading_workers=self.num_dataloading_workers,
                 impute_strategy=impute_strategy, max_category_levels=max_category_levels, skew_threshold=skew_threshold, embed_min_categories=embed_min_categories, use_ngram_features=use_ngram_features,
+                use_category_codes=use_category_codes,
             )
         if X_val is None:
             val_dataset = None
@@ -493,7 +539,8 @@ class TabularNeuralNetModel(AbstractModel):
                                 batch_size=batch_size, num_dataloading_workers=num_dataloading_workers,
                                 problem_type=self.problem_type, labels=labels, is_test=True)
 
-    def process_train_data(self, df, batch_size, num_dataloading_workers, impute_strategy, max_category_levels, skew_threshold, embed_min_categories, use_ngram_features, labels):
+    def process_train_data(self, df, batch_size, num_dataloading_workers, impute_strategy, max_category_levels,
+                           skew_threshold, embed_min_categories, use_ngram_features, labels, use_category_codes=False):
         """ Preprocess training data and create self.processor object that can be used to process future data.
             This method should only be used once per TabularNeuralNetModel object, otherwise will produce Warning.
 
@@ -516,7 +563,10 @@ class TabularNeuralNetModel(AbstractModel):
         logger.log(15, "AutoGluon Neural Network infers features are of the following types:")
         logger.log(15, json.dumps(self.types_of_features, indent=4))
         logger.log(15, "\n")
-        self.processor = self._create_preprocessor(impute_strategy=impute_strategy, max_category_levels=max_category_levels)
+        self.processor = self._create_preprocessor(impute_strategy=impute_strategy,
+                                                   max_category_levels=max_category_levels,
+                                                   use_category_codes=use_category_codes)
+        self._fast_processor = None
         df = self.processor.fit_transform(df) # 2D numpy array
         self.feature_arraycol_map = self._get_feature_arraycol_map(max_category_levels=max_category_levels) # OrderedDict of feature-name -> list of column-indices in df corresponding to this feature
         num_array_cols = np.sum([len(self.feature_arraycol_map[key]) for key in self.feature_arraycol_map]) # should match number of columns in processed array
@@ -615,7 +665,7 @@ class TabularNeuralNetModel(AbstractModel):
 
     def _get_feature_arraycol_map(self, max_category_levels):
         """ Returns OrderedDict of feature-name -> list of column-indices in processed data array corresponding to this feature """
-        feature_preserving_transforms = {'continuous', 'skewed', 'ordinal', 'language'}
+        feature_preserving_transforms = {'continuous', 'skewed', 'ordinal', 'ordinal_codes', 'language'}
         feature_arraycol_map = {} # unordered version
         current_colindex = 0
         for transformer in self.processor.transformers_:
@@ -643,6 +693,18 @@ class TabularNeuralNetModel(AbstractModel):
                     # print("feature: %s, oh_dimensionality: %s" % (feature, oh_dimensionality)) # TODO! debug
                     feature_arraycol_map[feature] = list(range(current_colindex, current_colindex+oh_dimensionality))
                     current_colindex += oh_dimensionality
+            elif transformer_name == 'onehot_codes':
+                oh_encoder = transformer[1]
+                for i in range(len(transformed_features)):
+                    feature = transformed_features[i]
+                    if feature in feature_arraycol_map:
+                        raise ValueError(
+                            f"same feature is processed by two different column transformers: {feature}"
+                        )
+
+                    oh_dimensionality = oh_encoder.n_levels_[i]
+                    feature_arraycol_map[feature] = list(range(current_colindex, current_colindex+oh_dimensionality))
+                    current_colindex += oh_dimensionality
             else:
                 raise ValueError(f"unknown transformer encountered: {transformer_name}")
         if set(feature_arraycol_map.keys()) != set(self.features):
@@ -666,8 +728,12 @@ class TabularNeuralNetModel(AbstractModel):
                 raise ValueError("unknown feature type encountered")
         return feature_type_map
 
-    def _create_preprocessor(self, impute_strategy, max_category_levels):
-        """ Defines data encoders used to preprocess different data types and creates instance variable which is sklearn ColumnTransformer object """
+    def _create_preprocessor(self, impute_strategy, max_category_levels, use_category_codes=False):
+        """ Defines data encoders used to preprocess different data types and creates instance variable which is
+            sklearn ColumnTransformer object.
+            If use_category_codes, features of pandas category dtype are encoded directly from their category codes
+            instead of being converted to strings first.
+        """
         if self.processor is not None:
             Warning("Attempting to process training data for TabularNeuralNetModel, but previously already did this.")
         continuous_features = self.types_of_features['continuous']
@@ -675,6 +741,15 @@ class TabularNeuralNetModel(AbstractModel):
         onehot_features = self.types_of_features['onehot']
         embed_features = self.types_of_features['embed']
         language_features = self.types_of_features['language']
+        if use_category_codes:
+            category_features = set(self.feature_types_metadata.feature_types_raw['category'])
+            onehot_code_features = [feature for feature in onehot_features if feature in category_features]
+            embed_code_features = [feature for feature in embed_features if feature in category_features]
+            onehot_features = [feature for feature in onehot_features if feature not in category_features]
+            embed_features = [feature for feature in embed_features if feature not in category_features]
+        else:
+            onehot_code_features = []
+            embed_code_features = []
         transformers = [] # order of various column transformers in this list is important!
         if len(continuous_features) > 0:
             continuous_transformer = Pipeline(steps=[
@@ -694,12 +769,21 @@ class TabularNeuralNetModel(AbstractModel):
                 ('imputer', SimpleImputer(strategy='constant', fill_value=self.unique_category_str)),
                 ('onehot', OneHotMergeRaresHandleUnknownEncoder(max_levels=max_category_levels, sparse=False))]) # test-time unknown values will be encoded as all zeros vector
             transformers.append( ('onehot', onehot_transformer, onehot_features) )
+        if len(onehot_code_features) > 0:
+            # test-time unknown values will be encoded as all zeros vector
+            onehot_code_transformer = CategoryCodeOneHotEncoder(max_levels=max_category_levels, sparse=False)
+            transformers.append(('onehot_codes', onehot_code_transformer, onehot_code_features))
         if len(embed_features) > 0: # Ordinal transformer applied to convert to-be-embedded categorical features to integer levels
             ordinal_transformer = Pipeline(steps=[
                 ('to_str', FunctionTransformer(self.convert_df_dtype_to_str)),
                 ('imputer', SimpleImputer(strategy='constant', fill_value=self.unique_category_str)),
                 ('ordinal', OrdinalMergeRaresHandleUnknownEncoder(max_levels=max_category_levels))]) # returns 0-n when max_category_levels = n-1. category n is reserved for unknown test-time categories.
             transformers.append( ('ordinal', ordinal_transformer, embed_features) )
+        if len(embed_code_features) > 0:
+            # same levels as OrdinalMergeRaresHandleUnknownEncoder,
+            # category n is reserved for unknown test-time categories.
+            ordinal_code_transformer = CategoryCodeOrdinalEncoder(max_levels=max_category_levels)
+            transformers.append(('ordinal_codes', ordinal_code_transformer, embed_code_features))
         if len(language_features) > 0:
             raise NotImplementedError("language_features cannot be used at the moment")
         return ColumnTransformer(transformers=transformers) # numeric features are processed in the same order as in numeric_features vector, so feature-names remain the same.
@@ -748,7 +832,42 @@ class TabularNeuralNetModel(AbstractModel):
             obj.summary_writer = None
         return obj
 
+    # Stores the architecture and parameters of the network in the model object,
+    # so that the model can be pickled as a single object, as in inference artifacts.
+    def convert_to_inference_model(self):
+        super().convert_to_inference_model()
+        if self.model is not None:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                params_filepath = os.path.join(temp_dir, self.params_file_name)
+                self.model.save_parameters(params_filepath)
+                with open(params_filepath, 'rb') as f:
+                    self._inference_params = dict(architecture_desc=self.model.architecture_desc, params=f.read())
+
+    # Only inference models are pickled without their network,
+    # it is recreated from self._inference_params when unpickled.
+    # Other models are pickled and copied as is, save() stores the parameters in a separate file.
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if getattr(self, '_inference_params', None) is not None:
+            state['model'] = None
+            state['summary_writer'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        inference_params = getattr(self, '_inference_params', None)
+        if inference_params is not None and self.model is None:
+            self.model = EmbedNet(architecture_desc=inference_params['architecture_desc'], ctx=self.ctx)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                params_filepath = os.path.join(temp_dir, self.params_file_name)
+                with open(params_filepath, 'wb') as f:
+                    f.write(inference_params['params'])
+                self.model.load_parameters(params_filepath, ctx=self.ctx)
+
     def hyperparameter_tune(self, X_train, y_train, X_val, y_val, scheduler_options, **kwargs):
+        # Imported here, so that loading fitted models does not import the search spaces and the scheduler
+        from .tabular_nn_trial import tabular_nn_trial
+        from ......core import Space
         time_start = time.time()
         """ Performs HPO and sets self.params to best hyperparameter values """
         self.verbosity = kwargs.get('verbosity', 2)
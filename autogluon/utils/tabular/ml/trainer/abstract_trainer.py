@@ -1,9 +1,13 @@
 import copy, time, traceback, logging, json
+import contextvars
+import multiprocessing
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from typing import List
 import networkx as nx
 import numpy as np
 import pandas as pd
+import psutil
 from pandas import DataFrame, Series
 from collections import defaultdict
 
@@ -11,6 +15,7 @@ from ..constants import AG_ARGS, AG_ARGS_FIT, BINARY, MULTICLASS, REGRESSION, SO
 from ...utils.loaders import load_pkl
 from ...utils.savers import save_pkl, save_json
 from ...utils.exceptions import TimeLimitExceeded, NotEnoughMemoryError, NoValidFeatures
+from ...utils.profiler import profile
 from ..utils import get_pred_from_proba, dd_list, generate_train_test_split, shuffle_df_rows, infer_eval_metric, default_holdout_frac
 from ..models.abstract.abstract_model import AbstractModel
 from ...metrics import accuracy, log_loss, root_mean_squared_error, scorer_expects_y_pred
@@ -30,7 +35,6 @@ logger = logging.getLogger(__name__)
 #  If kfold = 5, scores are 0.9, 0.85, 0.8, 0.75, and 0.7, the score is not 0.8! It is much lower because probs are combined together and AUC is recalculated
 #  Do we want this to happen? Should we calculate score by 5 separate scores and then averaging instead?
 
-# TODO: Dynamic model loading for ensemble models during prediction, only load more models if prediction is uncertain. This dynamically reduces inference time.
 # TODO: Try midstack Semi-Supervised. Just take final models and re-train them, use bagged preds for SS rows. This would be very cheap and easy to try.
 class AbstractTrainer:
     trainer_file_name = 'trainer.pkl'
@@ -40,7 +44,8 @@ class AbstractTrainer:
 
     def __init__(self, path: str, problem_type: str, scheduler_options=None, eval_metric=None, stopping_metric=None,
                  num_classes=None, low_memory=False, feature_types_metadata=None, kfolds=0, n_repeats=1,
-                 stack_ensemble_levels=0, time_limit=None, save_data=False, save_bagged_folds=True, random_seed=0, verbosity=2):
+                 stack_ensemble_levels=0, time_limit=None, save_data=False, save_bagged_folds=True, random_seed=0,
+                 max_models_concurrent=1, verbosity=2):
         self.path = path
         self.problem_type = problem_type
         self.feature_types_metadata = feature_types_metadata
@@ -90,6 +95,10 @@ class AbstractTrainer:
             self.stack_mode = False
             self.n_repeats = 1
         self.save_bagged_folds = save_bagged_folds
+        # Maximum number of models of a stack level to train at the same time. 1 trains models one after another.
+        self.max_models_concurrent = max_models_concurrent
+        # Additional models are only started concurrently if at least this ratio of system memory is available.
+        self.min_mem_available_ratio_concurrent = 0.2
 
         self.hyperparameters = {}  # TODO: This is currently required for fetching stacking layer models. Consider incorporating more elegantly
 
@@ -135,6 +144,9 @@ class AbstractTrainer:
         self.is_data_saved = False
 
         self.regress_preds_asprobas = False  # whether to treat regression predictions as class-probabilities (during distillation)
+        # Child models skipped by each bagged model and base models skipped by each weighted ensemble during the last
+        # prediction with early_exit_tol, keys = model names
+        self.early_exit_info = {}
 
     # path_root is the directory containing learner.pkl
     @property
@@ -235,7 +247,10 @@ class AbstractTrainer:
     def train(self, X_train, y_train, X_val=None, y_val=None, **kwargs):
         raise NotImplementedError
 
-    def train_single(self, X_train, y_train, X_val, y_val, model, kfolds=None, k_fold_start=0, k_fold_end=None, n_repeats=None, n_repeat_start=0, level=0, time_limit=None):
+    # num_cpus overrides the number of CPUs of the scheduler, such as when the CPUs are divided between models.
+    # Models limit their threads to the number of CPUs, so nthreads_per_trial also applies to fits without HPO.
+    def train_single(self, X_train, y_train, X_val, y_val, model, kfolds=None, k_fold_start=0, k_fold_end=None,
+                     n_repeats=None, n_repeat_start=0, level=0, time_limit=None, num_cpus=None):
         if kfolds is None:
             kfolds = self.kfolds
         if n_repeats is None:
@@ -247,20 +262,41 @@ class AbstractTrainer:
             model_fit_kwargs = {'verbosity': self.verbosity,
                                 'num_cpus': self.scheduler_options['resource']['num_cpus'],
                                 'num_gpus': self.scheduler_options['resource']['num_gpus']}  # Additional configurations for model.fit
+        if num_cpus is not None:
+            model_fit_kwargs['num_cpus'] = num_cpus
         if self.bagged_mode or isinstance(model, WeightedEnsembleModel):
-            model.fit(X=X_train, y=y_train, k_fold=kfolds, k_fold_start=k_fold_start, k_fold_end=k_fold_end, n_repeats=n_repeats, n_repeat_start=n_repeat_start, compute_base_preds=False, time_limit=time_limit, **model_fit_kwargs)
+            model.fit(X=X_train, y=y_train, k_fold=kfolds, k_fold_start=k_fold_start, k_fold_end=k_fold_end,
+                      n_repeats=n_repeats, n_repeat_start=n_repeat_start, compute_base_preds=False,
+                      time_limit=time_limit, **model_fit_kwargs)
         else:
-            model.fit(X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val, time_limit=time_limit, **model_fit_kwargs)
+            model.fit(X_train=X_train, y_train=y_train, X_val=X_val, y_val=y_val, time_limit=time_limit,
+                      **model_fit_kwargs)
         return model
 
-    def train_and_save(self, X_train, y_train, X_val, y_val, model: AbstractModel, stack_name='core', kfolds=None, k_fold_start=0, k_fold_end=None, n_repeats=None, n_repeat_start=0, level=0, time_limit=None):
+    def train_and_save(self, X_train, y_train, X_val, y_val, model: AbstractModel, stack_name='core', kfolds=None,
+                       k_fold_start=0, k_fold_end=None, n_repeats=None, n_repeat_start=0, level=0, time_limit=None):
+        model = self._train_and_save_model(X_train, y_train, X_val, y_val, model, kfolds=kfolds,
+                                           k_fold_start=k_fold_start, k_fold_end=k_fold_end, n_repeats=n_repeats,
+                                           n_repeat_start=n_repeat_start, level=level, time_limit=time_limit)
+        if model is None:
+            return []
+        self.add_model(model=model, stack_name=stack_name, level=level)
+        model_names_trained = [model.name]
+        if self.low_memory:
+            del model
+        return model_names_trained
+
+    # Fits, scores and saves the model. Returns the model, or None if it failed to train.
+    # Does not add the model to the trainer.
+    def _train_and_save_model(self, X_train, y_train, X_val, y_val, model: AbstractModel, kfolds=None, k_fold_start=0,
+                              k_fold_end=None, n_repeats=None, n_repeat_start=0, level=0, time_limit=None,
+                              num_cpus=None):
         fit_start_time = time.time()
-        model_names_trained = []
         try:
             if time_limit is not None:
                 if time_limit <= 0:
                     logging.log(15, f'Skipping {str(model.name)} due to lack of time remaining.')
-                    return model_names_trained
+                    return None
                 time_left_total = self.time_limit - (fit_start_time - self.time_train_start)
                 logging.log(
                     20,
@@ -269,7 +305,9 @@ class AbstractTrainer:
 
             else:
                 logging.log(20, f'Fitting model: {str(model.name)} ...')
-            model = self.train_single(X_train, y_train, X_val, y_val, model, kfolds=kfolds, k_fold_start=k_fold_start, k_fold_end=k_fold_end, n_repeats=n_repeats, n_repeat_start=n_repeat_start, level=level, time_limit=time_limit)
+            model = self.train_single(X_train, y_train, X_val, y_val, model, kfolds=kfolds, k_fold_start=k_fold_start,
+                                      k_fold_end=k_fold_end, n_repeats=n_repeats, n_repeat_start=n_repeat_start,
+                                      level=level, time_limit=time_limit, num_cpus=num_cpus)
             fit_end_time = time.time()
             if isinstance(model, BaggedEnsembleModel):
                 score = (
@@ -291,6 +329,7 @@ class AbstractTrainer:
             model.val_score = score
             # TODO: Add recursive=True to avoid repeatedly loading models each time this is called for bagged ensembles (especially during repeated bagging)
             self.save_model(model=model)
+            return model
         except TimeLimitExceeded:
             logger.log(20, f'\tTime limit exceeded... Skipping {model.name}.')
             # logger.log(20, '\tTime wasted: ' + str(time.time() - fit_start_time))
@@ -310,12 +349,7 @@ class AbstractTrainer:
 
             logger.log(20, err)
             del model
-        else:
-            self.add_model(model=model, stack_name=stack_name, level=level)
-            model_names_trained.append(model.name)
-            if self.low_memory:
-                del model
-        return model_names_trained
+        return None
 
     def add_model(self, model: AbstractModel, stack_name: str, level: int):
         stack_loc = self.models_level[stack_name]  # TODO: Consider removing, have train_multi handle this
@@ -469,6 +503,11 @@ class AbstractTrainer:
     # TODO: Robert dataset, LightGBM is super good but RF and KNN take all the time away from it on 1h despite being much worse
     # TODO: Add time_limit_per_model
     def train_multi_fold(self, X_train, y_train, X_val, y_val, models: List[AbstractModel], hyperparameter_tune=True, feature_prune=False, stack_name='core', kfolds=None, k_fold_start=0, k_fold_end=None, n_repeats=None, n_repeat_start=0, level=0, time_limit=None):
+        if self.max_models_concurrent > 1 and len(models) > 1 and not hyperparameter_tune and not feature_prune:
+            return self.train_multi_fold_concurrent(X_train, y_train, X_val, y_val, models, stack_name=stack_name,
+                                                    kfolds=kfolds, k_fold_start=k_fold_start, k_fold_end=k_fold_end,
+                                                    n_repeats=n_repeats, n_repeat_start=n_repeat_start, level=level,
+                                                    time_limit=time_limit)
         models_valid = []
         time_start = time.time()
         for i, model in enumerate(models):
@@ -492,6 +531,88 @@ class AbstractTrainer:
 
         return models_valid
 
+    # Trains the models of a stack level concurrently with up to max_models_concurrent worker threads,
+    # dividing the CPU cores between them. New models are only started while enough memory is available.
+    # Each model that starts receives its share of the worker time left in the level, after subtracting the time
+    # reserved by the running models. Time left unused by models that finish early thereby goes to later models.
+    # Models that cannot be fit concurrently, such as MXNet neural networks, are trained one after another with all
+    # cores once the other models finished.
+    # Worker threads only fit and save models, the trained models are added to the trainer in their original order
+    # afterwards so that models_level and model_graph are identical to serial training.
+    def train_multi_fold_concurrent(self, X_train, y_train, X_val, y_val, models: List[AbstractModel],
+                                    stack_name='core', kfolds=None, k_fold_start=0, k_fold_end=None, n_repeats=None,
+                                    n_repeat_start=0, level=0, time_limit=None):
+        time_start = time.time()
+        cpu_count = multiprocessing.cpu_count()
+        workers_count = max(1, min(self.max_models_concurrent, len(models), cpu_count))
+        num_cpus = max(1, cpu_count // workers_count)
+        if self.scheduler_options is not None:
+            num_cpus = min(num_cpus, self.scheduler_options['resource']['num_cpus'])
+        logger.log(20, f'Training {len(models)} models concurrently with up to {workers_count} models at a time...')
+        fit_kwargs = dict(kfolds=kfolds, k_fold_start=k_fold_start, k_fold_end=k_fold_end, n_repeats=n_repeats,
+                          n_repeat_start=n_repeat_start, level=level)
+        models_to_train = list(enumerate(models))
+        models_to_train_serially = []
+        models_trained = [None] * len(models)
+        futures = {}  # future -> (index of the model, time at which the time limit of the model ends)
+        with ThreadPoolExecutor(max_workers=workers_count) as executor:
+            while models_to_train or futures:
+                while models_to_train and len(futures) < workers_count and (
+                        not futures or self._is_memory_available_for_concurrent_fit()):
+                    i, model = models_to_train.pop(0)
+                    model = self._load_model_to_train(model, k_fold_start=k_fold_start, n_repeat_start=n_repeat_start)
+                    if not model.can_fit_concurrently():
+                        models_to_train_serially.append((i, model))
+                        continue
+                    time_left = None
+                    if time_limit is not None:
+                        time_now = time.time()
+                        time_left_level = time_limit - (time_now - time_start)
+                        time_reserved = sum(max(0, time_end - time_now) for _, time_end in futures.values())
+                        models_left = len(models_to_train) + len(models_to_train_serially) + 1
+                        time_left_workers = workers_count * time_left_level - time_reserved
+                        time_left = min(time_left_level, time_left_workers / models_left)
+                    time_end = None if time_left is None else time.time() + time_left
+                    # Worker threads run in a copy of the current context, so that they record to the active profiler
+                    future = executor.submit(contextvars.copy_context().run, self._train_and_save_model, X_train,
+                                             y_train, X_val, y_val, model, time_limit=time_left, num_cpus=num_cpus,
+                                             **fit_kwargs)
+                    futures[future] = (i, time_end)
+                if not futures:
+                    continue
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    i, _ = futures.pop(future)
+                    models_trained[i] = future.result()
+
+        if models_to_train_serially:
+            logger.log(20, f'Training {len(models_to_train_serially)} models that cannot be trained concurrently...')
+        for i, model in models_to_train_serially:
+            time_left = None if time_limit is None else time_limit - (time.time() - time_start)
+            models_trained[i] = self._train_and_save_model(X_train, y_train, X_val, y_val, model, time_limit=time_left,
+                                                           **fit_kwargs)
+
+        models_valid = []
+        for model in models_trained:
+            if model is not None:
+                self.add_model(model=model, stack_name=stack_name, level=level)
+                models_valid.append(model.name)
+        self.save()
+        return models_valid
+
+    def _load_model_to_train(self, model, k_fold_start=0, n_repeat_start=0):
+        if isinstance(model, str):
+            model = self.load_model(model)
+        elif self.low_memory:
+            model = copy.deepcopy(model)
+        if (n_repeat_start == 0) and (k_fold_start == 0):
+            model.feature_types_metadata = copy.deepcopy(self.feature_types_metadata)
+        return model
+
+    def _is_memory_available_for_concurrent_fit(self):
+        mem = psutil.virtual_memory()
+        return mem.available / mem.total >= self.min_mem_available_ratio_concurrent
+
     def train_multi(self, X_train, y_train, X_val, y_val, models: List[AbstractModel], hyperparameter_tune=True, feature_prune=False, stack_name='core', kfolds=None, n_repeats=None, n_repeat_start=0, level=0, time_limit=None):
         if kfolds is None:
             kfolds = self.kfolds
@@ -648,14 +769,14 @@ class AbstractTrainer:
             model = self.get_model_best()
             return self.predict_model(X, model)
 
-    def predict_proba(self, X, model=None):
+    def predict_proba(self, X, model=None, early_exit_tol=None):
         if model is not None:
-            return self.predict_proba_model(X, model)
+            return self.predict_proba_model(X, model, early_exit_tol=early_exit_tol)
         elif self.model_best is not None:
-            return self.predict_proba_model(X, self.model_best)
+            return self.predict_proba_model(X, self.model_best, early_exit_tol=early_exit_tol)
         else:
             model = self.get_model_best()
-            return self.predict_proba_model(X, model)
+            return self.predict_proba_model(X, model, early_exit_tol=early_exit_tol)
 
     def predict_model(self, X, model, model_pred_proba_dict=None):
         if isinstance(model, str):
@@ -670,14 +791,51 @@ class AbstractTrainer:
             y_pred = get_pred_from_proba(y_pred_proba=y_pred, problem_type=problem_type)
         return y_pred
 
-    def predict_proba_model(self, X, model, model_pred_proba_dict=None):
+    # If early_exit_tol is specified, bagged models stop evaluating their child models on rows whose prediction is
+    # already certain, see BaggedEnsembleModel.predict_proba(). Weighted ensembles evaluate their base models in
+    # descending order of weight and skip the base models whose total weight is at most early_exit_tol,
+    # see GreedyWeightedEnsembleModel.predict_proba_early_exit().
+    # The skipped models are recorded in self.early_exit_info.
+    def predict_proba_model(self, X, model, model_pred_proba_dict=None, early_exit_tol=None):
         if isinstance(model, str):
             model = self.load_model(model)
-        X = self.get_inputs_to_model(model=model, X=X, model_pred_proba_dict=model_pred_proba_dict, fit=False)
-        return model.predict_proba(X=X, preprocess=False)
+        if early_exit_tol is not None:
+            self.early_exit_info = {}
+            if isinstance(model, WeightedEnsembleModel):
+                return self._predict_proba_weighted_ensemble_early_exit(
+                    X=X, model=model, model_pred_proba_dict=model_pred_proba_dict, early_exit_tol=early_exit_tol)
+        X = self.get_inputs_to_model(model=model, X=X, model_pred_proba_dict=model_pred_proba_dict, fit=False,
+                                     early_exit_tol=early_exit_tol)
+        return self._model_predict_proba(model=model, X=X, preprocess=False, early_exit_tol=early_exit_tol)
+
+    def _model_predict_proba(self, model, X, preprocess=True, early_exit_tol=None):
+        if early_exit_tol is None or not isinstance(model, BaggedEnsembleModel):
+            return model.predict_proba(X, preprocess=preprocess)
+        y_pred_proba = model.predict_proba(X, preprocess=preprocess, early_exit_tol=early_exit_tol)
+        if model._early_exit_info is not None:
+            self.early_exit_info[model.name] = model._early_exit_info
+        return y_pred_proba
+
+    # Base model predictions are only computed when the weighted ensemble requires them, and stored in
+    # model_pred_proba_dict
+    def _predict_proba_weighted_ensemble_early_exit(self, X, model: WeightedEnsembleModel, model_pred_proba_dict=None,
+                                                    early_exit_tol=None):
+        if model_pred_proba_dict is None:
+            model_pred_proba_dict = {}
+
+        def get_base_pred_proba(base_model_name):
+            self.get_model_pred_proba_dict(X=X, models=[base_model_name], model_pred_proba_dict=model_pred_proba_dict,
+                                           early_exit_tol=early_exit_tol)
+            return model_pred_proba_dict[base_model_name]
+
+        y_pred_proba, early_exit_info = model.predict_proba_early_exit(get_base_pred_proba=get_base_pred_proba,
+                                                                       early_exit_tol=early_exit_tol)
+        self.early_exit_info[model.name] = early_exit_info
+        return y_pred_proba
 
     # Note: model_pred_proba_dict is mutated in this function to minimize memory usage
-    def get_inputs_to_model(self, model, X, model_pred_proba_dict=None, fit=False, preprocess=True):
+    def get_inputs_to_model(self, model, X, model_pred_proba_dict=None, fit=False, preprocess=True,
+                            early_exit_tol=None):
         if isinstance(model, str):
             model = self.load_model(model)
         model_level = self.get_model_level(model.name)
@@ -687,7 +845,9 @@ class AbstractTrainer:
             else:
                 model_set = self.get_minimum_model_set(model)
                 model_set = [m for m in model_set if m != model.name]  # TODO: Can probably be faster, get this result from graph
-                model_pred_proba_dict = self.get_model_pred_proba_dict(X=X, models=model_set, model_pred_proba_dict=model_pred_proba_dict, fit=fit)
+                model_pred_proba_dict = self.get_model_pred_proba_dict(
+                    X=X, models=model_set, model_pred_proba_dict=model_pred_proba_dict, fit=fit,
+                    early_exit_tol=early_exit_tol)
                 X = model.preprocess(X=X, preprocess=preprocess, fit=fit, model_pred_proba_dict=model_pred_proba_dict)
         elif preprocess:
             X = model.preprocess(X)
@@ -727,7 +887,8 @@ class AbstractTrainer:
     # Note: Mutates model_pred_proba_dict and model_pred_time_dict input if present to minimize memory usage
     # fit = get oof pred proba
     # if record_pred_time is `True`, outputs tuple of dicts (model_pred_proba_dict, model_pred_time_dict), else output only model_pred_proba_dict
-    def get_model_pred_proba_dict(self, X, models, model_pred_proba_dict=None, model_pred_time_dict=None, fit=False, record_pred_time=False):
+    def get_model_pred_proba_dict(self, X, models, model_pred_proba_dict=None, model_pred_time_dict=None, fit=False,
+                                  record_pred_time=False, early_exit_tol=None):
         if model_pred_proba_dict is None:
             model_pred_proba_dict = {}
         if model_pred_time_dict is None:
@@ -775,9 +936,11 @@ class AbstractTrainer:
                 model = self.load_model(model_name=model_name)
                 if isinstance(model, StackerEnsembleModel):
                     X_input = model.preprocess(X=X, preprocess=True, infer=False, model_pred_proba_dict=model_pred_proba_dict)
-                    model_pred_proba_dict[model_name] = model.predict_proba(X_input, preprocess=False)
+                    model_pred_proba_dict[model_name] = self._model_predict_proba(
+                        model=model, X=X_input, preprocess=False, early_exit_tol=early_exit_tol)
                 else:
-                    model_pred_proba_dict[model_name] = model.predict_proba(X)
+                    model_pred_proba_dict[model_name] = self._model_predict_proba(model=model, X=X,
+                                                                                  early_exit_tol=early_exit_tol)
 
             if record_pred_time:
                 time_end = time.time()
@@ -1010,12 +1173,14 @@ class AbstractTrainer:
         if reduce_memory:
             model.reduce_memory_size(remove_fit=True, remove_info=False, requires_save=True)
         if self.low_memory:
-            model.save()
+            with profile('save_model', model=model.name):
+                model.save()
         else:
             self.models[model.name] = model
 
     def save(self):
-        save_pkl.save(path=self.path + self.trainer_file_name, object=self)
+        with profile('save_trainer'):
+            save_pkl.save(path=self.path + self.trainer_file_name, object=self)
 
     def load_models_into_memory(self, model_names=None):
         if model_names is None:
@@ -1048,7 +1213,8 @@ class AbstractTrainer:
                 path = self.model_paths[model_name]
             if model_type is None:
                 model_type = self.model_types[model_name]
-            return model_type.load(path=path, reset_paths=self.reset_paths)
+            with profile('load_model', model=model_name):
+                return model_type.load(path=path, reset_paths=self.reset_paths)
 
     def _get_dummy_stacker(self, level, model_levels=None, use_orig_features=True):
         if model_levels is None:
@@ -1200,6 +1366,40 @@ class AbstractTrainer:
             attribute_full += self.model_graph.nodes[base_model][attribute]
         return attribute_full
 
+    # Returns dictionary of model name -> sum of the attribute over the minimum model set of the model, equivalent to calling get_model_attribute_full() for every model.
+    # Computed in a single traversal of the model graph, which avoids one graph search per model when there are many models.
+    # attribute_dict can be specified to use different attribute values than the ones stored in the model graph (such as prediction times on test data).
+    # model_graph can be specified to use a modified copy of the model graph (such as one that contains additional ensembles), defaults to self.model_graph.
+    # As in get_model_attribute_full(), the value is None if the attribute is None for any model in the minimum model set.
+    # model_set_dict can be passed to reuse the output of get_model_set_dict() across attributes of the same model_graph
+    def get_model_attribute_full_dict(self, attribute, attribute_dict=None, model_graph=None, model_set_dict=None):
+        if model_graph is None:
+            model_graph = self.model_graph
+        if attribute_dict is None:
+            attribute_dict = nx.get_node_attributes(model_graph, attribute)
+        if model_set_dict is None:
+            model_set_dict = self.get_model_set_dict(model_graph=model_graph)
+        attribute_full_dict = dict()
+        for model in model_graph.nodes:
+            attribute_values = [attribute_dict.get(base_model, None) for base_model in model_set_dict[model]]
+            if any(value is None for value in attribute_values):
+                attribute_full_dict[model] = None
+            else:
+                attribute_full_dict[model] = sum(attribute_values)
+        return attribute_full_dict
+
+    # Returns dictionary of model name -> set of models it depends on, including itself
+    def get_model_set_dict(self, model_graph=None):
+        if model_graph is None:
+            model_graph = self.model_graph
+        model_set_dict = dict()
+        for model in nx.topological_sort(model_graph):
+            model_set = {model}
+            for base_model in model_graph.predecessors(model):
+                model_set.update(model_set_dict[base_model])
+            model_set_dict[model] = model_set
+        return model_set_dict
+
     # Returns dictionary of model name -> attribute value for the provided attribute
     def get_model_attributes_dict(self, attribute):
         return nx.get_node_attributes(self.model_graph, attribute)
@@ -1211,7 +1411,23 @@ class AbstractTrainer:
             model = model.name
         return list(nx.bfs_tree(self.model_graph, model, reverse=True))
 
-    def leaderboard(self):
+    # Returns the minimum model set of the provided model in prediction order,
+    # as self-contained model objects that only contain what is required for inference
+    # Models are loaded from disk rather than taken from self.models so that persisted models are not modified
+    def get_inference_models(self, model):
+        model_set = self.get_minimum_model_set(model)
+        model_pred_order = list(nx.lexicographical_topological_sort(nx.subgraph(self.model_graph, model_set)))
+        inference_models = []
+        for model_name in model_pred_order:
+            model_type = self.model_types[model_name]
+            model_path = self.model_paths[model_name]
+            inference_model = model_type.load(path=model_path, reset_paths=True)
+            inference_model.convert_to_inference_model()
+            inference_models.append(inference_model)
+        return inference_models
+
+    # model_set_dict can be passed to reuse the output of get_model_set_dict(), it may contain additional models that are not in the model graph
+    def leaderboard(self, model_set_dict=None):
         model_names = self.get_model_names_all()
         score_val = []
         fit_time_marginal = []
@@ -1223,12 +1439,16 @@ class AbstractTrainer:
         score_val_dict = self.get_model_attributes_dict('val_score')
         fit_time_marginal_dict = self.get_model_attributes_dict('fit_time')
         predict_time_marginal_dict = self.get_model_attributes_dict('predict_time')
+        if model_set_dict is None:
+            model_set_dict = self.get_model_set_dict()
+        fit_time_dict = self.get_model_attribute_full_dict(attribute='fit_time', attribute_dict=fit_time_marginal_dict, model_set_dict=model_set_dict)
+        predict_time_dict = self.get_model_attribute_full_dict(attribute='predict_time', attribute_dict=predict_time_marginal_dict, model_set_dict=model_set_dict)
         for model_name in model_names:
             score_val.append(score_val_dict[model_name])
             fit_time_marginal.append(fit_time_marginal_dict[model_name])
-            fit_time.append(self.get_model_attribute_full(model=model_name, attribute='fit_time'))
+            fit_time.append(fit_time_dict[model_name])
             pred_time_val_marginal.append(predict_time_marginal_dict[model_name])
-            pred_time_val.append(self.get_model_attribute_full(model=model_name, attribute='predict_time'))
+            pred_time_val.append(predict_time_dict[model_name])
             stack_level.append(self.get_model_level(model_name))
             can_infer.append(self.model_graph.nodes[model_name]['can_infer'])
         df = pd.DataFrame(data={
@@ -33,6 +33,8 @@ class EnsembleSelection:
             metric, _ProbaScorer
         ) and not isinstance(metric, _ThresholdScorer)
 
+    # predictions can be a list of prediction arrays or a single array with the model as first axis,
+    # such as the contiguous array of PostHocEnsembler
     def fit(self, predictions, labels, time_limit=None, identifiers=None):
         self.ensemble_size = int(self.ensemble_size)
         if self.ensemble_size < 1:
@@ -52,7 +54,8 @@ class EnsembleSelection:
     def _fit(self, predictions, labels, time_limit=None):
         ensemble_size = self.ensemble_size
         self.num_input_models_ = len(predictions)
-        ensemble = []
+        # Sum of the predictions of the models in the ensemble, added in order of selection
+        ensemble_prediction_sum = None
         trajectory = []
         order = []
 
@@ -72,15 +75,12 @@ class EnsembleSelection:
         time_start = time.time()
         for i in range(ensemble_size):
             scores = np.zeros((len(predictions)))
-            s = len(ensemble)
+            s = len(order)
             if s == 0:
                 weighted_ensemble_prediction = np.zeros(predictions[0].shape)
             else:
                 # Memory-efficient averaging!
-                ensemble_prediction = np.zeros(ensemble[0].shape)
-                for pred in ensemble:
-                    ensemble_prediction += pred
-                ensemble_prediction /= s
+                ensemble_prediction = ensemble_prediction_sum / s
 
                 weighted_ensemble_prediction = (s / float(s + 1)) * \
                                                    ensemble_prediction
@@ -106,7 +106,9 @@ class EnsembleSelection:
 
             # TODO: Instead of selecting random, compute additional metric which can be a tie-breaker!
 
-            ensemble.append(predictions[best])
+            if ensemble_prediction_sum is None:
+                ensemble_prediction_sum = np.zeros(predictions[best].shape)
+            ensemble_prediction_sum += predictions[best]
             trajectory.append(scores[best])
             order.append(best)
 
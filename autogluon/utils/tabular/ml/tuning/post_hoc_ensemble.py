@@ -0,0 +1,98 @@
+import logging
+import time
+
+import numpy as np
+
+from .ensemble_selection import EnsembleSelection
+from ..utils import get_pred_from_proba
+from ...metrics import _ProbaScorer, _ThresholdScorer
+
+logger = logging.getLogger(__name__)
+
+
+# Fits weighted ensembles post-hoc on cached predictions of the models of a trainer on holdout data,
+# created by AbstractLearner.get_post_hoc_ensembler().
+# Predictions are stored once as a single contiguous array of shape (num_models, num_rows) or
+# (num_models, num_rows, num_classes), so ensembles with different metrics, model subsets and ensemble sizes
+# can be fit repeatedly without predicting with the models again.
+# Predictions, labels and scores are in the internal label space of the trainer,
+# as in the weighted ensembles fit during training.
+class PostHocEnsembler:
+    def __init__(self, model_pred_proba_dict: dict, labels, problem_type, eval_metric, trainer=None,
+                 pred_time_marginal: dict = None):
+        self.model_names = list(model_pred_proba_dict.keys())
+        self._model_index = {model: i for i, model in enumerate(self.model_names)}
+        self.pred_proba = np.ascontiguousarray(
+            np.stack([model_pred_proba_dict[model] for model in self.model_names]))
+        self.labels = labels
+        self.problem_type = problem_type
+        self.eval_metric = eval_metric
+        self.trainer = trainer
+        # Dictionary of model name -> prediction time of the model on the holdout data, excluding its base models
+        self.pred_time_marginal = pred_time_marginal
+
+    def _get_model_indices(self, models=None):
+        if models is None:
+            return list(range(len(self.model_names)))
+        missing_models = [model for model in models if model not in self._model_index]
+        if missing_models:
+            raise ValueError(f'Models without cached predictions: {missing_models}')
+        return [self._model_index[model] for model in models]
+
+    # Fits a weighted ensemble with ensemble selection on the cached predictions of models (all cached models if None),
+    # optimizing eval_metric (the learner's eval_metric if None)
+    # Returns a dictionary with the keys:
+    #   'weights': Dictionary of model name -> weight, only for models with non-zero weight
+    #   'score': Score of the ensemble on the holdout data with eval_metric
+    #   'pred_time_marginal': Time to weight the predictions of the models with non-zero weight
+    #   'pred_time': Full prediction time of the ensemble, including all models it depends on, None if not computable
+    def fit(self, models=None, eval_metric=None, ensemble_size=100, name='post_hoc_ensemble'):
+        if eval_metric is None:
+            eval_metric = self.eval_metric
+        model_indices = self._get_model_indices(models)
+        predictions = self.pred_proba[model_indices] if models is not None else self.pred_proba
+        ensemble_selection = EnsembleSelection(ensemble_size=ensemble_size, problem_type=self.problem_type,
+                                               metric=eval_metric)
+        ensemble_selection.fit(predictions=predictions, labels=self.labels)
+        weights = {self.model_names[model_index]: weight
+                   for model_index, weight in zip(model_indices, ensemble_selection.weights_) if weight != 0}
+
+        pred_time_start = time.time()
+        pred_proba = self.predict_proba(weights)
+        pred_time_marginal = time.time() - pred_time_start
+        score = self.score(pred_proba, eval_metric=eval_metric)
+
+        pred_time = None
+        if self.trainer is not None and self.pred_time_marginal is not None:
+            pred_time_marginal_dict = dict(self.pred_time_marginal)
+            pred_time_marginal_dict[name] = pred_time_marginal
+            pred_time_full_dict = self.trainer.get_model_attribute_full_dict(
+                attribute='predict_time', attribute_dict=pred_time_marginal_dict,
+                model_graph=self.get_model_graph(weights, name=name))
+            pred_time = pred_time_full_dict[name]
+        return dict(weights=weights, score=score, pred_time_marginal=pred_time_marginal, pred_time=pred_time)
+
+    # Returns the weighted sum of the cached predictions, weights is a dictionary of model name -> weight
+    def predict_proba(self, weights: dict):
+        model_indices = self._get_model_indices(list(weights.keys()))
+        return np.tensordot(np.array(list(weights.values()), dtype=float), self.pred_proba[model_indices], axes=1)
+
+    def score(self, pred_proba, eval_metric=None):
+        if eval_metric is None:
+            eval_metric = self.eval_metric
+        if isinstance(eval_metric, (_ProbaScorer, _ThresholdScorer)):
+            return eval_metric(self.labels, pred_proba)
+        y_pred = get_pred_from_proba(y_pred_proba=pred_proba, problem_type=self.problem_type)
+        return eval_metric(self.labels, y_pred)
+
+    # Returns a copy of the model graph of the trainer with an ensemble named name depending on the models of weights
+    def get_model_graph(self, weights: dict, name='post_hoc_ensemble'):
+        if self.trainer is None:
+            raise ValueError('The model graph of the ensemble requires the trainer, '
+                             'but PostHocEnsembler was created without a trainer')
+        if name in self.trainer.model_graph:
+            raise ValueError(f'Ensemble name already used by a model of the trainer: {name}')
+        model_graph = self.trainer.model_graph.copy()
+        model_graph.add_node(name)
+        model_graph.add_edges_from([(model, name) for model, weight in weights.items() if weight != 0])
+        return model_graph
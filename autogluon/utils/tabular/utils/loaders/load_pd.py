@@ -95,6 +95,68 @@ def load(path, delimiter=None, encoding='utf-8', columns_to_keep=None, dtype=Non
     return df
 
 
+# Loads the data in chunks of at most chunksize rows, so that the full dataset never has to be held in memory at once.
+# Supports csv, parquet, pointer and multipart_local formats. Yields DataFrame objects.
+def load_chunks(path, chunksize, delimiter=None, encoding='utf-8', columns_to_keep=None, dtype=None,
+                error_bad_lines=True, header=0, names=None, format=None, usecols=None, low_memory=False,
+                converters=None, filters=None):
+    load_kwargs = dict(chunksize=chunksize, delimiter=delimiter, encoding=encoding, columns_to_keep=columns_to_keep,
+                       dtype=dtype, error_bad_lines=error_bad_lines, header=header, names=names, usecols=usecols,
+                       low_memory=low_memory, converters=converters, filters=filters)
+    if isinstance(path, list):
+        for path_part in path:
+            yield from load_chunks(path=path_part, format=format, **load_kwargs)
+        return
+    if format is not None:
+        pass
+    elif path.endswith(save_pointer.POINTER_SUFFIX):
+        format = 'pointer'
+    elif path[-1] == '/' and s3_utils.is_s3_url(path):
+        format = 'multipart_s3'
+    elif path[-1] == '/' and not s3_utils.is_s3_url(path):
+        format = 'multipart_local'
+    elif '.parquet' in path:
+        format = 'parquet'
+    else:
+        format = 'csv'
+        if delimiter is None:
+            delimiter = '\t' if path.endswith('.tsv') else ','
+
+    if format == 'pointer':
+        content_path = load_pointer.get_pointer_content(path)
+        yield from load_chunks(path=content_path, format=None, **load_kwargs)
+        return
+    elif format == 'multipart_local':
+        paths = sorted([join(path, f) for f in listdir(path) if (isfile(join(path, f))) & (f.startswith('part-'))])
+        yield from load_chunks(path=paths, format=None, **load_kwargs)
+        return
+    elif format == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path)
+        df_iter = (batch.to_pandas()
+                   for batch in parquet_file.iter_batches(batch_size=chunksize, columns=columns_to_keep))
+    elif format == 'csv':
+        df_iter = pd.read_csv(path, converters=converters, delimiter=delimiter, encoding=encoding, header=header,
+                              names=names, dtype=dtype, error_bad_lines=error_bad_lines, low_memory=low_memory,
+                              usecols=usecols, chunksize=chunksize)
+    else:
+        raise Exception('file format ' + format + ' not supported for chunked loading!')
+
+    row_count = 0
+    for df in df_iter:
+        if format == 'csv' and columns_to_keep is not None:
+            df = df[columns_to_keep]
+        if filters is not None:
+            if isinstance(filters, list):
+                for filter in filters:
+                    df = filter(df)
+            else:
+                df = filters(df)
+        row_count += len(df)
+        yield df
+    logger.log(15, "Loaded data in chunks from: " + str(path) + " | Rows = " + str(row_count))
+
+
 def load_multipart_child(chunk):
     path, delimiter, encoding, columns_to_keep, dtype, error_bad_lines, header, names, format, nrows, skiprows, usecols, low_memory, converters, filters = chunk
     df = load(path=path, delimiter=delimiter, encoding=encoding, columns_to_keep=columns_to_keep,
@@ -17,9 +17,17 @@ def dataframe_transform_parallel(
 
 
 # If multiprocessing_method is 'fork', initialization time scales linearly with current allocated memory, dramatically slowing down runs. forkserver makes this time constant
-def execute_multiprocessing(workers_count, transformer, chunks, multiprocessing_method='forkserver'):
-    logger.log(15, 'Execute_multiprocessing starting worker pool...')
+def get_pool(workers_count, multiprocessing_method='forkserver'):
+    logger.log(15, 'Starting worker pool with '+str(workers_count)+' workers...')
     ctx = multiprocessing.get_context(multiprocessing_method)
-    with ctx.Pool(workers_count) as pool:
+    return ctx.Pool(workers_count)
+
+
+# If pool is specified, it is used instead of starting a new worker pool, and is left open for the caller to reuse
+def execute_multiprocessing(workers_count, transformer, chunks, multiprocessing_method='forkserver', pool=None):
+    if pool is not None:
+        return pool.map(transformer, chunks)
+    logger.log(15, 'Execute_multiprocessing starting worker pool...')
+    with get_pool(workers_count=workers_count, multiprocessing_method=multiprocessing_method) as pool:
         out = pool.map(transformer, chunks)
     return out
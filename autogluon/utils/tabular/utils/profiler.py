@@ -0,0 +1,188 @@
+import contextvars
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Profiler that stages are recorded to, set by Profiler.activate() for the code executed within it.
+# Context variables are not shared between threads, so each thread only records to the profiler it activated.
+_active_profiler = contextvars.ContextVar('active_profiler', default=None)
+
+
+# Collects the time and peak memory of the stages of fit and predict, such as feature generation, model preprocessing,
+# model prediction, and model loading/saving.
+# Stages are recorded per model and can be nested, for example the 'preprocess' stage of a model is recorded within
+# its 'predict_proba' stage.
+# Stages are only recorded to a started profiler while it is active, see profiling(). Otherwise the module level
+# profile() has negligible overhead.
+# Peak memory is measured with tracemalloc and is the peak of memory allocated during the stage on top of the memory
+# allocated when the stage started. tracemalloc is process-wide, so peak memory of stages executed concurrently in
+# multiple threads includes allocations from the other threads.
+class Profiler:
+    def __init__(self):
+        self.enabled = False
+        self.track_memory = False
+        self.records = []
+        self._started_tracemalloc = False
+        self._local = threading.local()
+
+    def start(self, track_memory=True, reset=True):
+        if reset:
+            self.reset()
+        self.track_memory = track_memory
+        if track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.enabled = True
+
+    def stop(self):
+        self.enabled = False
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self):
+        self.records = []
+
+    # Context manager recording the stages executed within it to this profiler, in the current thread and in threads
+    # started with a copy of its context (contextvars.copy_context())
+    @contextmanager
+    def activate(self):
+        token = _active_profiler.set(self)
+        try:
+            yield self
+        finally:
+            _active_profiler.reset(token)
+
+    def _get_stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+    def _get_traced_memory(self):
+        if not self.track_memory or not tracemalloc.is_tracing():
+            return None, None
+        current, peak = tracemalloc.get_traced_memory()
+        # Python 3.9+, otherwise the peak of the stage is only measured at the start and end of its nested stages
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            peak = current
+        return current, peak
+
+    # Context manager recording the time and peak memory of the code it wraps as stage of model
+    # (model=None for stages that are not specific to a model)
+    @contextmanager
+    def profile(self, stage, model=None):
+        if not self.enabled:
+            yield
+            return
+        stack = self._get_stack()
+        memory_current, memory_peak = self._get_traced_memory()
+        if stack and memory_peak is not None:
+            stack[-1]['memory_peak'] = max(stack[-1]['memory_peak'], memory_peak)
+        frame = dict(stage=stage, model=model, memory_start=memory_current, memory_peak=memory_current)
+        stack.append(frame)
+        time_start = time.time()
+        try:
+            yield
+        finally:
+            time_end = time.time()
+            stack.pop()
+            memory_current, memory_peak = self._get_traced_memory()
+            peak_memory = None
+            if memory_peak is not None and frame['memory_start'] is not None:
+                frame['memory_peak'] = max(frame['memory_peak'], memory_peak)
+                peak_memory = frame['memory_peak'] - frame['memory_start']
+                if stack:
+                    stack[-1]['memory_peak'] = max(stack[-1]['memory_peak'], frame['memory_peak'])
+            self.records.append(dict(
+                stage=stage,
+                model=model,
+                parent_stage=stack[-1]['stage'] if stack else None,
+                depth=len(stack),
+                time=time_end - time_start,
+                peak_memory=peak_memory,
+                thread=threading.get_ident(),
+            ))
+
+    def is_profiling(self, stage, model=None):
+        return any((frame['stage'] == stage) and (frame['model'] == model) for frame in self._get_stack())
+
+    # Returns a DataFrame with one row per recorded stage execution, in order of completion
+    def get_records(self):
+        columns = ['stage', 'model', 'parent_stage', 'depth', 'time', 'peak_memory', 'thread']
+        return pd.DataFrame(self.records, columns=columns)
+
+    # Returns a DataFrame with one row per stage and model, sorted by total time
+    def get_summary(self):
+        records = self.get_records()
+        records['model'] = records['model'].fillna('')
+        records_grouped = records.groupby(['stage', 'model'], sort=False)
+        summary = records_grouped['time'].agg(['size', 'sum', 'mean', 'max'])
+        summary.columns = ['count', 'time_total', 'time_mean', 'time_max']
+        summary['peak_memory'] = records_grouped['peak_memory'].max()
+        summary = summary.reset_index()
+        return summary.sort_values(by='time_total', ascending=False).reset_index(drop=True)
+
+
+# Returns the active profiler if it is started, otherwise None
+def get_active_profiler():
+    profiler = _active_profiler.get()
+    if profiler is None or not profiler.enabled:
+        return None
+    return profiler
+
+
+# Context manager starting a new profiler and recording the stages executed within it, returns the profiler.
+# Only stages of the current thread and of the threads it starts to train models concurrently are recorded,
+# so predictors used at the same time in other threads are not included.
+# Example:
+#     with profiling() as profiler:
+#         predictor = task.fit(train_data=train_data, label=label)
+#         predictor.predict(test_data)
+#     print(profiler.get_summary())
+@contextmanager
+def profiling(track_memory=True):
+    profiler = Profiler()
+    profiler.start(track_memory=track_memory)
+    try:
+        with profiler.activate():
+            yield profiler
+    finally:
+        profiler.stop()
+
+
+# Context manager recording the code it wraps as stage of model to the active profiler, if any
+@contextmanager
+def profile(stage, model=None):
+    profiler = get_active_profiler()
+    if profiler is None:
+        yield
+        return
+    with profiler.profile(stage=stage, model=model):
+        yield
+
+
+# Decorator to profile a method of a model as stage, using the name of the model (self.name).
+# Calls nested within the same stage of the same model are not recorded again, so that overridden methods calling
+# super() are only recorded once.
+def profile_model_method(stage):
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            profiler = get_active_profiler()
+            if profiler is None or profiler.is_profiling(stage=stage, model=self.name):
+                return func(self, *args, **kwargs)
+            with profiler.profile(stage=stage, model=self.name):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -1,5 +1,5 @@
 __all__ = ['try_import_catboost', 'try_import_lightgbm', 'try_import_mxboard', 'try_import_mxnet',
-           'try_import_cv2', 'try_import_gluonnlp']
+           'try_import_cv2', 'try_import_gluonnlp', 'try_import_faiss']
 
 def try_import_catboost():
     try:
@@ -73,3 +73,13 @@ def try_import_gluonnlp():
             "without installing gluonnlp. "
             "A quick tip is to install via `pip install gluonnlp==0.8.1`. ")
     return gluonnlp
+
+
+def try_import_faiss():
+    try:
+        import faiss
+    except ImportError:
+        raise ImportError(
+            "Unable to import dependency faiss. "
+            "A quick tip is to install via `pip install faiss-cpu`. ")
+    return faiss
@@ -0,0 +1,72 @@
+""" Loads inference artifacts without importing the autogluon package.
+
+Importing any module of autogluon first runs autogluon/__init__.py and autogluon/utils/__init__.py, which import MXNet,
+the schedulers and all tasks. This module registers these two packages without running their __init__ files, so that
+loading an artifact only imports the learner utilities and the modules of the model types contained in the artifact.
+For example, an artifact of LightGBM and CatBoost models does not import MXNet, while an artifact containing a
+TabularNeuralNetModel does.
+
+The __init__ files of the registered packages run the first time an attribute of the package is accessed, for example
+by `import autogluon` followed by `autogluon.TabularPrediction`, so that the package can still be used as usual in the
+same process afterwards.
+
+Example
+-------
+>>> from autogluon_inference import load_inference_artifact
+>>> artifact = load_inference_artifact('inference_artifact.pkl')
+>>> y_pred = artifact.predict(test_data)
+"""
+import importlib.util
+import os
+import sys
+
+__all__ = ['load_inference_artifact']
+
+_LAZY_PACKAGES = ['autogluon.utils', 'autogluon']  # Packages are initialized in this order, children first
+
+
+def _register_lazy_packages():
+    if 'autogluon' in sys.modules:
+        return
+    spec = importlib.util.find_spec('autogluon')
+    if spec is None or not spec.submodule_search_locations:
+        raise ImportError("Unable to find the autogluon package")
+    root = list(spec.submodule_search_locations)[0]
+    modules = []
+    for name in _LAZY_PACKAGES:
+        path = os.path.join(root, *name.split('.')[1:])
+        package_spec = importlib.util.spec_from_file_location(
+            name, os.path.join(path, '__init__.py'), submodule_search_locations=[path])
+        modules.append((importlib.util.module_from_spec(package_spec), package_spec))
+
+    def _initialize():
+        for module, _ in modules:
+            del module.__getattr__
+        for module, package_spec in modules:
+            package_spec.loader.exec_module(module)
+
+    for module, _ in modules:
+        def __getattr__(attr, name=module.__name__):
+            _initialize()
+            return getattr(sys.modules[name], attr)
+        module.__getattr__ = __getattr__
+        sys.modules[module.__name__] = module
+    sys.modules['autogluon'].utils = sys.modules['autogluon.utils']
+
+
+def load_inference_artifact(path):
+    """ Loads an artifact saved by :meth:`autogluon.task.tabular_prediction.TabularPredictor.export_inference_artifact`.
+
+    Parameters
+    ----------
+    path : str
+        Path of the artifact file.
+
+    Returns
+    -------
+    :class:`autogluon.utils.tabular.ml.learner.inference_artifact.InferenceArtifact` object with `predict()` and
+    `predict_proba()` methods.
+    """
+    _register_lazy_packages()
+    from autogluon.utils.tabular.ml.learner.inference_artifact import InferenceArtifact
+    return InferenceArtifact.load(path)
@@ -0,0 +1,260 @@
+""" Benchmark of the fit throughput, predict latency and memory usage of TabularPrediction on synthetic datasets.
+
+Runs fully offline on CPU: datasets are generated with controlled shape
+(rows, columns, categorical cardinality, text/datetime columns, class count)
+and each dataset is fit and predicted with each of the selected presets.
+Results are written as one JSON object per (dataset, preset) run, containing end-to-end timings,
+peak RSS of fit and predict, per model fit/predict times from the leaderboard,
+and the per stage and per model timings and peak memory recorded by `autogluon.utils.tabular.utils.profiler`.
+
+Example:
+    python benchmark.py --datasets small wide --presets toy --output results.jsonl
+    python benchmark.py --datasets small --presets toy --num-rows 50000 --num-classes 5 --output results.jsonl
+"""
+import argparse
+import json
+import platform
+import shutil
+import tempfile
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import psutil
+
+import autogluon as ag
+from autogluon import TabularPrediction as task
+from autogluon.utils.tabular.utils.profiler import profiling
+
+LABEL = 'class'
+
+# Shapes of the synthetic datasets, see generate_dataset() for the meaning of each key
+DATASET_CONFIGS = dict(
+    small=dict(num_rows=5000, num_numeric=10, num_categorical=5, cardinality=10,
+               num_text=0, num_datetime=0, num_classes=2),
+    medium=dict(num_rows=100000, num_numeric=20, num_categorical=10, cardinality=100,
+                num_text=0, num_datetime=0, num_classes=2),
+    wide=dict(num_rows=10000, num_numeric=500, num_categorical=20, cardinality=20,
+              num_text=0, num_datetime=0, num_classes=2),
+    high_cardinality=dict(num_rows=20000, num_numeric=5, num_categorical=10, cardinality=5000,
+                          num_text=0, num_datetime=0, num_classes=2),
+    text_datetime=dict(num_rows=10000, num_numeric=5, num_categorical=3, cardinality=10,
+                       num_text=2, num_datetime=2, num_classes=2),
+    multiclass=dict(num_rows=20000, num_numeric=20, num_categorical=5, cardinality=20,
+                    num_text=0, num_datetime=0, num_classes=10),
+    regression=dict(num_rows=20000, num_numeric=20, num_categorical=5, cardinality=20,
+                    num_text=0, num_datetime=0, num_classes=0),
+)
+
+# fit() arguments of each benchmarked preset
+PRESET_CONFIGS = dict(
+    toy=dict(hyperparameters='toy'),
+    very_light=dict(hyperparameters='very_light'),
+    light=dict(hyperparameters='light'),
+    stack_toy=dict(hyperparameters='toy', num_bagging_folds=3, stack_ensemble_levels=1),
+    medium_quality_faster_train=dict(presets='medium_quality_faster_train'),
+)
+
+WORDS = ['alpha', 'beta', 'gamma', 'delta', 'epsilon', 'zeta', 'theta', 'kappa', 'lambda', 'sigma',
+         'red', 'green', 'blue', 'fast', 'slow', 'large', 'small', 'new', 'old', 'good', 'bad', 'open', 'closed',
+         'A1', 'B2']
+
+
+def generate_dataset(num_rows, num_numeric, num_categorical, cardinality, num_text, num_datetime, num_classes, seed=0):
+    """ Generates a synthetic DataFrame with a label column `LABEL` that depends on all of the feature columns.
+
+        num_classes: 0 for regression, 2 for binary classification and >2 for multiclass classification.
+        Categorical columns take `cardinality` distinct string values with a skewed frequency distribution.
+        Text columns contain sentences of 3 to 12 words, datetime columns contain date strings.
+        5% of the values of numeric and categorical columns are missing.
+    """
+    rng = np.random.RandomState(seed)
+    columns = {}
+    signal = np.zeros(num_rows)
+    for i in range(num_numeric):
+        values = rng.normal(size=num_rows)
+        signal += values * rng.normal()
+        values[rng.rand(num_rows) < 0.05] = np.nan
+        columns[f'num_{i}'] = values
+    for i in range(num_categorical):
+        probabilities = 1 / np.arange(1, cardinality + 1)
+        codes = rng.choice(cardinality, size=num_rows, p=probabilities / probabilities.sum())
+        signal += rng.normal(size=cardinality)[codes]
+        values = pd.Series([f'cat{i}_{code}' for code in codes], dtype=object)
+        values[rng.rand(num_rows) < 0.05] = np.nan
+        columns[f'cat_{i}'] = values.values
+    for i in range(num_text):
+        num_words = rng.randint(3, 13, size=num_rows)
+        word_idx = rng.randint(len(WORDS), size=num_words.sum())
+        sentences = np.split(np.array(WORDS)[word_idx], np.cumsum(num_words)[:-1])
+        signal += (word_idx[np.cumsum(num_words) - 1] % 2) * 0.5  # Last word of each sentence is predictive
+        columns[f'text_{i}'] = [' '.join(sentence) for sentence in sentences]
+    for i in range(num_datetime):
+        days = rng.randint(0, 3650, size=num_rows)
+        signal += days / 3650
+        dates = pd.Timestamp('2010-01-01') + pd.to_timedelta(days, unit='D')
+        columns[f'date_{i}'] = dates.strftime('%Y-%m-%d').values
+    signal += rng.normal(scale=0.5, size=num_rows)
+
+    if num_classes == 0:
+        label = signal
+    elif num_classes == 2:
+        label = np.where(signal > np.median(signal), 'yes', 'no')
+    else:
+        quantiles = np.quantile(signal, np.linspace(0, 1, num_classes + 1)[1:-1])
+        label = np.array([f'class_{c}' for c in range(num_classes)])[np.searchsorted(quantiles, signal)]
+    columns[LABEL] = label
+    return pd.DataFrame(columns)
+
+
+class PeakRSSMonitor:
+    """ Context manager recording the peak resident set size of the process by polling it from a background thread. """
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak_rss = None
+        self._process = psutil.Process()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _poll(self):
+        while not self._stop.is_set():
+            self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak_rss = self._process.memory_info().rss
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._poll, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self._stop.set()
+        self._thread.join()
+        self.peak_rss = max(self.peak_rss, self._process.memory_info().rss)
+
+
+def to_records(df):
+    """ Converts df to a list of JSON serializable dicts, with NaN as None """
+    return json.loads(df.to_json(orient='records'))
+
+
+def measure_latency(predictor, test_data, num_rows, repeats):
+    """ Returns the latency percentiles in seconds of predicting batches of num_rows rows """
+    latencies = []
+    for i in range(repeats):
+        start = (i * num_rows) % max(len(test_data) - num_rows, 1)
+        batch = test_data.iloc[start:start + num_rows]
+        time_start = time.time()
+        predictor.predict(batch)
+        latencies.append(time.time() - time_start)
+    return {f'p{q}': float(np.percentile(latencies, q)) for q in [50, 90, 99]}
+
+
+def run_benchmark(dataset_name, dataset_config, preset_name, preset_config, args):
+    data = generate_dataset(seed=args.seed, **dataset_config)
+    test_size = min(args.max_test_rows, len(data) // 5)
+    train_data = data.iloc[test_size:].reset_index(drop=True)
+    test_data = data.iloc[:test_size].drop(columns=[LABEL]).reset_index(drop=True)
+    output_directory = tempfile.mkdtemp(prefix='ag_benchmark_')
+    fit_kwargs = dict(preset_config)
+    if args.time_limits is not None:
+        fit_kwargs['time_limits'] = args.time_limits
+    result = dict(dataset=dataset_name, dataset_config=dataset_config, preset=preset_name, preset_config=preset_config,
+                  num_rows_train=len(train_data), num_rows_test=len(test_data))
+    try:
+        with profiling(track_memory=args.track_memory) as profiler_fit, PeakRSSMonitor() as rss_fit:
+            time_start = time.time()
+            predictor = task.fit(train_data=train_data, label=LABEL, output_directory=output_directory,
+                                 verbosity=args.verbosity, random_seed=args.seed, ngpus_per_trial=0, **fit_kwargs)
+            result['fit_time'] = time.time() - time_start
+        result['fit_rows_per_second'] = len(train_data) / result['fit_time']
+        result['fit_peak_rss'] = rss_fit.peak_rss
+        result['fit_stages'] = to_records(profiler_fit.get_summary())
+
+        with predictor.profile(track_memory=args.track_memory) as profiler_predict, PeakRSSMonitor() as rss_predict:
+            time_start = time.time()
+            predictor.predict(test_data)
+            result['predict_time'] = time.time() - time_start
+        result['predict_rows_per_second'] = len(test_data) / result['predict_time']
+        result['predict_peak_rss'] = rss_predict.peak_rss
+        result['predict_stages'] = to_records(profiler_predict.get_summary())
+
+        result['predict_latency_single_row'] = measure_latency(predictor, test_data, num_rows=1,
+                                                               repeats=args.latency_repeats)
+        result['predict_latency_small_batch'] = measure_latency(predictor, test_data, num_rows=100,
+                                                                repeats=args.latency_repeats)
+
+        leaderboard = predictor.leaderboard(silent=True)
+        result['model_best'] = predictor.get_model_best()
+        leaderboard_columns = ['model', 'score_val', 'fit_time', 'pred_time_val', 'fit_time_marginal',
+                               'pred_time_val_marginal', 'stack_level']
+        result['models'] = to_records(leaderboard[leaderboard_columns])
+    finally:
+        shutil.rmtree(output_directory, ignore_errors=True)
+    return result
+
+
+def get_environment_info():
+    return dict(
+        autogluon_version=ag.__version__,
+        python_version=platform.python_version(),
+        platform=platform.platform(),
+        cpu_count=psutil.cpu_count(logical=True),
+        cpu_count_physical=psutil.cpu_count(logical=False),
+        memory_total=psutil.virtual_memory().total,
+        numpy_version=np.__version__,
+        pandas_version=pd.__version__,
+    )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Benchmark fit and predict performance of TabularPrediction on synthetic data.')
+    parser.add_argument('--datasets', type=str, nargs='+', default=['small', 'text_datetime', 'multiclass'],
+                        choices=list(DATASET_CONFIGS.keys()), help='synthetic datasets to benchmark.')
+    parser.add_argument('--presets', type=str, nargs='+', default=['toy', 'stack_toy'],
+                        choices=list(PRESET_CONFIGS.keys()), help='fit presets to benchmark on each dataset.')
+    parser.add_argument('--num-rows', type=int, default=None, help='overrides the number of rows of the datasets.')
+    parser.add_argument('--num-classes', type=int, default=None,
+                        help='overrides the number of classes of the datasets (0 for regression).')
+    parser.add_argument('--max-test-rows', type=int, default=10000,
+                        help='maximum number of rows used for prediction.')
+    parser.add_argument('--latency-repeats', type=int, default=50,
+                        help='number of predict calls used to measure latency.')
+    parser.add_argument('--time-limits', type=float, default=None, help='time_limits passed to fit().')
+    parser.add_argument('--no-track-memory', dest='track_memory', action='store_false',
+                        help='disable the tracemalloc based peak memory of each stage, '
+                             'which slows down the profiled code.')
+    parser.add_argument('--seed', type=int, default=0, help='random seed of dataset generation and fit().')
+    parser.add_argument('--verbosity', type=int, default=0, help='verbosity of fit().')
+    parser.add_argument('--output', type=str, default='benchmark_results.jsonl',
+                        help='file to append the results to, one JSON object per line.')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    environment = get_environment_info()
+    for dataset_name in args.datasets:
+        dataset_config = dict(DATASET_CONFIGS[dataset_name])
+        if args.num_rows is not None:
+            dataset_config['num_rows'] = args.num_rows
+        if args.num_classes is not None:
+            dataset_config['num_classes'] = args.num_classes
+        for preset_name in args.presets:
+            print(f'Benchmarking dataset={dataset_name}, preset={preset_name} ...')
+            result = run_benchmark(dataset_name, dataset_config, preset_name, PRESET_CONFIGS[preset_name], args)
+            result['environment'] = environment
+            result['timestamp'] = time.strftime('%Y-%m-%dT%H:%M:%S')
+            print(f'\tfit_time={round(result["fit_time"], 2)}s, predict_time={round(result["predict_time"], 3)}s, '
+                  f'latency_p50={round(result["predict_latency_single_row"]["p50"] * 1000, 1)}ms, '
+                  f'fit_peak_rss={round(result["fit_peak_rss"] / 1e6)}MB, '
+                  f'predict_peak_rss={round(result["predict_peak_rss"] / 1e6)}MB')
+            with open(args.output, 'a') as f:
+                f.write(json.dumps(result, default=str) + '\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -80,6 +80,7 @@ if __name__ == '__main__':
 
         # Package info
         packages=find_packages(exclude=('docs', 'tests', 'scripts')),
+        py_modules=['autogluon_inference'],
         zip_safe=True,
         include_package_data=True,
         install_requires=requirements + test_requirements,
@@ -0,0 +1,140 @@
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from autogluon.utils.tabular.features.feature_types_metadata import FeatureTypesMetadata
+from autogluon.utils.tabular.metrics import log_loss
+from autogluon.utils.tabular.ml.constants import BINARY
+from autogluon.utils.tabular.ml.models.abstract.abstract_model import AbstractModel
+from autogluon.utils.tabular.ml.models.catboost.catboost_model import CatboostModel
+from autogluon.utils.tabular.ml.models.catboost.catboost_utils import QuantizedPoolSlicer
+from autogluon.utils.tabular.ml.models.ensemble.bagged_ensemble_model import BaggedEnsembleModel
+from autogluon.utils.tabular.ml.models.lgb import lgb_model
+from autogluon.utils.tabular.ml.models.lgb.lgb_model import LGBModel
+from autogluon.utils.tabular.ml.models.lgb.lgb_utils import get_dataset_num_rows
+
+
+def _data(num_rows=300):
+    # Features with few distinct values are binned identically on any subset of the rows,
+    # so that models trained on subsets of the bagged dataset equal models trained on the fold data.
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame({'a': rng.randint(0, 10, num_rows), 'b': rng.randint(0, 5, num_rows).astype(float)})
+    y = pd.Series((X['a'] + X['b'] + 3 * rng.rand(num_rows) > 8).astype(int))
+    return X, y
+
+
+def _model_base(path, model_type, hyperparameters):
+    return model_type(path=path, name=model_type.__name__, problem_type=BINARY, eval_metric=log_loss,
+                      hyperparameters=hyperparameters,
+                      feature_types_metadata=FeatureTypesMetadata(defaultdict(list, int=['a'], float=['b'])))
+
+
+def _fit_bagged(path, model_type, hyperparameters, X, y):
+    model_base = _model_base(path, model_type, hyperparameters)
+    model = BaggedEnsembleModel(path=path, name='Bagged', model_base=model_base)
+    model.fit(X=X, y=y, k_fold=3)
+    return model
+
+
+def test_lgb_fold_datasets_are_subsets_of_the_bagged_dataset(tmpdir):
+    X, y = _data()
+    model = _model_base(str(tmpdir) + '/', LGBModel, {'num_boost_round': 20})
+    bagged_dataset = model.construct_bagged_dataset(X=X, y=y)
+    rng = np.random.RandomState(1)
+    index = rng.permutation(len(X))
+    train_index, val_index = index[:200], index[200:]
+    fold_fit_kwargs = model.get_fold_fit_kwargs(bagged_dataset=bagged_dataset, train_index=train_index,
+                                                val_index=val_index)
+    for dataset, fold_index in [(fold_fit_kwargs['dataset_train'], train_index),
+                                (fold_fit_kwargs['dataset_val'], val_index)]:
+        assert get_dataset_num_rows(dataset) == len(fold_index)
+        dataset.construct()
+        np.testing.assert_array_equal(dataset.get_label(), y.values[np.sort(fold_index)])
+    assert get_dataset_num_rows(bagged_dataset) == len(X)
+    assert AbstractModel.construct_bagged_dataset(model, X=X, y=y) is None
+    assert AbstractModel.get_fold_fit_kwargs(model, None, train_index=train_index, val_index=val_index) == {}
+
+
+def test_bagged_lgb_bins_the_data_once(tmpdir, monkeypatch):
+    X, y = _data()
+    X_test, _ = _data(50)
+    hyperparameters = {'num_boost_round': 20}
+    num_datasets_constructed = []
+    construct_dataset_og = lgb_model.construct_dataset
+
+    def construct_dataset(*args, **kwargs):
+        num_datasets_constructed.append(1)
+        return construct_dataset_og(*args, **kwargs)
+    monkeypatch.setattr(lgb_model, 'construct_dataset', construct_dataset)
+    model = _fit_bagged(str(tmpdir.join('shared')) + '/', LGBModel, hyperparameters, X, y)
+    # The training and validation data of the folds are subsets of a single Dataset
+    assert len(num_datasets_constructed) == 1
+    assert len(model.models) == 3
+
+    # The fold models equal those trained without sharing the Dataset
+    monkeypatch.setattr(LGBModel, 'construct_bagged_dataset', lambda self, X, y: None)
+    model_unshared = _fit_bagged(str(tmpdir.join('unshared')) + '/', LGBModel, hyperparameters, X, y)
+    assert len(num_datasets_constructed) == 1 + 2 * 3
+    np.testing.assert_allclose(model.oof_pred_proba, model_unshared.oof_pred_proba, rtol=1e-6)
+    np.testing.assert_allclose(model.predict_proba(X_test), model_unshared.predict_proba(X_test), rtol=1e-6)
+
+
+def test_lgb_dataset_num_rows_of_binary_file(tmpdir):
+    X, y = _data()
+    model = _model_base(str(tmpdir) + '/', LGBModel, {'num_boost_round': 20})
+    dataset = model.construct_bagged_dataset(X=X, y=y)
+    path = str(tmpdir.join('train.bin'))
+    dataset.save_binary(path)
+    lgb = pytest.importorskip('lightgbm')
+    assert get_dataset_num_rows(lgb.Dataset(path)) == len(X)
+
+
+def test_catboost_fold_pools_share_the_borders_of_the_bagged_pool(tmpdir):
+    X, y = _data()
+    model = _model_base(str(tmpdir) + '/', CatboostModel, {'iterations': 20, 'border_count': 4})
+    bagged_dataset = model.construct_bagged_dataset(X=X, y=y)
+    assert isinstance(bagged_dataset, QuantizedPoolSlicer)
+    with open(bagged_dataset.borders_path) as f:
+        borders = f.read()
+    assert len(borders.strip().split('\n')) == 2 * 4
+    train_index, val_index = np.arange(0, 300, 3), np.arange(1, 300, 3)
+    fold_fit_kwargs = model.get_fold_fit_kwargs(bagged_dataset=bagged_dataset, train_index=train_index,
+                                                val_index=val_index)
+    for pool, fold_index in [(fold_fit_kwargs['pool_train'], train_index), (fold_fit_kwargs['pool_val'], val_index)]:
+        assert pool.is_quantized()
+        assert pool.num_row() == len(fold_index)
+        np.testing.assert_array_equal(np.array(pool.get_label(), dtype=int), y.values[fold_index])
+        borders_path = str(tmpdir.join('borders.tsv'))
+        pool.save_quantization_borders(borders_path)
+        with open(borders_path) as f:
+            assert f.read() == borders
+    assert not bagged_dataset.pool.is_quantized()
+
+
+def test_bagged_catboost_quantizes_the_data_once(tmpdir, monkeypatch):
+    X, y = _data()
+    X_test, _ = _data(50)
+    hyperparameters = {'iterations': 20}
+    input_borders_quantized = []
+    catboost = pytest.importorskip('catboost')
+    quantize_og = catboost.Pool.quantize
+
+    def quantize(self, *args, **kwargs):
+        input_borders_quantized.append(kwargs.get('input_borders'))
+        return quantize_og(self, *args, **kwargs)
+    monkeypatch.setattr(catboost.Pool, 'quantize', quantize)
+    model = _fit_bagged(str(tmpdir.join('shared')) + '/', CatboostModel, hyperparameters, X, y)
+    # The borders are computed once, the training and validation Pools of the folds are quantized with them
+    assert input_borders_quantized[0] is None
+    assert len(input_borders_quantized) == 1 + 2 * 3
+    assert len(set(input_borders_quantized[1:])) == 1 and input_borders_quantized[1] is not None
+    assert len(model.models) == 3
+
+    # The fold models equal those trained on their own Pools
+    monkeypatch.setattr(CatboostModel, 'construct_bagged_dataset', lambda self, X, y: None)
+    model_unshared = _fit_bagged(str(tmpdir.join('unshared')) + '/', CatboostModel, hyperparameters, X, y)
+    assert len(input_borders_quantized) == 1 + 2 * 3
+    np.testing.assert_allclose(model.oof_pred_proba, model_unshared.oof_pred_proba, rtol=1e-6)
+    np.testing.assert_allclose(model.predict_proba(X_test), model_unshared.predict_proba(X_test), rtol=1e-6)
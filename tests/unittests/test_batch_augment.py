@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from autogluon.utils import augment
+from autogluon.utils.augment import autoaug_imagenet_policies
+from autogluon.utils.batch_augment import BatchAugmentation, BatchRandAugment, batch_augment_dict
+
+
+def _random_images(num_images=4, height=24, width=32):
+    rng = np.random.RandomState(0)
+    imgs = rng.randint(0, 256, size=(num_images, height, width, 3)).astype(np.uint8)
+    # A low contrast image, so that AutoContrast and Equalize do not map it to itself
+    imgs[0] = imgs[0] // 4 + 100
+    return imgs
+
+
+def _pil_ops(imgs, name, values):
+    return np.stack([np.asarray(getattr(augment, name)(Image.fromarray(img), value))
+                     for img, value in zip(imgs, values)])
+
+
+@pytest.mark.parametrize('name,values', [
+    ('AutoContrast', [0, 0, 0, 0]),
+    ('Invert', [0, 0, 0, 0]),
+    ('Equalize', [0, 0, 0, 0]),
+    ('Flip', [0, 0, 0, 0]),
+    ('Solarize', [0, 64, 128, 256]),
+    ('Posterize', [4, 5, 6, 8]),
+    ('Contrast', [0.1, 0.5, 1.3, 1.9]),
+    ('Brightness', [0.1, 0.5, 1.3, 1.9]),
+    ('TranslateX', [0.25, -0.125, 0.0, 0.375]),
+    ('TranslateY', [0.25, -0.125, 0.0, 0.375]),
+    ('Rotate', [-30, -10, 15, 30]),
+])
+def test_batch_ops_match_pil_ops(monkeypatch, name, values):
+    monkeypatch.setattr(augment, 'random_mirror', False)
+    imgs = _random_images()
+    values = np.array(values, dtype=np.float32)
+    expected = _pil_ops(imgs, name, values)
+    np.testing.assert_array_equal(batch_augment_dict[name](imgs, values), expected)
+
+
+@pytest.mark.parametrize('name', ['Color', 'Sharpness'])
+def test_batch_enhance_ops_close_to_pil_ops(name):
+    imgs = _random_images()
+    values = np.array([0.1, 0.5, 1.3, 1.9], dtype=np.float32)
+    expected = _pil_ops(imgs, name, values).astype(np.int64)
+    assert np.abs(batch_augment_dict[name](imgs, values).astype(np.int64) - expected).max() <= 1
+
+
+@pytest.mark.parametrize('transform', [BatchAugmentation(autoaug_imagenet_policies()), BatchRandAugment(2, 9)])
+def test_batch_augmentation(transform):
+    np.random.seed(0)
+    imgs = _random_images(num_images=16)
+    imgs_augmented = transform(imgs)
+    assert imgs_augmented.shape == imgs.shape
+    assert imgs_augmented.dtype == np.uint8
+    # Inputs are not modified in place
+    np.testing.assert_array_equal(imgs, _random_images(num_images=16))
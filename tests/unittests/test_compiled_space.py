@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+import ConfigSpace as CS
+import ConfigSpace.hyperparameters as CSH
+
+import autogluon as ag
+from autogluon.core.compiled_space import CompiledSpace
+
+
+def _conditional_configspace():
+    cs = CS.ConfigurationSpace()
+    optimizer = CSH.CategoricalHyperparameter('optimizer', choices=['sgd', 'adam', 'rmsprop'])
+    lr = CSH.UniformFloatHyperparameter('lr', lower=1e-4, upper=1e-1, log=True)
+    momentum = CSH.UniformFloatHyperparameter('momentum', lower=0.5, upper=0.99)
+    nesterov = CSH.CategoricalHyperparameter('nesterov', choices=[True, False])
+    beta1 = CSH.UniformFloatHyperparameter('beta1', lower=0.8, upper=0.99)
+    layers = CSH.UniformIntegerHyperparameter('layers', lower=1, upper=8)
+    width = CSH.UniformIntegerHyperparameter('width', lower=16, upper=512, log=True)
+    depth_ratio = CSH.OrdinalHyperparameter('depth_ratio', sequence=['low', 'medium', 'high'])
+    cs.add_hyperparameters([optimizer, lr, momentum, nesterov, beta1, layers, width, depth_ratio])
+    cs.add_conditions([
+        CS.InCondition(momentum, optimizer, ['sgd', 'rmsprop']),
+        # Nested condition: nesterov is only active if momentum is active
+        CS.AndConjunction(CS.EqualsCondition(nesterov, optimizer, 'sgd'),
+                          CS.GreaterThanCondition(nesterov, momentum, 0.7)),
+        CS.EqualsCondition(beta1, optimizer, 'adam'),
+        CS.OrConjunction(CS.GreaterThanCondition(width, layers, 4),
+                         CS.EqualsCondition(width, depth_ratio, 'high')),
+    ])
+    return cs
+
+
+def test_compiled_space_samples_are_valid_configs():
+    cs = _conditional_configspace()
+    compiled = CompiledSpace(cs)
+    assert len(compiled) == len(cs.get_hyperparameters())
+    samples = compiled.sample(500, random_state=np.random.RandomState(0))
+    assert samples.shape == (500, len(compiled))
+    active_counts = {name: 0 for name in compiled.names}
+    for config in compiled.to_configs(samples):
+        # Raises if values are out of range, or if the active hyperparameters do not match the conditions
+        CS.Configuration(cs, values=config)
+        for name in config:
+            active_counts[name] += 1
+    # Each branch of the conditions is sampled
+    assert active_counts['optimizer'] == 500
+    assert 0 < active_counts['nesterov'] < active_counts['momentum'] < 500
+    assert 0 < active_counts['beta1'] < 500
+    assert 0 < active_counts['width'] < 500
+
+
+def test_compiled_space_sampling_is_reproducible():
+    compiled = CompiledSpace(_conditional_configspace())
+    samples_a = compiled.sample(100, random_state=np.random.RandomState(1))
+    samples_b = compiled.sample(100, random_state=np.random.RandomState(1))
+    np.testing.assert_array_equal(samples_a, samples_b)
+
+
+def test_compiled_autogluon_space():
+    space = ag.space.Dict(
+        lr=ag.space.Real(1e-4, 1e-1, log=True),
+        model=ag.space.Categorical('resnet18', 'resnet50'),
+        layers=ag.space.Int(2, 6))
+    compiled = CompiledSpace(space)
+    samples = compiled.sample(200, random_state=np.random.RandomState(0))
+    for config in compiled.to_configs(samples):
+        CS.Configuration(space.cs, values=config)
+        sampled = space.sample(**config)
+        assert 1e-4 <= sampled['lr'] <= 1e-1
+        assert sampled['model'] in ('resnet18', 'resnet50')
+        assert 2 <= sampled['layers'] <= 6
+
+
+def test_compiled_space_rejects_forbidden_clauses():
+    cs = CS.ConfigurationSpace()
+    a = CSH.CategoricalHyperparameter('a', choices=['x', 'y'])
+    b = CSH.CategoricalHyperparameter('b', choices=['x', 'y'])
+    cs.add_hyperparameters([a, b])
+    cs.add_forbidden_clause(CS.ForbiddenAndConjunction(CS.ForbiddenEqualsClause(a, 'y'), CS.ForbiddenEqualsClause(b, 'y')))
+    with pytest.raises(NotImplementedError):
+        CompiledSpace(cs)
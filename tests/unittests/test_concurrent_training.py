@@ -0,0 +1,106 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from autogluon import TabularPrediction as task
+from autogluon.utils.tabular.ml.models.lgb.lgb_model import LGBModel
+from autogluon.utils.tabular.ml.models.tabular_nn.tabular_nn_model import TabularNeuralNetModel
+from autogluon.utils.tabular.ml.trainer import abstract_trainer
+
+_hyperparameters = {'GBM': {'num_boost_round': 20}, 'RF': {'n_estimators': 20, 'random_state': 0}, 'KNN': {},
+                    'NN': {'num_epochs': 2, 'seed_value': 0}}
+
+
+def _data(num_rows):
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame({'a': rng.rand(num_rows), 'b': rng.rand(num_rows), 'c': rng.choice(['x', 'y', 'z'], num_rows)})
+    X['label'] = np.where(X['a'] + X['b'] + rng.rand(num_rows) + (X['c'] == 'x') > 1.5, 'pos', 'neg')
+    return X
+
+
+def _record_fit_threads(monkeypatch, model_type, fit_threads):
+    fit_og = model_type._fit
+
+    def _fit(self, *args, **kwargs):
+        fit_threads.append((model_type.__name__, threading.current_thread() is threading.main_thread()))
+        return fit_og(self, *args, **kwargs)
+    monkeypatch.setattr(model_type, '_fit', _fit)
+
+
+def test_concurrent_training_matches_serial_training(tmpdir, monkeypatch):
+    fit_kwargs = dict(train_data=_data(300), label='label', hyperparameters=_hyperparameters, num_bagging_folds=2,
+                      stack_ensemble_levels=1, verbosity=0)
+    predictor = task.fit(output_directory=str(tmpdir.join('serial')), **fit_kwargs)
+
+    monkeypatch.setattr(abstract_trainer.multiprocessing, 'cpu_count', lambda: 4)
+    fit_threads = []
+    _record_fit_threads(monkeypatch, LGBModel, fit_threads)
+    _record_fit_threads(monkeypatch, TabularNeuralNetModel, fit_threads)
+    predictor_concurrent = task.fit(output_directory=str(tmpdir.join('concurrent')), max_models_concurrent=3,
+                                    **fit_kwargs)
+    # The neural networks are not fit concurrently with other models
+    assert ('LGBModel', False) in fit_threads
+    assert ('TabularNeuralNetModel', True) in fit_threads
+    assert ('TabularNeuralNetModel', False) not in fit_threads
+
+    # The models are seeded, so that the ensembles select the same base models
+    trainer, trainer_concurrent = predictor._trainer, predictor_concurrent._trainer
+    assert list(trainer_concurrent.model_graph.nodes) == list(trainer.model_graph.nodes)
+    assert sorted(trainer_concurrent.model_graph.edges) == sorted(trainer.model_graph.edges)
+    assert trainer_concurrent.models_level == trainer.models_level
+    for model_name, node in trainer.model_graph.nodes(data=True):
+        node_concurrent = trainer_concurrent.model_graph.nodes[model_name]
+        assert set(node_concurrent) == set(node)
+        assert node_concurrent['can_infer'] == node['can_infer']
+        assert node_concurrent['val_score'] == pytest.approx(node['val_score'])
+
+
+class _Model:
+    def __init__(self, name, fit_duration, can_fit_concurrently=True):
+        self.name = name
+        self.fit_duration = fit_duration
+        self._can_fit_concurrently = can_fit_concurrently
+
+    def can_fit_concurrently(self):
+        return self._can_fit_concurrently
+
+
+def test_concurrent_training_reallocates_time(tmpdir, monkeypatch):
+    predictor = task.fit(train_data=_data(100), label='label', output_directory=str(tmpdir),
+                         hyperparameters={'GBM': {'num_boost_round': 10}}, verbosity=0)
+    trainer = predictor._trainer
+    monkeypatch.setattr(abstract_trainer.multiprocessing, 'cpu_count', lambda: 4)
+    fits = {}
+
+    def _train_and_save_model(X_train, y_train, X_val, y_val, model, time_limit=None, num_cpus=None, **kwargs):
+        fits[model.name] = dict(time_limit=time_limit, num_cpus=num_cpus,
+                                main_thread=threading.current_thread() is threading.main_thread())
+        time.sleep(model.fit_duration)
+        return None
+    monkeypatch.setattr(trainer, '_train_and_save_model', _train_and_save_model)
+    monkeypatch.setattr(trainer, 'save', lambda: None)
+    monkeypatch.setattr(trainer, 'max_models_concurrent', 2)
+    models = [_Model('fast', 0.05), _Model('slow', 1), _Model('after_fast', 0.05), _Model('after_after_fast', 0.05),
+              _Model('serial', 0, can_fit_concurrently=False)]
+    time_limit = 10
+    assert trainer.train_multi_fold_concurrent(None, None, None, None, models, time_limit=time_limit) == []
+
+    # The first models share the time of the 2 workers with the models queued behind them
+    assert fits['fast']['time_limit'] == pytest.approx(2 * time_limit / len(models), abs=0.1)
+    assert fits['slow']['time_limit'] == pytest.approx(2 * time_limit / len(models), abs=0.1)
+    # The time left unused by the fast models is given to the models started after them
+    assert fits['after_fast']['time_limit'] > fits['fast']['time_limit'] + 1
+    assert fits['after_after_fast']['time_limit'] > fits['after_fast']['time_limit']
+    # Each worker uses its share of the CPUs, at most nthreads_per_trial
+    num_cpus = min(2, trainer.scheduler_options['resource']['num_cpus'])
+    for model_name in ['fast', 'slow', 'after_fast', 'after_after_fast']:
+        assert fits[model_name]['num_cpus'] == num_cpus
+        assert not fits[model_name]['main_thread']
+        assert fits[model_name]['time_limit'] <= time_limit
+    # Models that cannot be fit concurrently are fit with all CPUs once the other models finished
+    assert fits['serial']['main_thread']
+    assert fits['serial']['num_cpus'] is None
+    assert time_limit - 1.5 < fits['serial']['time_limit'] < time_limit - 1
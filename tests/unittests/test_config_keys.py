@@ -0,0 +1,66 @@
+import pickle
+from collections import OrderedDict
+
+import numpy as np
+import pytest
+import ConfigSpace as CS
+import ConfigSpace.hyperparameters as CSH
+
+from autogluon.searcher import RandomSearcher, SKoptSearcher
+from autogluon.searcher.config_keys import config_to_key, key_to_config, keys_from_legacy_results, num_configurations
+
+
+def _finite_configspace():
+    cs = CS.ConfigurationSpace()
+    cs.add_hyperparameters([
+        CSH.CategoricalHyperparameter('model', choices=['resnet', 'vgg', 'mlp']),
+        CSH.UniformIntegerHyperparameter('layers', lower=1, upper=2),
+    ])
+    return cs
+
+
+def test_config_to_key():
+    config = {'lr': 0.1, 'layers': 2, 'model': 'resnet'}
+    key = config_to_key(config)
+    # Keys do not depend on the order of entries or on NumPy scalar types
+    assert config_to_key({'model': 'resnet', 'lr': 0.1, 'layers': 2}) == key
+    key_numpy = config_to_key({'lr': np.float64(0.1), 'layers': np.int64(2), 'model': np.str_('resnet')})
+    assert key_numpy == key
+    assert hash(key_numpy) == hash(key)
+    assert all(type(value) in (float, int, str) for _, value in key_numpy)
+    assert key_to_config(key) == config
+    assert config_to_key({'lr': 0.2, 'layers': 2, 'model': 'resnet'}) != key
+
+    cs = _finite_configspace()
+    configuration = CS.Configuration(cs, values={'model': 'vgg', 'layers': 1})
+    assert config_to_key(configuration) == config_to_key({'layers': 1, 'model': 'vgg'})
+
+
+def test_keys_from_legacy_results():
+    config_a = {'model': 'vgg', 'layers': 1}
+    config_b = {'layers': 2, 'model': 'mlp'}
+    legacy_results = OrderedDict([(pickle.dumps(config_a), 0.5), (config_to_key(config_b), 0.7)])
+    results = keys_from_legacy_results(legacy_results)
+    assert list(results.items()) == [(config_to_key(config_a), 0.5), (config_to_key(config_b), 0.7)]
+
+    searcher = RandomSearcher(_finite_configspace(), reward_attribute='accuracy')
+    state = searcher.get_state()
+    state['results'] = legacy_results
+    new_searcher = searcher.clone_from_state(state)
+    assert new_searcher.get_reward(config_a) == 0.5
+    assert new_searcher.get_best_config() == config_b
+
+
+@pytest.mark.parametrize('searcher_cls', [RandomSearcher, SKoptSearcher])
+def test_finite_space_exhaustion(searcher_cls):
+    cs = _finite_configspace()
+    assert num_configurations(cs) == 6
+    searcher = searcher_cls(cs, reward_attribute='accuracy')
+    config_keys = set()
+    for i in range(6):
+        config = searcher.get_config()
+        config_keys.add(config_to_key(config))
+        searcher.update(config, accuracy=float(i))
+    assert len(config_keys) == 6
+    with pytest.raises(AssertionError):
+        searcher.get_config()
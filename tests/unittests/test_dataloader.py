@@ -0,0 +1,69 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+from mxnet import nd
+
+from autogluon.utils import dataloader
+from autogluon.utils.dataloader import DataLoader
+
+
+def _numpy_batchify_fn(samples):
+    return np.stack(samples)
+
+
+def _check_batches(loader, dataset, batch_size):
+    for _ in range(2):
+        batches = [np.asarray(batch) for batch in loader]
+        assert len(batches) == len(loader)
+        for i, batch in enumerate(batches):
+            np.testing.assert_array_equal(batch, dataset[i * batch_size:(i + 1) * batch_size])
+
+
+def test_thread_pool_dataloader():
+    dataset = np.arange(48, dtype='float32').reshape(24, 2)
+    loader = DataLoader(dataset, batch_size=4, num_workers=2, thread_pool=True,
+                        batchify_fn=_numpy_batchify_fn)
+    _check_batches(loader, dataset, batch_size=4)
+
+
+def test_multiprocessing_dataloader():
+    dataset = np.arange(288, dtype='float32').reshape(24, 3, 4)
+    loader = DataLoader(dataset, batch_size=4, num_workers=2,
+                        batchify_fn=_numpy_batchify_fn)
+    _check_batches(loader, dataset, batch_size=4)
+
+
+def test_multiprocessing_dataloader_default_batchify_fn():
+    data = np.arange(288, dtype='float32').reshape(24, 3, 4)
+    labels = np.arange(24, dtype='int32')
+    dataset = list(zip(data, labels))
+    loader = DataLoader(dataset, batch_size=4, num_workers=2)
+    for _ in range(2):
+        loader_iter = iter(loader)
+        for i, (batch_data, batch_labels) in enumerate(loader_iter):
+            # The shared memory NDArrays of default_mp_batchify_fn are also written into the shared memory ring
+            if i > 0:
+                assert loader_iter._shm_ring is not None
+            assert isinstance(batch_data, nd.NDArray)
+            np.testing.assert_array_equal(batch_data.asnumpy(), data[i * 4:(i + 1) * 4])
+            np.testing.assert_array_equal(batch_labels.asnumpy(), labels[i * 4:(i + 1) * 4])
+        assert i == 5
+
+
+def test_worker_shm_generations(monkeypatch):
+    monkeypatch.setattr(dataloader, '_worker_shm_cache', {})
+    monkeypatch.setattr(dataloader, '_worker_shm_generation', None)
+    ring_0 = [shared_memory.SharedMemory(create=True, size=64) for _ in range(2)]
+    ring_1 = [shared_memory.SharedMemory(create=True, size=64)]
+    try:
+        attached_0 = [dataloader._get_worker_shm(shm.name, generation=0) for shm in ring_0]
+        assert dataloader._get_worker_shm(ring_0[0].name, generation=0) is attached_0[0]
+        attached_1 = dataloader._get_worker_shm(ring_1[0].name, generation=1)
+        # Blocks of the previous ring are detached once a block of a new ring is used
+        assert list(dataloader._worker_shm_cache.values()) == [attached_1]
+        assert all(shm.buf is None for shm in attached_0)
+        attached_1.close()
+    finally:
+        for shm in ring_0 + ring_1:
+            shm.close()
+            shm.unlink()
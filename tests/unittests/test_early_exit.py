@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from autogluon import TabularPrediction as task
+from autogluon.utils.tabular.metrics import log_loss, root_mean_squared_error
+from autogluon.utils.tabular.ml.constants import MULTICLASS, REGRESSION
+from autogluon.utils.tabular.ml.models.ensemble.greedy_weighted_ensemble_model import GreedyWeightedEnsembleModel
+
+_num_rows = 200
+_num_classes = 3
+
+
+def _base_model_preds(problem_type):
+    rng = np.random.RandomState(0)
+    if problem_type == REGRESSION:
+        y = rng.rand(_num_rows)
+        preds = {f'model_{i}': y + noise * rng.randn(_num_rows) for i, noise in enumerate([0.2, 0.25, 0.3, 0.35, 0.4])}
+        return preds, pd.Series(y)
+    y = rng.randint(0, _num_classes, size=_num_rows)
+    preds = {}
+    for i in range(5):
+        logits = np.eye(_num_classes)[y] + 3 * rng.rand(_num_rows, _num_classes)
+        preds[f'model_{i}'] = logits / logits.sum(axis=1, keepdims=True)
+    return preds, pd.Series(y)
+
+
+def _fit_ensemble(tmpdir, problem_type):
+    preds, y = _base_model_preds(problem_type)
+    model = GreedyWeightedEnsembleModel(path=str(tmpdir) + '/', name='greedy_ensemble', problem_type=problem_type,
+                                        eval_metric=root_mean_squared_error if problem_type == REGRESSION else log_loss,
+                                        num_classes=_num_classes, base_model_names=list(preds.keys()))
+    model.fit(X_train=pd.DataFrame(np.column_stack(list(preds.values())), columns=model.features), y_train=y)
+    X = pd.DataFrame(np.column_stack([preds[base_model_name] for base_model_name in model.base_model_names]),
+                     columns=model.features)
+    return model, preds, model.predict_proba(X)
+
+
+@pytest.mark.parametrize('early_exit_tol', [0, 0.2, 0.5])
+def test_greedy_weighted_ensemble_early_exit(tmpdir, early_exit_tol):
+    model, preds, expected_pred_proba = _fit_ensemble(tmpdir, MULTICLASS)
+    model_weights = model._get_model_weights()
+    assert len(model_weights) > 2
+    base_models_evaluated = []
+
+    def get_base_pred_proba(base_model_name):
+        base_models_evaluated.append(base_model_name)
+        return preds[base_model_name]
+
+    pred_proba, early_exit_info = model.predict_proba_early_exit(get_base_pred_proba, early_exit_tol=early_exit_tol)
+    # Base models are evaluated in descending order of weight, the skipped base models are never evaluated
+    weights_evaluated = [model_weights[base_model_name] for base_model_name in base_models_evaluated]
+    assert weights_evaluated == sorted(weights_evaluated, reverse=True)
+    assert early_exit_info['base_models_used'] == base_models_evaluated
+    assert sorted(base_models_evaluated + early_exit_info['base_models_skipped']) == sorted(model_weights)
+    weight_skipped = sum(model_weights[base_model_name] for base_model_name in early_exit_info['base_models_skipped'])
+    assert early_exit_info['weight_skipped'] == pytest.approx(weight_skipped)
+    assert weight_skipped <= early_exit_tol + 1e-12
+    # Evaluation stops as soon as the remaining weight is within the tolerance
+    assert weight_skipped + weights_evaluated[-1] > early_exit_tol
+    if early_exit_tol == 0:
+        np.testing.assert_allclose(pred_proba, expected_pred_proba)
+    else:
+        assert early_exit_info['base_models_skipped']
+    assert np.abs(pred_proba - expected_pred_proba).max() <= early_exit_tol + 1e-12
+
+
+def test_greedy_weighted_ensemble_early_exit_regression(tmpdir):
+    model, preds, expected_pred = _fit_ensemble(tmpdir, REGRESSION)
+    # Regression predictions are not bounded, so all base models are evaluated
+    pred, early_exit_info = model.predict_proba_early_exit(lambda base_model_name: preds[base_model_name],
+                                                           early_exit_tol=0.5)
+    assert early_exit_info['base_models_skipped'] == []
+    np.testing.assert_allclose(pred, expected_pred)
+
+
+def _data(num_rows):
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame({'a': rng.rand(num_rows), 'b': rng.rand(num_rows), 'c': rng.choice(['x', 'y', 'z'], num_rows)})
+    X['label'] = np.where(X['a'] + X['b'] + rng.rand(num_rows) + (X['c'] == 'x') > 1.5, 'pos', 'neg')
+    return X
+
+
+def test_predictor_early_exit_info(tmpdir):
+    predictor = task.fit(train_data=_data(300), label='label', output_directory=str(tmpdir),
+                         hyperparameters={'GBM': {'num_boost_round': 20}, 'RF': {'n_estimators': 20, 'random_state': 0},
+                                          'KNN': {}},
+                         num_bagging_folds=3, eval_metric='log_loss', verbosity=0)
+    X = _data(100).drop(columns=['label'])
+    ensemble = 'weighted_ensemble_k0_l1'
+    model_weights = predictor._trainer.load_model(ensemble)._get_model_weights()
+    assert len(model_weights) > 1
+    predictor.predict_proba(X, model=ensemble)
+    assert predictor.early_exit_info is None
+
+    pred_proba = predictor.predict_proba(X, model=ensemble, early_exit_tol=0)
+    early_exit_info = predictor.early_exit_info
+    assert set(early_exit_info[ensemble]['base_models_used']) == set(model_weights)
+    assert set(early_exit_info) == {ensemble, *model_weights}
+    # The bagged base models exit early on their own, the weighted ensemble combines their predictions
+    base_pred_probas = {base_model_name: predictor.predict_proba(X, model=base_model_name, early_exit_tol=0)
+                        for base_model_name in model_weights}
+    expected_pred_proba = sum(weight * base_pred_probas[base_model_name]
+                              for base_model_name, weight in model_weights.items())
+    np.testing.assert_allclose(pred_proba, expected_pred_proba, atol=1e-6)
+
+    early_exit_tol = 1 - max(model_weights.values())  # Only the base model with the highest weight is evaluated
+    pred_proba = predictor.predict_proba(X, model=ensemble, early_exit_tol=early_exit_tol)
+    early_exit_info = predictor.early_exit_info
+    base_model_best = max(model_weights, key=model_weights.get)
+    assert early_exit_info[ensemble]['base_models_used'] == [base_model_best]
+    assert early_exit_info[ensemble]['weight_skipped'] == pytest.approx(early_exit_tol)
+    # The skipped base models are not evaluated
+    assert set(early_exit_info) == {ensemble, base_model_best}
+    # The information is kept until the next prediction with early exit
+    predictor.predict(X, model=ensemble)
+    assert predictor.early_exit_info is early_exit_info
+    base_pred_proba = predictor.predict_proba(X, model=base_model_best, early_exit_tol=early_exit_tol)
+    np.testing.assert_allclose(pred_proba, base_pred_proba, atol=1e-6)
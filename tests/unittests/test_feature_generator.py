@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from autogluon.utils.tabular.features.abstract_feature_generator import AbstractFeatureGenerator
+from autogluon.utils.tabular.features.auto_ml_feature_generator import AutoMLFeatureGenerator
+
+
+def _mixed_dtypes_with_nans():
+    X = pd.DataFrame({
+        'float': [1.0, np.nan, 3.0, -0.0, 5.0, 1.0],
+        'int': [1, 2, 3, 0, 5, 1],
+        'float_dup': [1.0, np.nan, 3.0, 0.0, 5.0, 1.0],
+        'object_numbers': pd.Series([1, None, 3, 0, 5, 1], dtype=object),
+        'object': ['a', None, 'c', 'd', np.nan, 'a'],
+        'object_nan': ['a', np.nan, 'c', 'd', None, 'a'],
+        'category': pd.Categorical(['a', np.nan, 'c', 'd', np.nan, 'a']),
+        'category_numbers': pd.Categorical([1.0, np.nan, 3.0, 0.0, 5.0, 1.0]),
+        'object_reordered': ['a', 'c', None, 'd', np.nan, 'a'],
+        'category_int': pd.Categorical([1, 2, 3, 0, 5, 1]),
+        'bool': [True, False, True, False, True, True],
+        'all_nan': [np.nan] * 6,
+        'all_none': pd.Series([None] * 6, dtype=object),
+    })
+    return X
+
+
+def test_drop_duplicate_features_matches_transpose():
+    X = _mixed_dtypes_with_nans()
+    X_expected = X.T.drop_duplicates().T
+    X_dedup = AbstractFeatureGenerator.drop_duplicate_features(X)
+    assert list(X_dedup.columns) == list(X_expected.columns)
+
+
+def test_column_hashes_of_duplicates_match():
+    X = _mixed_dtypes_with_nans()
+    column_hashes = AbstractFeatureGenerator.get_column_hashes(X)
+    for column_a, column_b in [('float', 'float_dup'), ('float', 'object_numbers'), ('float', 'category_numbers'),
+                               ('object', 'object_nan'), ('object', 'category'), ('int', 'category_int'),
+                               ('all_nan', 'all_none')]:
+        assert column_hashes[column_a] == column_hashes[column_b], (column_a, column_b)
+    assert column_hashes['object'] != column_hashes['object_reordered']
+    # Blocks of numeric columns hash the same as single columns
+    assert AbstractFeatureGenerator.get_column_hashes(X, max_block_size=1) == column_hashes
+
+
+def test_drop_duplicate_features_nullable_dtypes():
+    X = pd.DataFrame({
+        'float': [1.0, np.nan, 3.0],
+        'Int64': pd.array([1, None, 3], dtype='Int64'),
+        'object': pd.Series([1, None, 3], dtype=object),
+        'Int64_other': pd.array([1, 2, None], dtype='Int64'),
+    })
+    assert AbstractFeatureGenerator.is_equal_column(X['float'], X['Int64'])
+    if hasattr(pd, 'NA'):
+        # Depending on the pandas version, Int64 columns are converted to NumPy with pd.NA as missing value
+        assert AbstractFeatureGenerator.is_equal_column(X['float'], pd.Series([1, pd.NA, 3], dtype=object))
+    assert not AbstractFeatureGenerator.is_equal_column(X['Int64'], X['Int64_other'])
+    X_dedup = AbstractFeatureGenerator.drop_duplicate_features(X)
+    assert list(X_dedup.columns) == ['float', 'Int64_other']
+
+
+def _text_and_datetime_data(num_rows=200):
+    rng = np.random.RandomState(0)
+    words = np.array(['red', 'green', 'blue', 'yellow', 'black', 'white'])
+    separators = [' ', '  ', ', ', '! ']
+    X = pd.DataFrame({'int': rng.randint(0, 10, size=num_rows)})
+    for i in range(3):
+        X[f'text_{i}'] = [''.join(word + rng.choice(separators) for word in rng.choice(words, size=rng.randint(3, 8)))
+                          for _ in range(num_rows)]
+        X[f'datetime_{i}'] = pd.Series(pd.date_range('2020-01-01', periods=num_rows, freq=f'{i + 1}D')).astype(str)
+    return X
+
+
+def test_transform_column_groups_parallel_matches_serial():
+    X = _text_and_datetime_data()
+    X_test = _text_and_datetime_data(num_rows=50)
+    outputs = []
+    for n_jobs in [1, 2]:
+        feature_generator = AutoMLFeatureGenerator(enable_text_ngram_features=False)
+        feature_generator.n_jobs = n_jobs
+        feature_generator.parallel_min_rows = 0
+        outputs.append((feature_generator.fit_transform(X.copy()), feature_generator.transform(X_test.copy())))
+        assert feature_generator._pool is None
+    (X_serial, X_test_serial), (X_parallel, X_test_parallel) = outputs
+    assert any('.symbol_count.' in column for column in X_serial.columns)
+    assert 'datetime_2' in X_serial.columns
+    pd.testing.assert_frame_equal(X_parallel, X_serial)
+    pd.testing.assert_frame_equal(X_test_parallel, X_test_serial)
+
+
+def _raise_value_error(chunk):
+    raise ValueError(chunk)
+
+
+def test_transform_column_groups_raises_transformer_errors():
+    feature_generator = AutoMLFeatureGenerator()
+    feature_generator.n_jobs = 2
+    feature_generator.parallel_min_rows = 0
+    with pytest.raises(ValueError):
+        feature_generator.transform_column_groups(transformer=_raise_value_error, chunks=['a', 'b'], num_rows=1)
+    # Errors of the transformer do not fall back to the serial transform, which would close the pool
+    assert feature_generator._pool is not None
+    feature_generator._close_pool()
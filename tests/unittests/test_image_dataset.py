@@ -0,0 +1,83 @@
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from autogluon.task.image_classification import dataset as image_dataset
+from autogluon.task.image_classification.dataset import RecordDataset, get_dataset, pack_dataset, pack_image_folder
+
+_classes = ['cat', 'dog']
+_sizes = [(40, 30), (20, 60), (10, 12)]
+
+
+def _image_folder(path):
+    rng = np.random.RandomState(0)
+    items = []
+    for label, class_name in enumerate(_classes):
+        os.makedirs(os.path.join(path, class_name))
+        for i, (width, height) in enumerate(_sizes):
+            filename = os.path.join(path, class_name, f'{i}.png')
+            Image.fromarray(rng.randint(0, 256, size=(height, width, 3)).astype(np.uint8)).save(filename)
+            items.append((filename, label))
+    return items
+
+
+def test_pack_image_folder(tmpdir, monkeypatch):
+    items = _image_folder(str(tmpdir.join('images')))
+    cache_dir = str(tmpdir.join('cache'))
+    rec_path = pack_image_folder(items, cache_dir, short_size=20, num_workers=1, classes=_classes)
+    assert sorted(os.listdir(cache_dir)) == sorted(os.path.basename(rec_path)[:-len('.rec')] + extension
+                                                   for extension in ['.rec', '.idx', '.classes.json'])
+
+    # The classes are read from the file stored next to the packed images, instead of from every record
+    monkeypatch.setattr(image_dataset, 'RecordFileDataset', None)
+    dataset = RecordDataset(rec_path).init()
+    assert dataset.classes == _classes
+    assert dataset.num_classes == 2
+    assert len(dataset) == len(items)
+    for (img, label), (_, expected_label) in zip(dataset, items):
+        assert label == expected_label
+    # Images are downsized to a shorter side of short_size, smaller images are not resized
+    assert [dataset[i][0].shape for i in range(len(_sizes))] == [(20, 27, 3), (60, 20, 3), (12, 10, 3)]
+
+
+def test_pack_image_folder_fingerprint(tmpdir, monkeypatch):
+    items = _image_folder(str(tmpdir.join('images')))
+    cache_dir = str(tmpdir.join('cache'))
+    rec_path = pack_image_folder(items, cache_dir, short_size=20, num_workers=1, classes=_classes)
+
+    # Packed files of the same images and options are reused without decoding the images again
+    with monkeypatch.context() as m:
+        m.setattr(image_dataset.multiprocessing, 'Pool', None)
+        assert pack_image_folder(items, cache_dir, short_size=20, num_workers=1, classes=_classes) == rec_path
+
+    rec_paths = {rec_path}
+    rec_paths.add(pack_image_folder(items, cache_dir, short_size=16, num_workers=1, classes=_classes))
+    rec_paths.add(pack_image_folder(items, cache_dir, short_size=20, num_workers=1, classes=['a', 'b']))
+    rec_paths.add(pack_image_folder(items[:-1], cache_dir, short_size=20, num_workers=1, classes=_classes))
+    stat = os.stat(items[0][0])
+    os.utime(items[0][0], (stat.st_atime, stat.st_mtime + 10))
+    rec_paths.add(pack_image_folder(items, cache_dir, short_size=20, num_workers=1, classes=_classes))
+    assert len(rec_paths) == 5
+
+
+@pytest.mark.skipif(image_dataset._is_osx, reason='Image folders are not packed on macOS')
+def test_get_dataset_packing_is_opt_in(tmpdir):
+    path = str(tmpdir.join('images'))
+    _image_folder(path)
+    cache_dir = str(tmpdir.join('cache'))
+
+    dataset = get_dataset(path=path)
+    pack_dataset(dataset)
+    assert not os.path.exists(cache_dir)
+    assert type(dataset.init()).__name__ != 'RecordDataset'
+
+    dataset = get_dataset(path=path, input_size=16, crop_ratio=0.8, cache_dir=cache_dir)
+    pack_dataset(dataset)
+    assert len([filename for filename in os.listdir(cache_dir) if filename.endswith('.rec')]) == 1
+    dataset = dataset.init()
+    # RecordDataset is wrapped by the obj() decorator, the initialized dataset is an instance of the original class
+    assert type(dataset).__name__ == 'RecordDataset'
+    assert dataset.classes == _classes
+    assert len(dataset) == 2 * len(_sizes)
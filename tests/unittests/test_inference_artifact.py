@@ -0,0 +1,88 @@
+import copy
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from autogluon import TabularPrediction as task
+from autogluon.utils.tabular.ml.models.tabular_nn.tabular_nn_model import TabularNeuralNetModel
+
+# Loads an artifact in a new process, in which the autogluon package was not imported
+_load_and_predict = """
+import sys
+import numpy as np
+import pandas as pd
+from autogluon_inference import load_inference_artifact
+artifact_path, data_path, output_path = sys.argv[1:]
+artifact = load_inference_artifact(artifact_path)
+X = pd.read_csv(data_path)
+np.save(output_path, artifact.predict_proba(X, as_multiclass=True))
+print(','.join(artifact.predict(X)))
+print('mxnet' in sys.modules, 'autogluon.core' in sys.modules, 'autogluon.scheduler' in sys.modules)
+"""
+
+
+def _data(num_rows):
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame({
+        'a': rng.rand(num_rows),
+        'b': rng.rand(num_rows),
+        'c': rng.choice(['x', 'y', 'z'], size=num_rows),
+    })
+    X['label'] = np.where(X['a'] + (X['c'] == 'x') > 0.8, 'pos', 'neg')
+    return X
+
+
+@pytest.fixture(scope='module')
+def predictor(tmpdir_factory):
+    return task.fit(train_data=_data(300), label='label', output_directory=str(tmpdir_factory.mktemp('predictor')),
+                    hyperparameters={'GBM': {'num_boost_round': 20}, 'NN': {'num_epochs': 2}},
+                    num_bagging_folds=2, stack_ensemble_levels=1, verbosity=0)
+
+
+def _load_and_predict_in_new_process(tmpdir, artifact_path, X):
+    data_path = str(tmpdir.join('X.csv'))
+    output_path = str(tmpdir.join('pred_proba.npy'))
+    X.to_csv(data_path, index=False)
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path for path in sys.path if path))
+    output = subprocess.run([sys.executable, '-c', _load_and_predict, artifact_path, data_path, output_path],
+                            stdout=subprocess.PIPE, env=env, check=True, universal_newlines=True).stdout
+    y_pred, imported_modules = output.strip().split('\n')[-2:]
+    return np.load(output_path), np.array(y_pred.split(',')), imported_modules.split()
+
+
+@pytest.mark.parametrize('model,imports_mxnet', [
+    ('LightGBMClassifier_STACKER_l0', False),
+    ('LightGBMClassifier_STACKER_l1', True),  # The stacker model requires the predictions of the neural network
+])
+def test_load_inference_artifact(tmpdir, predictor, model, imports_mxnet):
+    X = _data(50).drop(columns=['label'])
+    artifact_path = str(tmpdir.join('artifact.pkl'))
+    artifact = predictor.export_inference_artifact(artifact_path, model=model)
+    assert artifact.model_name == model
+
+    pred_proba, y_pred, imported_modules = _load_and_predict_in_new_process(tmpdir, artifact_path, X)
+    expected_pred_proba = predictor.predict_proba(X, model=model, as_multiclass=True)
+    np.testing.assert_allclose(pred_proba, expected_pred_proba, rtol=1e-6)
+    np.testing.assert_array_equal(y_pred, predictor.predict(X, model=model))
+    # Neither the autogluon package nor MXNet are imported, unless the artifact contains a neural network
+    assert imported_modules == [str(imports_mxnet), 'False', 'False']
+
+
+def test_tabular_nn_model_pickles_network_only_in_inference_models(predictor):
+    trainer = predictor._trainer
+    bagged_model = trainer.load_model('NeuralNetClassifier_STACKER_l0')
+    model = bagged_model.load_child(bagged_model.models[0])
+    assert isinstance(model, TabularNeuralNetModel)
+    assert model.__getstate__()['model'] is model.model
+
+    X = trainer.load_X_train()
+    model_copy = copy.deepcopy(model)
+    model_copy.convert_to_inference_model()
+    assert model_copy.__getstate__()['model'] is None
+    model_inference = copy.deepcopy(model_copy)
+    assert model_inference.model is not None
+    np.testing.assert_allclose(model_inference.predict_proba(X), model.predict_proba(X), rtol=1e-6)
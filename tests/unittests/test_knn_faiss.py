@@ -0,0 +1,107 @@
+import pickle
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
+
+from autogluon.utils.tabular.features.feature_types_metadata import FeatureTypesMetadata
+from autogluon.utils.tabular.metrics import accuracy
+from autogluon.utils.tabular.ml.constants import MULTICLASS
+from autogluon.utils.tabular.ml.models.knn.knn_model import KNNModel
+from autogluon.utils.tabular.ml.models.knn.knn_utils import FAISSNeighborsClassifier, FAISSNeighborsRegressor
+
+faiss = pytest.importorskip('faiss')
+
+
+def _data(num_rows, num_features=4, seed=0):
+    rng = np.random.RandomState(seed)
+    X = pd.DataFrame(rng.rand(num_rows, num_features) * np.arange(1, num_features + 1),
+                     columns=[f'f{i}' for i in range(num_features)])
+    y_regression = X.sum(axis=1) + 0.1 * rng.randn(num_rows)
+    y_classification = np.digitize(y_regression, np.quantile(y_regression, [0.33, 0.66]))
+    return X, y_classification, y_regression
+
+
+def _standardize(X, X_train):
+    return (X - X_train.mean()) / X_train.std(ddof=0)
+
+
+@pytest.mark.parametrize('weights', ['uniform', 'distance'])
+def test_faiss_flat_index_matches_sklearn(weights):
+    X_train, y_train, y_train_regression = _data(500)
+    X_test, _, _ = _data(100, seed=1)
+    # The Flat index is exact, so the neighbours are those found by sklearn on the standardized features
+    model = FAISSNeighborsClassifier(n_neighbors=5, weights=weights).fit(X_train, y_train)
+    with pytest.raises(RuntimeError):
+        faiss.extract_index_ivf(model.index)
+    model_sklearn = KNeighborsClassifier(n_neighbors=5, weights=weights)
+    model_sklearn.fit(_standardize(X_train, X_train), y_train)
+    X_test_standardized = _standardize(X_test, X_train)
+    np.testing.assert_allclose(model.predict_proba(X_test), model_sklearn.predict_proba(X_test_standardized),
+                               atol=1e-4)
+    np.testing.assert_array_equal(model.predict(X_test), model_sklearn.predict(X_test_standardized))
+
+    model = FAISSNeighborsRegressor(n_neighbors=5, weights=weights).fit(X_train, y_train_regression)
+    model_sklearn = KNeighborsRegressor(n_neighbors=5, weights=weights)
+    model_sklearn.fit(_standardize(X_train, X_train), y_train_regression)
+    np.testing.assert_allclose(model.predict(X_test), model_sklearn.predict(X_test_standardized), rtol=1e-4)
+
+
+def test_faiss_exact_matches_take_all_weight():
+    X_train, y_train, _ = _data(200)
+    model = FAISSNeighborsClassifier(n_neighbors=5, weights='distance').fit(X_train, y_train)
+    y_pred_proba = model.predict_proba(X_train.iloc[:20])
+    np.testing.assert_allclose(y_pred_proba, np.eye(3)[y_train[:20]])
+
+
+def test_faiss_ivf_index_above_flat_threshold():
+    X_train, y_train, _ = _data(2000)
+    X_test, _, _ = _data(200, seed=1)
+    model = FAISSNeighborsClassifier(n_neighbors=5, flat_threshold=1000, nprobe=4).fit(X_train, y_train)
+    index_ivf = faiss.extract_index_ivf(model.index)
+    assert index_ivf.nlist == 2000 // 39  # Each partition is trained on at least 39 rows
+    assert index_ivf.nprobe == 4
+    model_exact = FAISSNeighborsClassifier(n_neighbors=5, flat_threshold=2001).fit(X_train, y_train)
+    with pytest.raises(RuntimeError):
+        faiss.extract_index_ivf(model_exact.index)
+
+    # The approximate index finds most of the exact neighbours
+    _, indices = model.kneighbors(X_test)
+    _, indices_exact = model_exact.kneighbors(X_test)
+    recall = np.mean([len(set(row) & set(row_exact)) / 5 for row, row_exact in zip(indices, indices_exact)])
+    assert recall > 0.8
+
+    # The index is serialized with the model
+    model_loaded = pickle.loads(pickle.dumps(model))
+    assert faiss.extract_index_ivf(model_loaded.index).nprobe == 4
+    np.testing.assert_array_equal(model_loaded.predict_proba(X_test), model.predict_proba(X_test))
+
+
+def test_faiss_queries_in_batches():
+    X_train, y_train, _ = _data(300)
+    X_test, _, _ = _data(50, seed=1)
+    model = FAISSNeighborsClassifier(n_neighbors=3).fit(X_train, y_train)
+    distances, indices = model.kneighbors(X_test)
+    model.batch_size = 7
+    distances_batched, indices_batched = model.kneighbors(X_test)
+    np.testing.assert_array_equal(indices_batched, indices)
+    np.testing.assert_allclose(distances_batched, distances, rtol=1e-4)
+
+
+def test_knn_model_faiss_backend(tmpdir):
+    X_train, y_train, _ = _data(300)
+    X_test, _, _ = _data(50, seed=1)
+    model = KNNModel(path=str(tmpdir) + '/', name='KNeighbors', problem_type=MULTICLASS, eval_metric=accuracy,
+                     hyperparameters={'backend': 'faiss', 'n_neighbors': 5},
+                     feature_types_metadata=FeatureTypesMetadata(defaultdict(list, float=list(X_train.columns))))
+    model.fit(X_train=X_train, y_train=pd.Series(y_train))
+    assert isinstance(model.model, FAISSNeighborsClassifier)
+    model.save()
+    model_loaded = KNNModel.load(path=model.path)
+    np.testing.assert_array_equal(model_loaded.predict_proba(X_test), model.predict_proba(X_test))
+
+    with pytest.raises(ValueError):
+        KNNModel(path=str(tmpdir) + '/', name='KNeighbors', problem_type=MULTICLASS, eval_metric=accuracy,
+                 hyperparameters={'backend': 'unknown'})
@@ -0,0 +1,117 @@
+import networkx as nx
+import numpy as np
+import pandas as pd
+import pytest
+
+from autogluon.utils.tabular.metrics import accuracy, log_loss
+from autogluon.utils.tabular.ml.constants import MULTICLASS
+from autogluon.utils.tabular.ml.learner.abstract_learner import AbstractLearner
+from autogluon.utils.tabular.ml.trainer.abstract_trainer import AbstractTrainer
+from autogluon.utils.tabular.ml.tuning.ensemble_selection import EnsembleSelection
+from autogluon.utils.tabular.ml.tuning.post_hoc_ensemble import PostHocEnsembler
+
+_num_rows = 200
+_num_classes = 3
+
+
+def _model_pred_proba_dict():
+    rng = np.random.RandomState(0)
+    labels = rng.randint(0, _num_classes, size=_num_rows)
+    model_pred_proba_dict = {}
+    for i, noise in enumerate([0.5, 1.0, 2.0, 4.0]):
+        logits = np.eye(_num_classes)[labels] + noise * rng.rand(_num_rows, _num_classes)
+        model_pred_proba_dict[f'model_{i}'] = logits / logits.sum(axis=1, keepdims=True)
+    return model_pred_proba_dict, labels
+
+
+def _ensemble_selection(predictions, labels, metric):
+    ensemble_selection = EnsembleSelection(ensemble_size=20, problem_type=MULTICLASS, metric=metric)
+    ensemble_selection.fit(predictions=predictions, labels=labels)
+    return ensemble_selection
+
+
+@pytest.mark.parametrize('metric', [accuracy, log_loss])
+def test_post_hoc_ensembler_matches_ensemble_selection(metric):
+    model_pred_proba_dict, labels = _model_pred_proba_dict()
+    model_names = list(model_pred_proba_dict.keys())
+    ensembler = PostHocEnsembler(model_pred_proba_dict, labels=labels, problem_type=MULTICLASS, eval_metric=accuracy)
+    result = ensembler.fit(eval_metric=metric, ensemble_size=20)
+
+    ensemble_selection = _ensemble_selection([model_pred_proba_dict[model] for model in model_names], labels, metric)
+    expected_weights = {model: weight for model, weight in zip(model_names, ensemble_selection.weights_) if weight != 0}
+    assert result['weights'] == pytest.approx(expected_weights)
+    assert result['pred_time'] is None
+
+    pred_proba = ensembler.predict_proba(result['weights'])
+    expected_pred_proba = ensemble_selection.predict_proba([model_pred_proba_dict[model] for model in model_names])
+    np.testing.assert_allclose(pred_proba, expected_pred_proba)
+    assert result['score'] == pytest.approx(ensembler.score(pred_proba, eval_metric=metric))
+    if metric is accuracy:
+        assert result['score'] == pytest.approx(accuracy(labels, pred_proba.argmax(axis=1)))
+    else:
+        assert result['score'] == pytest.approx(log_loss(labels, pred_proba))
+
+
+def test_post_hoc_ensembler_model_subset():
+    model_pred_proba_dict, labels = _model_pred_proba_dict()
+    ensembler = PostHocEnsembler(model_pred_proba_dict, labels=labels, problem_type=MULTICLASS, eval_metric=log_loss)
+    models = ['model_3', 'model_1']
+    result = ensembler.fit(models=models, ensemble_size=20)
+    ensemble_selection = _ensemble_selection([model_pred_proba_dict[model] for model in models], labels, log_loss)
+    expected_weights = {model: weight for model, weight in zip(models, ensemble_selection.weights_) if weight != 0}
+    assert result['weights'] == pytest.approx(expected_weights)
+    with pytest.raises(ValueError):
+        ensembler.fit(models=['model_0', 'unknown_model'])
+
+
+def test_post_hoc_ensembler_model_graph_requires_trainer():
+    model_pred_proba_dict, labels = _model_pred_proba_dict()
+    ensembler = PostHocEnsembler(model_pred_proba_dict, labels=labels, problem_type=MULTICLASS, eval_metric=accuracy)
+    with pytest.raises(ValueError):
+        ensembler.get_model_graph({'model_0': 1.0})
+
+
+class _Trainer(AbstractTrainer):
+    # Trainer of models with fixed predictions on the holdout data, without fitting or saving models
+    def __init__(self, model_pred_proba_dict):
+        self.problem_type = MULTICLASS
+        self.eval_metric = log_loss
+        self.eval_metric_expects_y_pred = False
+        self.model_pred_proba_dict = model_pred_proba_dict
+        self.model_graph = nx.DiGraph()
+        for model in model_pred_proba_dict:
+            self.model_graph.add_node(model, val_score=0.0, fit_time=1.0, predict_time=0.5, can_infer=True)
+        self.models_level = {'core': {0: list(model_pred_proba_dict.keys())}}
+
+    def get_model_pred_proba_dict(self, X, models, fit=False, record_pred_time=False, **kwargs):
+        return {model: self.model_pred_proba_dict[model] for model in models}, {model: 0.1 for model in models}
+
+
+class _Learner(AbstractLearner):
+    def __init__(self, trainer):
+        self.trainer = trainer
+        self.problem_type = MULTICLASS
+        self.eval_metric = log_loss
+
+    def _transform_holdout(self, X, y=None):
+        return X, y, self.trainer
+
+
+def test_score_debug_oracle_ensemble():
+    model_pred_proba_dict, labels = _model_pred_proba_dict()
+    trainer = _Trainer(model_pred_proba_dict)
+    learner = _Learner(trainer)
+    leaderboard = learner.score_debug(X=pd.DataFrame(index=range(_num_rows)), y=pd.Series(labels),
+                                      compute_oracle=True, silent=True)
+    leaderboard = leaderboard.set_index('model')
+    oracle = leaderboard.loc['oracle_ensemble']
+
+    ensembler = PostHocEnsembler(model_pred_proba_dict, labels=labels, problem_type=MULTICLASS, eval_metric=log_loss)
+    oracle_weights = ensembler.fit(ensemble_size=100)['weights']
+    oracle_pred_proba = sum(weight * model_pred_proba_dict[model] for model, weight in oracle_weights.items())
+    assert oracle['score_test'] == pytest.approx(log_loss(labels, oracle_pred_proba))
+    # The oracle ensemble is at least as good as its best model, and predicts with all models with non-zero weight
+    assert oracle['score_test'] >= leaderboard['score_test'].drop('oracle_ensemble').max() - 1e-12
+    assert oracle['pred_time_test'] == pytest.approx(0.1 * len(oracle_weights) + oracle['pred_time_test_marginal'])
+    # The oracle ensemble is not added to the model graph of the trainer
+    assert 'oracle_ensemble' not in trainer.model_graph
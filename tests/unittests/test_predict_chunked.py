@@ -0,0 +1,76 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from autogluon import TabularPrediction as task
+from autogluon.utils.tabular.utils.loaders import load_pd
+
+
+def _data(num_rows, seed=0):
+    rng = np.random.RandomState(seed)
+    X = pd.DataFrame({
+        'a': rng.rand(num_rows),
+        'b': rng.randint(0, 100, num_rows),
+        'c': rng.choice(['x', 'y', 'z'], num_rows),
+    })
+    X['label'] = np.where(X['a'] + (X['c'] == 'x') > 0.8, 'pos', np.where(X['b'] > 50, 'neg', 'other'))
+    return X
+
+
+@pytest.fixture(scope='module')
+def predictor(tmpdir_factory):
+    return task.fit(train_data=_data(300), label='label', output_directory=str(tmpdir_factory.mktemp('predictor')),
+                    hyperparameters={'GBM': {'num_boost_round': 20}, 'RF': {'n_estimators': 20}}, verbosity=0)
+
+
+@pytest.fixture
+def test_data():
+    X = _data(95, seed=1).drop(columns=['label'])
+    # Categories that only occur in some chunks are encoded as in the full data
+    X.loc[:40, 'c'] = 'x'
+    return X
+
+
+@pytest.mark.parametrize('chunksize', [10, 95, 1000])
+def test_predict_chunked_matches_predict(tmpdir, predictor, test_data, chunksize):
+    path = str(tmpdir.join('test.csv'))
+    test_data.to_csv(path, index=False)
+    output_path = str(tmpdir.join('output', 'pred.csv'))
+    num_rows = predictor.predict_chunked(path, output_path=output_path, chunksize=chunksize)
+    assert num_rows == len(test_data)
+    y_pred = pd.read_csv(output_path)
+    assert list(y_pred.columns) == ['label']
+    np.testing.assert_array_equal(y_pred['label'].values, predictor.predict(test_data))
+
+    predictor.predict_chunked(path, output_path=output_path, chunksize=chunksize, proba=True)
+    y_pred_proba = pd.read_csv(output_path)
+    y_pred_proba_expected = predictor.predict_proba(test_data, as_pandas=True)
+    assert list(y_pred_proba.columns) == list(y_pred_proba_expected.columns)
+    np.testing.assert_allclose(y_pred_proba.values, y_pred_proba_expected.values, rtol=1e-6)
+
+
+def test_predict_chunked_multipart_and_parquet(tmpdir, predictor, test_data):
+    multipart_path = str(tmpdir.join('multipart')) + os.path.sep
+    os.makedirs(multipart_path)
+    for i, start in enumerate(range(0, len(test_data), 40)):
+        test_data.iloc[start:start + 40].to_csv(os.path.join(multipart_path, f'part-{i}.csv'), index=False)
+    output_path = str(tmpdir.join('pred.csv'))
+    y_pred_expected = predictor.predict(test_data)
+    assert predictor.predict_chunked(multipart_path, output_path=output_path, chunksize=15) == len(test_data)
+    np.testing.assert_array_equal(pd.read_csv(output_path)['label'].values, y_pred_expected)
+
+    pytest.importorskip('pyarrow')
+    path = str(tmpdir.join('test.parquet'))
+    test_data.to_parquet(path)
+    chunks = list(load_pd.load_chunks(path, chunksize=15, columns_to_keep=['a', 'c']))
+    assert [len(chunk) for chunk in chunks] == [15] * 6 + [5]
+    assert list(chunks[0].columns) == ['a', 'c']
+    assert predictor.predict_chunked(path, output_path=output_path, chunksize=15) == len(test_data)
+    np.testing.assert_array_equal(pd.read_csv(output_path)['label'].values, y_pred_expected)
+
+
+def test_predict_chunked_requires_local_output(predictor):
+    with pytest.raises(ValueError):
+        predictor.predict_chunked('test.csv', output_path='s3://bucket/pred.csv')
@@ -0,0 +1,111 @@
+import contextvars
+import threading
+
+import numpy as np
+import pandas as pd
+
+from autogluon.utils.tabular.metrics import accuracy
+from autogluon.utils.tabular.ml.constants import BINARY
+from autogluon.utils.tabular.ml.models.rf.rf_model import RFModel
+from autogluon.utils.tabular.utils.profiler import (Profiler, get_active_profiler, profile, profile_model_method,
+                                                    profiling)
+
+
+class _Model:
+    name = 'model'
+
+    @profile_model_method('preprocess')
+    def preprocess(self, X):
+        with profile('nested'):
+            return X
+
+
+class _ChildModel(_Model):
+    @profile_model_method('preprocess')
+    def preprocess(self, X):
+        return super().preprocess(X)
+
+
+def _stages(profiler):
+    return [(record['stage'], record['model'], record['parent_stage'], record['depth']) for record in profiler.records]
+
+
+def test_profiling_records_nested_stages():
+    with profile('outside'):
+        pass
+    with profiling(track_memory=True) as profiler:
+        assert get_active_profiler() is profiler
+        with profile('predict'):
+            _ChildModel().preprocess(np.zeros(1000))
+    assert get_active_profiler() is None
+    with profile('after'):
+        pass
+    # Overridden methods calling super() are only recorded once
+    assert _stages(profiler) == [
+        ('nested', None, 'preprocess', 2),
+        ('preprocess', 'model', 'predict', 1),
+        ('predict', None, None, 0),
+    ]
+    records = profiler.get_records()
+    assert (records['time'] >= 0).all()
+    assert (records['peak_memory'] >= 0).all()
+    summary = profiler.get_summary()
+    assert set(zip(summary['stage'], summary['model'])) == {('predict', ''), ('preprocess', 'model'), ('nested', '')}
+    assert list(summary['count']) == [1, 1, 1]
+
+
+def test_profilers_are_scoped():
+    with profiling(track_memory=False) as profiler_outer:
+        with profile('outer'):
+            with profiling(track_memory=False) as profiler_inner:
+                with profile('inner'):
+                    pass
+            with profile('outer_after_inner'):
+                pass
+    assert [record['stage'] for record in profiler_inner.records] == ['inner']
+    assert [record['stage'] for record in profiler_outer.records] == ['outer_after_inner', 'outer']
+    assert profiler_outer.get_records()['peak_memory'].isnull().all()
+
+    # Started profilers only record while they are active
+    profiler = Profiler()
+    profiler.start(track_memory=False)
+    with profile('inactive'):
+        pass
+    with profiler.activate():
+        with profile('active'):
+            pass
+    profiler.stop()
+    assert [record['stage'] for record in profiler.records] == ['active']
+
+
+def test_profiling_threads():
+    def _run(stage):
+        with profile(stage):
+            pass
+
+    with profiling(track_memory=False) as profiler:
+        # Threads only record to the profiler if they run in a copy of the context in which it is active
+        thread_other = threading.Thread(target=_run, args=('other_thread',))
+        thread_copy = threading.Thread(target=contextvars.copy_context().run, args=(_run, 'copied_context'))
+        for thread in [thread_other, thread_copy]:
+            thread.start()
+            thread.join()
+    assert [record['stage'] for record in profiler.records] == ['copied_context']
+    assert profiler.records[0]['thread'] == thread_copy.ident
+
+
+def test_profiling_model(tmpdir):
+    rng = np.random.RandomState(0)
+    X = pd.DataFrame({'a': rng.rand(100), 'b': rng.rand(100)})
+    y = pd.Series((X['a'] > 0.5).astype(int))
+    model = RFModel(path=str(tmpdir) + '/', name='RandomForest', problem_type=BINARY, eval_metric=accuracy,
+                    hyperparameters={'n_estimators': 10})
+    with profiling(track_memory=False) as profiler:
+        model.fit(X_train=X, y_train=y)
+        model.predict_proba(X)
+    assert _stages(profiler) == [
+        ('preprocess', 'RandomForest', 'fit', 1),
+        ('fit', 'RandomForest', None, 0),
+        ('preprocess', 'RandomForest', 'predict_proba', 1),
+        ('predict_proba', 'RandomForest', None, 0),
+    ]
@@ -0,0 +1,164 @@
+from collections import defaultdict
+
+import mxnet as mx
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import FunctionTransformer
+
+from autogluon.utils.tabular.features.feature_types_metadata import FeatureTypesMetadata
+from autogluon.utils.tabular.metrics import log_loss
+from autogluon.utils.tabular.ml.constants import MULTICLASS
+from autogluon.utils.tabular.ml.models.tabular_nn.categorical_encoders import (
+    CategoryCodeOneHotEncoder, CategoryCodeOrdinalEncoder, OneHotMergeRaresHandleUnknownEncoder,
+    OrdinalMergeRaresHandleUnknownEncoder)
+from autogluon.utils.tabular.ml.models.tabular_nn.tabular_nn_fast_processor import FastTabularNNProcessor
+from autogluon.utils.tabular.ml.models.tabular_nn.tabular_nn_model import TabularNeuralNetModel
+
+_category_probabilities = [0.4, 0.25, 0.15, 0.1, 0.05, 0.03, 0.02]
+
+
+def _categorical_data(num_rows, categories, seed=0):
+    rng = np.random.RandomState(seed)
+    X = pd.DataFrame({
+        feature: pd.Categorical(rng.choice(categories, num_rows, p=_category_probabilities), categories=categories)
+        for feature in ['a', 'b']
+    })
+    X.iloc[::11, 0] = np.nan
+    return X
+
+
+def _test_data(categories):
+    X = _categorical_data(100, categories, seed=1)
+    # Contains categories unknown at fit time, and dtypes whose categories differ from those of the training data
+    X['b'] = X['b'].cat.add_categories(['unknown'])
+    X.iloc[:5, 1] = 'unknown'
+    X['a'] = X['a'].cat.reorder_categories(categories[::-1])
+    return X
+
+
+def _string_encoder(encoder):
+    """ Existing encoding of categorical features by TabularNeuralNetModel, which converts them to strings """
+    return Pipeline(steps=[
+        ('to_str', FunctionTransformer(TabularNeuralNetModel.convert_df_dtype_to_str)),
+        ('imputer', SimpleImputer(strategy='constant', fill_value=TabularNeuralNetModel.unique_category_str)),
+        ('encoder', encoder)])
+
+
+# The string categories sort in the order of the categories, with the missing value 'nan' first
+_categories_sorted = [f'x{i}' for i in range(len(_category_probabilities))]
+
+
+@pytest.mark.parametrize('max_levels', [None, 3, 10])
+def test_category_code_one_hot_encoder_matches_string_encoder(max_levels):
+    X = _categorical_data(500, _categories_sorted)
+    X_test = _test_data(_categories_sorted)
+    encoder = CategoryCodeOneHotEncoder(max_levels=max_levels, sparse=False).fit(X)
+    encoder_str = _string_encoder(OneHotMergeRaresHandleUnknownEncoder(max_levels=max_levels, sparse=False)).fit(X)
+    for X_transform in [X, X_test]:
+        np.testing.assert_array_equal(encoder.transform(X_transform), encoder_str.transform(X_transform))
+    encoder_sparse = CategoryCodeOneHotEncoder(max_levels=max_levels).fit(X)
+    np.testing.assert_array_equal(encoder_sparse.transform(X_test).toarray(), encoder.transform(X_test))
+
+
+@pytest.mark.parametrize('max_levels', [3, 10])
+def test_category_code_ordinal_encoder_matches_string_encoder(max_levels):
+    X = _categorical_data(500, _categories_sorted)
+    X_test = _test_data(_categories_sorted)
+    encoder = CategoryCodeOrdinalEncoder(max_levels=max_levels).fit(X)
+    encoder_str = _string_encoder(OrdinalMergeRaresHandleUnknownEncoder(max_levels=max_levels)).fit(X)
+    for X_transform in [X, X_test]:
+        np.testing.assert_array_equal(encoder.transform(X_transform), encoder_str.transform(X_transform))
+
+
+def _assert_equal_up_to_level_order(X_levels, X_levels_expected):
+    """ Checks that each level of X_levels corresponds to exactly one level of X_levels_expected """
+    for levels, levels_expected in zip(X_levels.T, X_levels_expected.T):
+        level_pairs = set(zip(levels, levels_expected))
+        assert len(level_pairs) == len(set(levels)) == len(set(levels_expected))
+
+
+@pytest.mark.parametrize('max_levels', [3, 10])
+def test_category_code_encoders_match_string_encoders_up_to_level_order(max_levels):
+    # Levels follow the order of the categories rather than of their string representations
+    categories = [100, 3, 20, 7, 1000, 5, 60]
+    X = _categorical_data(500, categories)
+    X_test = _test_data(categories)
+    encoder = CategoryCodeOrdinalEncoder(max_levels=max_levels).fit(X)
+    encoder_str = _string_encoder(OrdinalMergeRaresHandleUnknownEncoder(max_levels=max_levels)).fit(X)
+    _assert_equal_up_to_level_order(encoder.transform(X_test), encoder_str.transform(X_test))
+
+    encoder = CategoryCodeOneHotEncoder(max_levels=max_levels, sparse=False).fit(X)
+    encoder_str = _string_encoder(OneHotMergeRaresHandleUnknownEncoder(max_levels=max_levels, sparse=False)).fit(X)
+    X_one_hot, X_one_hot_expected = encoder.transform(X_test), encoder_str.transform(X_test)
+    assert X_one_hot.shape == X_one_hot_expected.shape
+    assert sorted(map(tuple, X_one_hot.T)) == sorted(map(tuple, X_one_hot_expected.T))
+
+
+def _mixed_data(num_rows, seed=0):
+    rng = np.random.RandomState(seed)
+    X = pd.DataFrame({
+        'continuous': rng.randn(num_rows),
+        'skewed': np.exp(3 * rng.randn(num_rows)),
+        'onehot': pd.Categorical(rng.choice(['a', 'b', 'c'], num_rows)),
+        'embed': pd.Categorical(rng.choice([f'e{i}' for i in range(30)], num_rows)),
+        'onehot_str': rng.choice(['x', 'y'], num_rows),
+    })
+    X.loc[::7, 'continuous'] = np.nan
+    X.loc[::5, 'onehot'] = np.nan
+    y = pd.Series(rng.randint(0, 3, num_rows))
+    return X, y
+
+
+@pytest.fixture(scope='module')
+def tabular_nn_model(tmpdir_factory):
+    X, y = _mixed_data(500)
+    feature_types_metadata = FeatureTypesMetadata(defaultdict(
+        list, float=['continuous', 'skewed'], category=['onehot', 'embed'], object=['onehot_str']))
+    model = TabularNeuralNetModel(path=str(tmpdir_factory.mktemp('tabular_nn')) + '/', name='NeuralNet',
+                                  problem_type=MULTICLASS, eval_metric=log_loss, num_classes=3,
+                                  hyperparameters={'num_epochs': 2, 'proc.embed_min_categories': 10},
+                                  feature_types_metadata=feature_types_metadata)
+    model.fit(X_train=X, y_train=y)
+    return model
+
+
+def test_fast_processor_matches_column_transformer(tabular_nn_model):
+    model = tabular_nn_model
+    assert model.types_of_features['continuous'] and model.types_of_features['skewed']
+    assert model.types_of_features['onehot'] and model.types_of_features['embed']
+    X, _ = _mixed_data(100, seed=1)
+    X = model.preprocess(X)
+    processor = FastTabularNNProcessor(processor=model.processor, feature_arraycol_map=model.feature_arraycol_map,
+                                       feature_type_map=model.feature_type_map)
+    # Continuous features are transformed with precomputed arrays, the other transformers are applied directly
+    assert [func for _, func, _ in processor.steps].count(processor._transform_continuous) == 1
+    np.testing.assert_allclose(processor.transform_array(X), model.processor.transform(X), rtol=1e-10)
+
+    # The batch is the one formatted by TabularNNDataset for the same rows
+    data_batch = processor.transform(X, ctx=mx.cpu())
+    dataset = model.process_test_data(X, batch_size=len(X), num_dataloading_workers=0)
+    data_batch_expected = dataset.format_batch_data(next(iter(dataset.dataloader)), mx.cpu())
+    assert set(data_batch) == {'vector', 'embed'}
+    np.testing.assert_allclose(data_batch['vector'].asnumpy(), data_batch_expected['vector'].asnumpy(), rtol=1e-6)
+    assert len(data_batch['embed']) == len(data_batch_expected['embed'])
+    for embed, embed_expected in zip(data_batch['embed'], data_batch_expected['embed']):
+        np.testing.assert_array_equal(embed.asnumpy(), embed_expected.asnumpy())
+
+
+def test_fast_prediction_matches_dataloader_prediction(tabular_nn_model):
+    model = tabular_nn_model
+    X, _ = _mixed_data(100, seed=1)
+    fast_predict_max_rows = model.params_aux['fast_predict_max_rows']
+    assert len(X) <= fast_predict_max_rows
+    y_pred_proba_fast = model.predict_proba(X)
+    y_pred_fast = model.predict(X)
+    assert model._fast_processor is not None
+    try:
+        model.params_aux['fast_predict_max_rows'] = 0
+        np.testing.assert_allclose(y_pred_proba_fast, model.predict_proba(X), rtol=1e-5, atol=1e-7)
+        np.testing.assert_array_equal(y_pred_fast, model.predict(X))
+    finally:
+        model.params_aux['fast_predict_max_rows'] = fast_predict_max_rows
@@ -0,0 +1,56 @@
+import pickle
+
+import numpy as np
+
+from autogluon.task.text_classification.tokenization_cache import LazyPool, TokenizedDataset, get_tokenized_dataset
+
+
+def _tokenize(line):
+    # Stands in for BERTDatasetTransform: (input ids, valid length, segment ids, label)
+    text, label = line
+    input_ids = np.array([ord(c) for c in text], dtype='int32')
+    return input_ids, len(input_ids), np.zeros_like(input_ids), np.array([label], dtype='int32')
+
+
+_lines = [('hello', 0), ('autogluon', 1), ('', 0), ('tokenized datasets', 1)]
+
+
+def _check_samples(dataset, lines):
+    assert len(dataset) == len(lines)
+    for sample, line in zip(dataset, lines):
+        for value, expected in zip(sample, _tokenize(line)):
+            np.testing.assert_array_equal(value, expected)
+
+
+def test_tokenized_dataset_round_trip(tmpdir):
+    dataset = TokenizedDataset.from_samples([_tokenize(line) for line in _lines])
+    _check_samples(dataset, _lines)
+    path = str(tmpdir.join('dataset'))
+    dataset.save(path)
+    loaded = TokenizedDataset.load(path)
+    _check_samples(loaded, _lines)
+    np.testing.assert_array_equal(loaded.valid_length, [5, 9, 0, 18])
+    # Memory-mapped datasets are pickled to workers by path
+    _check_samples(pickle.loads(pickle.dumps(loaded)), _lines)
+
+
+def test_tokenized_dataset_cache_hit(tmpdir):
+    cache_dir = str(tmpdir)
+    with LazyPool(processes=1) as pool:
+        dataset = get_tokenized_dataset(_tokenize, _lines, 'key', cache_dir=cache_dir, pool=pool)
+        assert pool._pool is not None
+    _check_samples(dataset, _lines)
+
+    with LazyPool(processes=1) as pool:
+        cached = get_tokenized_dataset(_tokenize, _lines, 'key', cache_dir=cache_dir, pool=pool)
+        # The worker pool is not started on a cache hit
+        assert pool._pool is None
+    assert cached._path == dataset._path
+    _check_samples(cached, _lines)
+
+    # Different contents or tokenization keys miss the cache
+    other = get_tokenized_dataset(_tokenize, _lines[:2], 'key', cache_dir=cache_dir)
+    assert other._path != dataset._path
+    _check_samples(other, _lines[:2])
+    other_key = get_tokenized_dataset(_tokenize, _lines, 'other_key', cache_dir=cache_dir)
+    assert other_key._path != dataset._path